@@ -1,11 +1,12 @@
 # backend/api/auth.py
 
 import os
-import requests
+import asyncio
+import aiohttp
 from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import JSONResponse
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -17,27 +18,81 @@ from backend.models.oauth import (
     OAuthError
 )
 from backend.services.youtube_api import get_client_config
+from backend.services.http_client import get_http_session
 
-import logging
+from backend.services.logger import get_logger
 
 # Setup a logger instance for this module
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-
-# Add a basic console handler
-console_handler = logging.StreamHandler()
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
-
-# Add handler only if not already added
-if not logger.handlers:
-    logger.addHandler(console_handler)
+logger = get_logger(__name__)
 
 
 router = APIRouter()
 backend_dir = Path(__file__).parent.parent.resolve()
 load_dotenv(backend_dir / ".env")
 
+# OAuth provider endpoints
+SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
+SPOTIFY_USER_INFO_URL = "https://api.spotify.com/v1/me"
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+GOOGLE_USER_INFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+
+# The user info lookup is optional, so it gets a shorter budget than the token exchange
+USER_INFO_TIMEOUT = float(os.getenv("OAUTH_USER_INFO_TIMEOUT", "5"))
+
+
+async def _exchange_code_for_token(token_url: str, token_data: dict) -> Tuple[int, Dict[str, Any], str]:
+    """
+    Posts an authorization code to a provider's token endpoint on the shared HTTP session.
+
+    Args:
+        token_url (str): The provider's token endpoint.
+        token_data (dict): Form data for the authorization_code grant.
+
+    Returns:
+        Tuple[int, Dict[str, Any], str]: HTTP status, parsed JSON body (empty if not JSON) and raw text.
+    """
+    session = await get_http_session()
+    async with session.post(token_url, data=token_data) as response:
+        text = await response.text()
+        data = {}
+        if response.content_type == "application/json":
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError:
+                data = {}
+        return response.status, data, text
+
+
+async def _fetch_user_info(user_info_url: str, access_token: str, log_prefix: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetches the raw user profile for an access token.
+
+    Failures and timeouts are logged and swallowed, since user info is not
+    required to complete the OAuth callback.
+
+    Args:
+        user_info_url (str): The provider's user info endpoint.
+        access_token (str): The freshly exchanged access token.
+        log_prefix (str): Log tag of the calling callback, e.g. "[SpotifyOAuth]".
+
+    Returns:
+        Optional[Dict[str, Any]]: The provider's user profile, or None if unavailable.
+    """
+    try:
+        session = await get_http_session()
+        async with session.get(
+            user_info_url,
+            headers={"Authorization": f"Bearer {access_token}"},
+            timeout=aiohttp.ClientTimeout(total=USER_INFO_TIMEOUT),
+        ) as user_response:
+            if user_response.ok:
+                return await user_response.json()
+            logger.error(f"{log_prefix} - User info request failed: {user_response.status}")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"{log_prefix} - Failed to get user info: {e!r}")
+    return None
+
+
 @router.post("/spotify/callback", response_model=SpotifyTokenResponse)
 async def spotify_oauth_callback(request: OAuthCallbackRequest):
     """
@@ -51,9 +106,6 @@ async def spotify_oauth_callback(request: OAuthCallbackRequest):
     try:
         logger.info(f"[SpotifyOAuth] - Received callback request: code={request.code[:10]}..., redirect_uri={request.redirect_uri}")
         
-        # Spotify token exchange endpoint
-        token_url = "https://accounts.spotify.com/api/token"
-        
         # Prepare token exchange data
         token_data = {
             "grant_type": "authorization_code",
@@ -66,44 +118,40 @@ async def spotify_oauth_callback(request: OAuthCallbackRequest):
         logger.info(f"[SpotifyOAuth] - Exchanging code for token with Spotify")
         
         # Exchange code for token
-        response = requests.post(token_url, data=token_data)
+        status_code, token_response, response_text = await _exchange_code_for_token(SPOTIFY_TOKEN_URL, token_data)
         
-        if not response.ok:
-            error_data = response.json() if response.headers.get('content-type') == 'application/json' else {}
-            logger.error(f"[SpotifyOAuth] - Token exchange failed: {response.status_code}, {error_data}")
+        # A 2xx without a token (or with a non-JSON body) is as much a failed exchange as an error status
+        if not 200 <= status_code < 300 or "access_token" not in token_response:
+            error_data = token_response
+            logger.error(f"[SpotifyOAuth] - Token exchange failed: {status_code}, {error_data}")
             
             # Only expose detailed errors in development
             error_message = "Failed to authenticate with Spotify"
             if os.getenv("ENVIRONMENT") == "development":
-                error_message = f"Spotify token exchange failed: {error_data.get('error_description', response.text)}"
+                error_message = f"Spotify token exchange failed: {error_data.get('error_description', response_text)}"
             
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=error_message
             )
         
-        token_response = response.json()
         logger.info(f"[SpotifyOAuth] - Token exchange successful")
         
         # Get user info using the access token
         user_info = None
-        try:
-            user_response = requests.get(
-                "https://api.spotify.com/v1/me",
-                headers={"Authorization": f"Bearer {token_response['access_token']}"}
-            )
-            if user_response.ok:
-                user_data = user_response.json()
+        user_data = await _fetch_user_info(SPOTIFY_USER_INFO_URL, token_response["access_token"], "[SpotifyOAuth]")
+        if user_data:
+            try:
                 user_info = {
                     "id": user_data["id"],
                     "name": user_data["display_name"],
                     "email": user_data.get("email"),
-                    "image": user_data["images"][0]["url"] if user_data["images"] else None,
+                    "image": user_data["images"][0]["url"] if user_data.get("images") else None,
                     "platform": "spotify"
                 }
                 logger.info(f"[SpotifyOAuth] - Retrieved user info for: {user_info['name']}")
-        except Exception as e:
-            logger.error(f"[SpotifyOAuth] - Failed to get user info: {e}")
+            except (KeyError, IndexError, TypeError) as e:
+                logger.error(f"[SpotifyOAuth] - Failed to parse user info: {e}")
         
         return SpotifyTokenResponse(
             access_token=token_response["access_token"],
@@ -143,7 +191,7 @@ async def youtube_oauth_callback(request: OAuthCallbackRequest):
         
         # Load Google client secrets using shared function
         try:
-            google_secrets = get_client_config()
+            google_secrets = await asyncio.to_thread(get_client_config)
         except (FileNotFoundError, ValueError) as e:
             logger.error(f"[YouTubeOAuth] - Failed to load client config: {e}")
             raise HTTPException(
@@ -158,9 +206,6 @@ async def youtube_oauth_callback(request: OAuthCallbackRequest):
                 detail="Invalid Google client configuration format"
             )
         
-        # Google token exchange endpoint
-        token_url = "https://oauth2.googleapis.com/token"
-        
         # Prepare token exchange data
         token_data = {
             "grant_type": "authorization_code",
@@ -175,35 +220,31 @@ async def youtube_oauth_callback(request: OAuthCallbackRequest):
         logger.info(f"[YouTubeOAuth] - Client ID configured: Yes")
         
         # Exchange code for token
-        response = requests.post(token_url, data=token_data)
+        status_code, token_response, response_text = await _exchange_code_for_token(GOOGLE_TOKEN_URL, token_data)
         
-        if not response.ok:
-            error_data = response.json() if response.headers.get('content-type') == 'application/json' else {}
-            logger.error(f"[YouTubeOAuth] - Token exchange failed: {response.status_code}, {error_data}")
+        # A 2xx without a token (or with a non-JSON body) is as much a failed exchange as an error status
+        if not 200 <= status_code < 300 or "access_token" not in token_response:
+            error_data = token_response
+            logger.error(f"[YouTubeOAuth] - Token exchange failed: {status_code}, {error_data}")
             logger.error(f"[YouTubeOAuth] - Request redirect_uri: {token_data['redirect_uri']}")
             
             # Only expose detailed errors in development
             error_message = "Failed to authenticate with YouTube"
             if os.getenv("ENVIRONMENT") == "development":
-                error_message = f"Google token exchange failed: {error_data.get('error_description', response.text)}"
+                error_message = f"Google token exchange failed: {error_data.get('error_description', response_text)}"
             
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=error_message
             )
         
-        token_response = response.json()
         logger.info(f"[YouTubeOAuth] - Token exchange successful")
         
         # Get user info using the access token
         user_info = None
-        try:
-            user_response = requests.get(
-                "https://www.googleapis.com/oauth2/v2/userinfo",
-                headers={"Authorization": f"Bearer {token_response['access_token']}"}
-            )
-            if user_response.ok:
-                user_data = user_response.json()
+        user_data = await _fetch_user_info(GOOGLE_USER_INFO_URL, token_response["access_token"], "[YouTubeOAuth]")
+        if user_data:
+            try:
                 user_info = {
                     "id": user_data["id"],
                     "name": user_data["name"],
@@ -212,8 +253,8 @@ async def youtube_oauth_callback(request: OAuthCallbackRequest):
                     "platform": "youtube"
                 }
                 logger.info(f"[YouTubeOAuth] - Retrieved user info for: {user_info['name']}")
-        except Exception as e:
-            logger.error(f"[YouTubeOAuth] - Failed to get user info: {e}")
+            except (KeyError, TypeError) as e:
+                logger.error(f"[YouTubeOAuth] - Failed to parse user info: {e}")
         
         return YouTubeTokenResponse(
             access_token=token_response["access_token"],
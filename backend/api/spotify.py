@@ -1,11 +1,24 @@
-from typing import Annotated
-from fastapi import APIRouter, Query, Body
+from typing import Annotated, Iterator, Optional
+from fastapi import APIRouter, Query, Body, Header, HTTPException
+from fastapi.responses import StreamingResponse
+import spotipy
+from backend.models.transfer import BatchMatchRequest, BatchMatchResult, BatchMatchSummary, SpotifyTrack
 from backend.services.spotify_api import (
     get_spotify_client,
+    get_spotify_client_with_token,
     api_create_playlist,
     api_search_track,
-    api_add_tracks_from_titles
+    api_add_tracks_from_titles,
+    api_add_tracks_to_playlist,
+    api_match_titles,
 )
+from backend.services.search_coalescer import get_search_coalescer
+from backend.services.resilience import UpstreamUnavailableError
+from backend.services.spotify_scheduler import ScheduledSpotify, schedule_spotify
+from backend.services.logger import get_logger
+
+# Setup a logger instance for this module
+logger = get_logger(__name__)
 
 router = APIRouter()
 
@@ -24,6 +37,9 @@ def search_track(
     """
     Searches Spotify for a track based on the provided title.
 
+    Uses the pooled server client, and concurrent requests for the same title
+    (ignoring case and spacing) share a single Spotify search.
+
     Args:
         title (str): The YouTube/track title to search for on Spotify.
 
@@ -31,7 +47,7 @@ def search_track(
         dict: Contains the Spotify track ID if found.
     """
     sp = get_spotify_client()
-    track_id = api_search_track(sp, title)
+    track_id = get_search_coalescer().lookup(title, lambda query: api_search_track(sp, query))
     return {"track_id": track_id}
 
 
@@ -81,7 +97,74 @@ def create_playlist(
     return {"playlist_id": playlist_id}
 
 
-@router.post("/add-tracks")
+@router.post("/match-batch")
+def match_batch(
+    request: BatchMatchRequest,
+    spotify_token: Optional[str] = Header(None, alias="X-Spotify-Token")
+) -> StreamingResponse:
+    """
+    Matches up to 10,000 song titles on Spotify and streams the results as they come in.
+
+    Titles are matched concurrently with the same scorer and caches as playlist
+    transfers. The response is NDJSON: one BatchMatchResult per title, in
+    completion order (use `index` to line them up), then a BatchMatchSummary.
+    With playlist_id set, the matched tracks are added to that playlist in
+    title order once every title is matched.
+
+    Args:
+        request: Titles to match and an optional playlist to add the matches to
+        spotify_token: User's Spotify access token; the server's own Spotify account is used without it
+
+    Returns:
+        StreamingResponse: application/x-ndjson stream of results
+    """
+    if spotify_token:
+        sp = schedule_spotify(get_spotify_client_with_token(spotify_token), spotify_token)
+    else:
+        sp = ScheduledSpotify(get_spotify_client(), "server")
+    if not sp:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid or expired Spotify token. Please reconnect your Spotify account."
+        )
+    return StreamingResponse(_stream_batch_matches(sp, request), media_type="application/x-ndjson")
+
+
+def _stream_batch_matches(sp: spotipy.Spotify, request: BatchMatchRequest) -> Iterator[bytes]:
+    """
+    Yields the NDJSON lines of /match-batch. Starlette runs this generator on its threadpool.
+    """
+    matches = [None] * len(request.titles)
+    for index, spotify_track in api_match_titles(sp, request.titles):
+        matched = isinstance(spotify_track, SpotifyTrack)
+        matches[index] = spotify_track if matched else None
+        result = BatchMatchResult(
+            index=index,
+            title=request.titles[index],
+            status="success" if matched else "failed",
+            track=spotify_track if matched else None,
+            error="Spotify was unavailable, so this title wasn't searched" if isinstance(spotify_track, UpstreamUnavailableError) else None,
+        )
+        yield result.model_dump_json().encode() + b"\n"
+
+    track_ids = [spotify_track.track_id for spotify_track in matches if spotify_track]
+    summary = BatchMatchSummary(
+        total=len(matches),
+        matched=len(track_ids),
+        unmatched=len(matches) - len(track_ids),
+        added=0,
+    )
+    if request.playlist_id and track_ids:
+        try:
+            api_add_tracks_to_playlist(sp, request.playlist_id, track_ids)
+            summary.added = len(set(track_ids))
+        except Exception as e:
+            logger.warning(f"[Spotify] - Adding batch matches to playlist {request.playlist_id} failed: {e}")
+            summary.error = f"Adding tracks to the playlist failed: {e}"
+    yield summary.model_dump_json().encode() + b"\n"
+
+
+@router.post("/add-tracks", deprecated=True)
 def add_tracks_from_titles(
     playlist_id: Annotated[
         str,
@@ -106,6 +189,9 @@ def add_tracks_from_titles(
     This endpoint searches for each title on Spotify, retrieves the track ID,
     and adds all found tracks to the specified playlist.
 
+    Deprecated: it answers only after every title is matched. Use
+    POST /spotify/match-batch, which streams results and takes a playlist_id.
+
     Args:
         playlist_id (str): Spotify playlist ID.
         titles (list[str]): A list of song titles to search and add.
@@ -1,15 +1,56 @@
 # backend/api/transfer.py (updated)
-from fastapi import APIRouter, HTTPException, Header
+from fastapi import APIRouter, HTTPException, Header, Query
 from typing import Optional
+import uuid
+from starlette.concurrency import run_in_threadpool
 from backend.services.youtube_api import get_authenticated_service_with_token
-from backend.services.spotify_api import get_spotify_client_with_token
-from backend.services.transfer_api import transfer_playlist_api
-from backend.models.transfer import TransferRequest, TransferResponse
+from backend.services.youtube_quota import quota_user
+from backend.services.spotify_api import get_spotify_client_with_token, get_spotify_profile, SpotifyTokenClientFactory
+from backend.services.spotify_scheduler import get_spotify_scheduler, schedule_spotify
+from backend.services.transfer_api import transfer_playlist_api, commit_transfer_api
+from backend.services.transfer_executor import get_transfer_executor, TransferRejectedError
+from backend.services.transfer_stats import TransferStatsCollector
+from backend.services.transfer_results import get_result_store
+from backend.services.transfer_progress import TransferProgress, get_transfer_progress
+from backend.services.transfer_dedup import get_inflight_transfers, transfer_key
+from backend.services.serialization import PydanticJSONResponse
+from backend.models.transfer import TransferRequest, TransferResponse, SongPage, TransferProgressStatus, CommitRequest
+from backend.services.logger import get_logger
+
+# Setup a logger instance for this module
+logger = get_logger(__name__)
 
 router = APIRouter(tags=["Transfer"])
 
+
+def _check_owner(transfer_id: str, spotify_token: Optional[str]) -> None:
+    """
+    Raises unless the Spotify user behind the token is the one who submitted the transfer.
+
+    Args:
+        transfer_id: ID of a transfer
+        spotify_token: Caller's Spotify access token
+    """
+    if not spotify_token:
+        raise HTTPException(
+            status_code=401, 
+            detail="Missing Spotify authentication token. Please reconnect your Spotify account."
+        )
+    owner = get_result_store().get_owner(transfer_id)
+    if owner is None:
+        raise HTTPException(status_code=404, detail="Transfer not found or it has expired.")
+    profile = get_spotify_profile(spotify_token)
+    if profile is None:
+        raise HTTPException(
+            status_code=401, 
+            detail="Invalid or expired Spotify token. Please reconnect your Spotify account."
+        )
+    if profile["id"] != owner:
+        raise HTTPException(status_code=403, detail="This transfer belongs to another Spotify account.")
+
+
 @router.post("/", response_model=TransferResponse)
-def transfer_playlist(
+async def transfer_playlist(
     request: TransferRequest,
     spotify_token: Optional[str] = Header(None, alias="X-Spotify-Token"),
     youtube_token: Optional[str] = Header(None, alias="X-YouTube-Token")
@@ -24,6 +65,29 @@ def transfer_playlist(
     - Creates a new Spotify playlist in user's account
     - Adds found songs to the playlist
     - Returns detailed results for each song
+
+    Transfers run on a dedicated, bounded executor. When every slot is busy the
+    request waits in a short queue; when the queue is full it is rejected right
+    away with 429, and a transfer that waited too long gets 503. Both carry
+    Retry-After and X-Queue-Position headers.
+    
+    The response is encoded on the transfer thread. With include_songs=False
+    only the summary is returned and the songs are paged from
+    GET /transfer/{transfer_id}/songs. A client that sets transfer_id can poll
+    GET /transfer/{transfer_id}/progress while the transfer runs, from any worker.
+    A transfer_id belongs to the Spotify user who first submits it: reusing
+    another user's ID is rejected with 409, and songs, progress and commit
+    are only served to that user.
+    
+    With preview=True the songs are matched but no playlist is created or
+    changed; POST /transfer/{transfer_id}/commit then writes that match set
+    without searching again.
+    
+    Submitting a transfer that is already running (same Spotify token,
+    playlist, name and options), e.g. after a double click or a retried
+    request, attaches to the running transfer and returns its response,
+    under its transfer_id. Progress polled under the duplicate's own
+    transfer_id follows the running transfer.
     
     Args:
         request: Transfer request with playlist URL, name, and settings
@@ -46,22 +110,77 @@ def transfer_playlist(
             status_code=401, 
             detail="Missing YouTube authentication token. Please reconnect your YouTube account."
         )
-    
+
+    profile = await run_in_threadpool(get_spotify_profile, spotify_token)
+    if profile is None:
+        raise HTTPException(
+            status_code=401, 
+            detail="Invalid or expired Spotify token. Please reconnect your Spotify account."
+        )
+
+    transfer_id = request.transfer_id or uuid.uuid4().hex
+    if not get_result_store().claim_owner(transfer_id, profile["id"]):
+        raise HTTPException(status_code=409, detail="This transfer_id is already in use. Choose another one or leave it out.")
+    key = transfer_key(spotify_token, str(request.playlist_url), request.playlist_name, request.preview, request.include_songs)
+
+    try:
+        return await get_inflight_transfers().run(
+            key,
+            transfer_id,
+            request.include_songs,
+            lambda: get_transfer_executor().run(_run_transfer, request, transfer_id, spotify_token, youtube_token),
+        )
+    except TransferRejectedError as e:
+        logger.info(f"[Transfer] - Rejected transfer ({e.status_code}): {e}, queue position {e.queue_position}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=f"{e}. The server is busy, please retry in {e.retry_after} seconds (queue position {e.queue_position}).",
+            headers={
+                "Retry-After": str(e.retry_after),
+                "X-Queue-Position": str(e.queue_position),
+            }
+        )
+
+
+def _run_transfer(request: TransferRequest, transfer_id: str, spotify_token: str, youtube_token: str) -> PydanticJSONResponse:
+    """
+    Validates the user's tokens and performs the transfer. Runs on the transfer executor.
+
+    The result is kept in the result store for paging and encoded to JSON here,
+    so a multi-MB response never has to be serialized on the event loop.
+
+    Args:
+        request: Transfer request with playlist URL, name, and settings
+        transfer_id: ID to publish progress and store the result under
+        spotify_token: User's Spotify access token
+        youtube_token: User's YouTube access token
+
+    Returns:
+        PydanticJSONResponse: Encoded TransferResponse
+    """
+    stats = TransferStatsCollector()
+    progress = TransferProgress.from_env(transfer_id)
+    progress.start_stage("token_validation")
+
     try:
         # Get authenticated services using user's tokens
-        youtube = get_authenticated_service_with_token(youtube_token)
-        if not youtube:
-            raise HTTPException(
-                status_code=401, 
-                detail="Invalid or expired YouTube token. Please reconnect your YouTube account."
-            )
-        
-        sp = get_spotify_client_with_token(spotify_token)
-        if not sp:
-            raise HTTPException(
-                status_code=401, 
-                detail="Invalid or expired Spotify token. Please reconnect your Spotify account."
-            )
+        with stats.stage("token_validation"):
+            youtube = get_authenticated_service_with_token(youtube_token)
+            stats.count_call("token_validation")
+            if not youtube:
+                raise HTTPException(
+                    status_code=401, 
+                    detail="Invalid or expired YouTube token. Please reconnect your YouTube account."
+                )
+            
+            # Later calls wait their turn with other users' transfers
+            sp = schedule_spotify(get_spotify_client_with_token(spotify_token), spotify_token)
+            stats.count_call("token_validation")
+            if not sp:
+                raise HTTPException(
+                    status_code=401, 
+                    detail="Invalid or expired Spotify token. Please reconnect your Spotify account."
+                )
 
         # Perform the transfer with user's authenticated services
         result = transfer_playlist_api(
@@ -71,19 +190,212 @@ def transfer_playlist(
             playlist_name=request.playlist_name,
             is_public=request.is_public,
             description=request.description or "",
+            stats=stats,
+            progress=progress,
+            client_factory=SpotifyTokenClientFactory(spotify_token),
+            preview=request.preview,
+            youtube_user=quota_user(youtube_token),
         )
         
-        return result
+        if result.success:
+            result.transfer_id = transfer_id
+            get_result_store().save(transfer_id, result)
+            if request.preview:
+                get_result_store().save_request(transfer_id, {
+                    "playlist_name": request.playlist_name,
+                    "is_public": request.is_public,
+                    "description": request.description or "",
+                })
+        if not request.include_songs:
+            result = result.model_copy(update={"songs": []})
+        
+        return PydanticJSONResponse(result)
         
+    except HTTPException:
+        progress.start_stage("failed")
+        raise
     except ValueError as e:
+        progress.start_stage("failed")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"[Transfer] - Error during playlist transfer: {str(e)}")
+        progress.start_stage("failed")
+        logger.error(f"[Transfer] - Error during playlist transfer: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Transfer failed: {str(e)}")
 
 
+@router.post("/{transfer_id}/commit", response_model=TransferResponse)
+async def commit_transfer(
+    transfer_id: str,
+    request: Optional[CommitRequest] = None,
+    spotify_token: Optional[str] = Header(None, alias="X-Spotify-Token")
+) -> TransferResponse:
+    """
+    Writes the match set of a preview transfer to a Spotify playlist.
+    
+    No searches are made: the playlist is created (or reused by name) and the
+    songs matched by the preview are added in order. Each preview can be
+    committed once, and only by the Spotify user who made it; the result then
+    replaces the preview under the same transfer_id. Runs on the transfer
+    executor like a transfer.
+    
+    Args:
+        transfer_id: ID of a preview transfer
+        request: Optional overrides of the preview's playlist name, visibility and description
+        spotify_token: User's Spotify access token from header
+        
+    Returns:
+        TransferResponse: The preview's results, pointing at the written playlist
+    """
+    if not spotify_token:
+        raise HTTPException(
+            status_code=401, 
+            detail="Missing Spotify authentication token. Please reconnect your Spotify account."
+        )
+
+    try:
+        return await get_transfer_executor().run(_run_commit, transfer_id, request or CommitRequest(), spotify_token)
+    except TransferRejectedError as e:
+        logger.info(f"[Transfer] - Rejected commit ({e.status_code}): {e}, queue position {e.queue_position}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=f"{e}. The server is busy, please retry in {e.retry_after} seconds (queue position {e.queue_position}).",
+            headers={
+                "Retry-After": str(e.retry_after),
+                "X-Queue-Position": str(e.queue_position),
+            }
+        )
+
+
+def _run_commit(transfer_id: str, request: CommitRequest, spotify_token: str) -> PydanticJSONResponse:
+    """
+    Loads a preview and writes its match set. Runs on the transfer executor.
+
+    Args:
+        transfer_id: ID of a preview transfer
+        request: Overrides of the preview's playlist settings
+        spotify_token: User's Spotify access token
+
+    Returns:
+        PydanticJSONResponse: Encoded TransferResponse
+    """
+    store = get_result_store()
+    preview = store.get_summary(transfer_id)
+    settings = store.get_request(transfer_id)
+    if preview is None or settings is None:
+        raise HTTPException(status_code=404, detail="Preview not found or it has expired.")
+    # Checked before claiming, so nobody else can take or block the owner's one commit
+    _check_owner(transfer_id, spotify_token)
+
+    stats = TransferStatsCollector()
+    claimed = False
+    try:
+        with stats.stage("token_validation"):
+            # Later calls wait their turn with other users' transfers
+            sp = schedule_spotify(get_spotify_client_with_token(spotify_token), spotify_token)
+            stats.count_call("token_validation")
+            if not sp:
+                raise HTTPException(
+                    status_code=401, 
+                    detail="Invalid or expired Spotify token. Please reconnect your Spotify account."
+                )
+
+        if not preview.preview or not store.claim_commit(transfer_id):
+            raise HTTPException(status_code=409, detail="This preview has already been committed.")
+        claimed = True
+
+        result = commit_transfer_api(
+            sp,
+            preview=preview,
+            songs=store.get_songs(transfer_id, 0, store.count_songs(transfer_id)),
+            playlist_name=request.playlist_name or settings["playlist_name"],
+            is_public=settings["is_public"] if request.is_public is None else request.is_public,
+            description=settings["description"] if request.description is None else request.description,
+            stats=stats,
+        )
+        store.save(transfer_id, result)
+        if not request.include_songs:
+            result = result.model_copy(update={"songs": []})
+        
+        return PydanticJSONResponse(result)
+        
+    except HTTPException:
+        if claimed:
+            store.release_commit(transfer_id)
+        raise
+    except Exception as e:
+        if claimed:
+            store.release_commit(transfer_id)
+        logger.error(f"[Transfer] - Error while committing transfer {transfer_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Commit failed: {str(e)}")
+
+
+@router.get("/{transfer_id}/songs", response_model=SongPage)
+async def get_transfer_songs(
+    transfer_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    spotify_token: Optional[str] = Header(None, alias="X-Spotify-Token")
+) -> SongPage:
+    """
+    Returns one page of the songs of a finished transfer, to the user who submitted it.
+
+    Args:
+        transfer_id: ID from the TransferResponse
+        offset: Index of the first song to return
+        limit: Maximum number of songs to return (1-500)
+        spotify_token: User's Spotify access token from header
+
+    Returns:
+        SongPage: The songs, the total count and the offset of the next page, if any
+    """
+    await run_in_threadpool(_check_owner, transfer_id, spotify_token)
+    store = get_result_store()
+    if store.get_summary(transfer_id) is None:
+        raise HTTPException(status_code=404, detail="Transfer not found or its results have expired.")
+    
+    total = store.count_songs(transfer_id)
+    songs = store.get_songs(transfer_id, offset, limit)
+    next_offset = offset + limit if offset + limit < total else None
+    return SongPage(
+        transfer_id=transfer_id,
+        offset=offset,
+        limit=limit,
+        total=total,
+        songs=songs,
+        next_offset=next_offset,
+    )
+
+
+@router.get("/{transfer_id}/progress", response_model=TransferProgressStatus)
+async def get_transfer_status(
+    transfer_id: str,
+    spotify_token: Optional[str] = Header(None, alias="X-Spotify-Token")
+) -> TransferProgressStatus:
+    """
+    Returns how far a transfer has got, to the user who submitted it. Works from any worker,
+    and for a while after it finished.
+
+    Args:
+        transfer_id: ID the transfer was started under (TransferRequest.transfer_id)
+        spotify_token: User's Spotify access token from header
+
+    Returns:
+        TransferProgressStatus: Current stage and the number of videos searched and matched
+    """
+    await run_in_threadpool(_check_owner, transfer_id, spotify_token)
+    status = get_transfer_progress(get_inflight_transfers().resolve(transfer_id))
+    if status is None:
+        raise HTTPException(status_code=404, detail="Transfer not found or its progress has expired.")
+    return TransferProgressStatus(**status)
+
+
 # Keep your existing health check endpoint
 @router.get("/health")
-def health_check():
-    """Health check endpoint to verify the service is running."""
-    return {"status": "healthy", "service": "playlist-transfer"}
\ No newline at end of file
+async def health_check():
+    """Health check endpoint to verify the service is running and report transfer and Spotify load."""
+    return {
+        "status": "healthy",
+        "service": "playlist-transfer",
+        "transfers": get_transfer_executor().stats(),
+        "spotify_scheduler": get_spotify_scheduler().stats(),
+    }
\ No newline at end of file
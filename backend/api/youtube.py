@@ -1,10 +1,15 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import Annotated
+import itertools
+import json
+from fastapi import APIRouter, HTTPException, Header, Query
+from fastapi.responses import StreamingResponse
+from typing import Annotated, Iterator, List, Optional
+from backend.models.transfer import YouTubeVideo
 from backend.services.youtube_api import (
     get_authenticated_service,
-    get_video_titles_from_playlist,
+    iter_playlist_pages,
     extract_playlist_id
 )
+from backend.services.youtube_quota import YouTubeQuotaExceededError, get_youtube_quota, quota_user, seconds_until_reset
 
 
 router = APIRouter()
@@ -19,15 +24,21 @@ def fetch_titles(
             description="The link to the YouTube playlist"
         )
     ] = None
-) -> dict:
+) -> StreamingResponse:
     """
     Fetches video titles from a YouTube playlist.
+
+    The body is the usual {"status": "success", "titles": [...]}, but it is
+    streamed page by page as the playlist is fetched: the first titles are
+    sent after one page fetch instead of after the whole playlist. Errors on
+    the first page still return an error status; a later failure cuts the
+    body short, leaving invalid JSON.
     
     Args:
         playlist_url (str): The YouTube playlist url.
 
     Returns:
-        dict: A list of video titles.
+        StreamingResponse: JSON object with the list of video titles.
     """
     try:
         playlist_id = extract_playlist_id(playlist_url)
@@ -38,7 +49,48 @@ def fetch_titles(
         if not youtube:
             raise HTTPException(status_code=500, detail="YouTube API client not authenticated")
         
-        titles = get_video_titles_from_playlist(youtube, playlist_id)
-        return {"status": "success", "titles": titles}
+        # Fetch the first page before answering, so a bad playlist is still an HTTP error
+        pages = iter_playlist_pages(youtube, playlist_id)
+        first_page = next(pages, [])
+    except YouTubeQuotaExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(seconds_until_reset())})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    return StreamingResponse(_stream_titles(itertools.chain([first_page], pages)), media_type="application/json")
+
+
+@router.get("/quota", tags=["YouTube"])
+def fetch_quota(
+    youtube_token: Optional[str] = Header(None, alias="X-YouTube-Token")
+) -> dict:
+    """
+    Reports today's YouTube Data API quota usage and the remaining budget.
+
+    The quota day ends at midnight Pacific time. Usage is counted by this
+    server, so units spent elsewhere with the same Google project are not
+    included.
+
+    Args:
+        youtube_token (str): Optional user's YouTube access token, to add that user's own usage.
+
+    Returns:
+        dict: day, daily_limit, used, remaining and units by API method; user_used and user_remaining with a token.
+    """
+    usage = get_youtube_quota().usage(quota_user(youtube_token) if youtube_token else None)
+    usage["resets_in"] = seconds_until_reset()
+    return usage
+
+
+def _stream_titles(pages: Iterator[List[YouTubeVideo]]) -> Iterator[bytes]:
+    """
+    Yields the /titles JSON body one page at a time. Starlette runs this generator on its threadpool.
+    """
+    yield b'{"status":"success","titles":['
+    separator = b""
+    for page in pages:
+        if page:
+            yield separator + b",".join(json.dumps(video.title, ensure_ascii=False).encode() for video in page)
+            separator = b","
+    yield b"]}"
+
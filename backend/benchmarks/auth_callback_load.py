@@ -0,0 +1,227 @@
+# backend/benchmarks/auth_callback_load.py
+"""
+Load test for the OAuth callback endpoints.
+
+Starts a local stand-in for the Spotify and Google token/user-info endpoints
+(with configurable latency), fires many concurrent callbacks at the auth router
+and measures event loop lag with a heartbeat task while they are in flight.
+
+Run from the repository root:
+    python -m backend.benchmarks.auth_callback_load --callbacks 500 --latency-ms 200
+
+Pass --blocking-baseline to also run the old synchronous `requests` code path
+for comparison.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from typing import Callable, List, Tuple
+
+import requests
+from aiohttp import web
+
+# Dummy OAuth client configuration so the callbacks can run without real credentials
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "bench-client-id")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "bench-client-secret")
+os.environ.setdefault("YOUTUBE_CLIENT_CONFIG", json.dumps({
+    "web": {
+        "client_id": "bench-client-id",
+        "client_secret": "bench-client-secret",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }
+}))
+
+from backend.api import auth  # noqa: E402
+from backend.models.oauth import OAuthCallbackRequest  # noqa: E402
+from backend.services.http_client import close_http_session  # noqa: E402
+
+
+def build_fake_provider(latency: float) -> web.Application:
+    """
+    Builds an aiohttp app that mimics the token and user info endpoints.
+
+    Args:
+        latency (float): Seconds to wait before answering each request.
+
+    Returns:
+        web.Application: The fake provider application.
+    """
+
+    async def token(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        return web.json_response({
+            "access_token": "bench-access-token",
+            "refresh_token": "bench-refresh-token",
+            "expires_in": 3600,
+            "token_type": "Bearer",
+            "scope": "playlist-modify-public",
+        })
+
+    async def spotify_me(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        return web.json_response({"id": "bench-user", "display_name": "Bench User", "images": []})
+
+    async def google_userinfo(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        return web.json_response({"id": "bench-user", "name": "Bench User", "picture": None})
+
+    app = web.Application()
+    app.router.add_post("/spotify/token", token)
+    app.router.add_get("/spotify/me", spotify_me)
+    app.router.add_post("/google/token", token)
+    app.router.add_get("/google/userinfo", google_userinfo)
+    return app
+
+
+def start_fake_provider(latency: float) -> Tuple[str, Callable[[], None]]:
+    """
+    Serves the fake provider from its own thread and event loop, so the blocking
+    baseline cannot stall it along with the loop under test.
+
+    Args:
+        latency (float): Seconds to wait before answering each request.
+
+    Returns:
+        Tuple[str, Callable[[], None]]: The provider base URL and a function that stops it.
+    """
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    state = {}
+
+    async def serve() -> None:
+        runner = web.AppRunner(build_fake_provider(latency))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        state["runner"] = runner
+        state["port"] = site._server.sockets[0].getsockname()[1]
+        ready.set()
+
+    def run() -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(serve())
+        loop.run_forever()
+        loop.run_until_complete(state["runner"].cleanup())
+        loop.close()
+
+    thread = threading.Thread(target=run, name="fake-oauth-provider", daemon=True)
+    thread.start()
+    ready.wait()
+
+    def stop() -> None:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return f"http://127.0.0.1:{state['port']}", stop
+
+
+async def monitor_loop_lag(interval: float, samples: List[float], stop: asyncio.Event) -> None:
+    """
+    Records how late the event loop wakes a task that sleeps for `interval` seconds.
+    """
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, time.perf_counter() - started - interval))
+
+
+async def blocking_spotify_callback(request: OAuthCallbackRequest) -> None:
+    """
+    The previous callback implementation: synchronous requests inside an async def.
+    """
+    token_response = requests.post(auth.SPOTIFY_TOKEN_URL, data={"code": request.code}).json()
+    requests.get(
+        auth.SPOTIFY_USER_INFO_URL,
+        headers={"Authorization": f"Bearer {token_response['access_token']}"}
+    )
+
+
+async def run_load(callbacks: int, interval: float, blocking: bool) -> dict:
+    """
+    Fires `callbacks` concurrent callbacks (half Spotify, half YouTube) and measures loop lag.
+
+    Returns:
+        dict: Timing and lag statistics for the run.
+    """
+    lag_samples: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_loop_lag(interval, lag_samples, stop))
+
+    calls = []
+    for i in range(callbacks):
+        request = OAuthCallbackRequest(code=f"bench-code-{i:06d}", redirect_uri="http://localhost:3000/callback")
+        if blocking:
+            calls.append(blocking_spotify_callback(request))
+        elif i % 2 == 0:
+            calls.append(auth.spotify_oauth_callback(request))
+        else:
+            calls.append(auth.youtube_oauth_callback(request))
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await monitor
+
+    errors = [r for r in results if isinstance(r, Exception)]
+    lag_ms = sorted(sample * 1000 for sample in lag_samples) or [0.0]
+    return {
+        "mode": "blocking-requests" if blocking else "async-pooled",
+        "callbacks": callbacks,
+        "errors": len(errors),
+        "wall_time_s": round(elapsed, 3),
+        "callbacks_per_s": round(callbacks / elapsed, 1) if elapsed else 0.0,
+        "loop_lag_p50_ms": round(statistics.median(lag_ms), 2),
+        "loop_lag_p99_ms": round(lag_ms[min(len(lag_ms) - 1, int(len(lag_ms) * 0.99))], 2),
+        "loop_lag_max_ms": round(lag_ms[-1], 2),
+    }
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    base_url, stop_provider = start_fake_provider(args.latency_ms / 1000)
+    auth.SPOTIFY_TOKEN_URL = f"{base_url}/spotify/token"
+    auth.SPOTIFY_USER_INFO_URL = f"{base_url}/spotify/me"
+    auth.GOOGLE_TOKEN_URL = f"{base_url}/google/token"
+    auth.GOOGLE_USER_INFO_URL = f"{base_url}/google/userinfo"
+
+    try:
+        reports = []
+        if args.blocking_baseline:
+            reports.append(await run_load(min(args.callbacks, 20), args.interval_ms / 1000, blocking=True))
+        report = await run_load(args.callbacks, args.interval_ms / 1000, blocking=False)
+        reports.append(report)
+    finally:
+        await close_http_session()
+        stop_provider()
+
+    for entry in reports:
+        print(json.dumps(entry))
+
+    if report["errors"]:
+        print(f"FAIL: {report['errors']} callbacks raised errors", file=sys.stderr)
+        return 1
+    if report["loop_lag_p99_ms"] > args.max_p99_lag_ms:
+        print(f"FAIL: p99 event loop lag {report['loop_lag_p99_ms']}ms exceeds {args.max_p99_lag_ms}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test the OAuth callback endpoints")
+    parser.add_argument("--callbacks", type=int, default=500, help="Number of concurrent callbacks to fire")
+    parser.add_argument("--latency-ms", type=float, default=200, help="Simulated provider latency per request")
+    parser.add_argument("--interval-ms", type=float, default=10, help="Heartbeat interval for the loop lag monitor")
+    parser.add_argument("--max-p99-lag-ms", type=float, default=50, help="Fail if the p99 loop lag exceeds this")
+    parser.add_argument("--blocking-baseline", action="store_true", help="Also run the old blocking requests code path")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main_async(parse_args())))
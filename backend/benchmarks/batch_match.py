@@ -0,0 +1,75 @@
+# backend/benchmarks/batch_match.py
+"""
+Bulk title matching: the legacy /spotify/add-tracks loop versus api_match_titles().
+
+Matches the titles of a synthetic playlist through FakeSpotify with:
+  - legacy: api_search_track() for one title after another (limit=1, no scoring)
+  - batch: api_match_titles() with the detailed scorer at each --jobs value,
+    first with cold caches and then again with the caches it just filled
+
+and reports wall time, titles per second, searches per title and accuracy
+against the known answers. Use --latency-ms to simulate the network; the
+concurrency only pays off when searches wait on it.
+
+Run from the repository root:
+    python -m backend.benchmarks.batch_match --titles 2000 --latency-ms 10
+"""
+
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from backend.benchmarks.fakes import FakeConfig, FakeSpotify, make_synthetic_playlist, reset_matching_state
+from backend.models.transfer import SpotifyTrack
+from backend.services.spotify_api import api_match_titles, api_search_track
+
+
+def accuracy(track_ids, expected) -> float:
+    return round(sum(1 for track_id, answer in zip(track_ids, expected) if track_id == answer) / len(expected), 4)
+
+
+def report(mode: str, jobs: int, titles: int, wall_time: float, searches: int, track_ids, expected) -> None:
+    print(json.dumps({
+        "mode": mode,
+        "jobs": jobs,
+        "titles": titles,
+        "wall_time_s": round(wall_time, 3),
+        "titles_per_s": round(titles / wall_time, 1),
+        "searches_per_title": round(searches / titles, 3),
+        "accuracy": accuracy(track_ids, expected),
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=int, default=2000, help="number of titles to match")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[8, 16], help="concurrency levels for the batch matcher")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="simulated Spotify latency per call")
+    args = parser.parse_args()
+
+    playlist = make_synthetic_playlist(args.titles)
+    titles = [item["snippet"]["title"] for item in playlist.items]
+    expected = [playlist.expected[item["snippet"]["resourceId"]["videoId"]] for item in playlist.items]
+    config = FakeConfig(latency=args.latency_ms / 1000)
+
+    sp = FakeSpotify(playlist.tracks, config)
+    started = time.perf_counter()
+    track_ids = [api_search_track(sp, title) for title in titles]
+    report("legacy", 1, len(titles), time.perf_counter() - started, sp.calls["search"], track_ids, expected)
+
+    for jobs in args.jobs:
+        reset_matching_state()
+        for mode in ("batch_cold", "batch_warm"):
+            sp = FakeSpotify(playlist.tracks, config)
+            track_ids = [None] * len(titles)
+            started = time.perf_counter()
+            for index, spotify_track in api_match_titles(sp, titles, jobs=jobs):
+                track_ids[index] = spotify_track.track_id if isinstance(spotify_track, SpotifyTrack) else None
+            report(mode, jobs, len(titles), time.perf_counter() - started, sp.calls["search"], track_ids, expected)
+
+
+if __name__ == "__main__":
+    main()
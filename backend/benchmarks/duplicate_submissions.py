@@ -0,0 +1,136 @@
+# backend/benchmarks/duplicate_submissions.py
+"""
+Identical transfer submissions arriving while the first one still runs.
+
+Sends --submissions identical POST /transfer/ requests (same tokens,
+playlist and name) through the ASGI app, --gap-ms apart, as a
+double-click or a frontend retry would. Reports wall time, upstream
+searches, playlists created and distinct transfer_ids in the responses:
+  - off: every submission runs its own transfer
+  - same_worker: duplicates attach to the running transfer
+  - two_workers: submissions alternate between two registries sharing one
+    state, so half of them attach through the shared claim and result store
+
+Then sends two identical submissions at once, one asking for gzip and one
+for no compression, and exits with status 1 unless each gets the encoding
+it asked for and the same transfer: the attached submission must not
+share the first one's response object.
+
+Run from the repository root:
+    python -m backend.benchmarks.duplicate_submissions --submissions 4 --videos 300
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx
+
+from backend.api import transfer as transfer_router
+from backend.benchmarks.fakes import FakeConfig, build_fake_clients, reset_matching_state
+from backend.services import transfer_dedup
+from backend.services.shared_state import get_shared_state
+from backend.services.transfer_dedup import InFlightTransfers
+
+
+async def submit_all(app, submissions: int, gap: float) -> list:
+    headers = {"X-Spotify-Token": "bench-spotify", "X-YouTube-Token": "bench-youtube"}
+    body = {"playlist_url": "https://www.youtube.com/playlist?list=PLbench", "playlist_name": "Duplicate benchmark", "include_songs": False}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=600) as client:
+        async def one(index):
+            await asyncio.sleep(index * gap)
+            response = await client.post("/transfer/", json=body, headers=headers)
+            response.raise_for_status()
+            return response.json()
+
+        return await asyncio.gather(*(one(index) for index in range(submissions)))
+
+
+async def submit_mixed_encodings(app) -> list:
+    headers = {"X-Spotify-Token": "bench-spotify", "X-YouTube-Token": "bench-youtube"}
+    body = {"playlist_url": "https://www.youtube.com/playlist?list=PLbench", "playlist_name": "Encoding check"}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=600) as client:
+        async def one(encoding):
+            try:
+                response = await client.post("/transfer/", json=body, headers=headers | {"Accept-Encoding": encoding})
+            except httpx.DecodingError:
+                # The body doesn't match the Content-Encoding it was sent with
+                return encoding, "undecodable", None
+            response.raise_for_status()
+            return encoding, response.headers.get("content-encoding"), response.json()
+
+        return await asyncio.gather(one("gzip"), one("identity"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--submissions", type=int, default=4, help="identical submissions")
+    parser.add_argument("--videos", type=int, default=300, help="playlist size")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="simulated Spotify latency per call")
+    parser.add_argument("--gap-ms", type=float, default=200.0, help="delay between submissions")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="flotunes-bench-"))
+    from backend.main import app
+
+    for mode in ("off", "same_worker", "two_workers"):
+        reset_matching_state()
+        sp, youtube, _ = build_fake_clients(args.videos, FakeConfig(latency=args.latency_ms / 1000))
+        transfer_router.get_authenticated_service_with_token = lambda token: youtube
+        transfer_router.get_spotify_client_with_token = lambda token: sp
+        transfer_router.get_spotify_profile = lambda token: {"id": sp.user_id, "country": None}
+
+        registries = [InFlightTransfers(get_shared_state(), enabled=mode != "off", poll_interval=0.05)]
+        if mode == "two_workers":
+            registries.append(InFlightTransfers(get_shared_state(), poll_interval=0.05))
+        turn = iter(range(10 ** 9))
+        transfer_router.get_inflight_transfers = lambda: registries[next(turn) % len(registries)]
+        transfer_dedup._inflight_transfers = registries[0]  # for /progress lookups
+
+        started = time.perf_counter()
+        results = asyncio.run(submit_all(app, args.submissions, args.gap_ms / 1000))
+        wall_time = time.perf_counter() - started
+
+        print(json.dumps({
+            "mode": mode,
+            "submissions": args.submissions,
+            "wall_time_s": round(wall_time, 2),
+            "searches": sp.calls["search"],
+            "playlists_created": sp.calls["user_playlist_create"],
+            "playlists_in_account": len(sp.playlists),
+            "distinct_transfer_ids": len({result["transfer_id"] for result in results}),
+        }))
+
+    reset_matching_state()
+    sp, youtube, _ = build_fake_clients(args.videos, FakeConfig(latency=args.latency_ms / 1000))
+    transfer_router.get_authenticated_service_with_token = lambda token: youtube
+    transfer_router.get_spotify_client_with_token = lambda token: sp
+    transfer_router.get_spotify_profile = lambda token: {"id": sp.user_id, "country": None}
+    registry = InFlightTransfers(get_shared_state(), poll_interval=0.05)
+    transfer_router.get_inflight_transfers = lambda: registry
+    transfer_dedup._inflight_transfers = registry
+
+    responses = asyncio.run(submit_mixed_encodings(app))
+    (_, gzip_encoding, gzip_result), (_, identity_encoding, identity_result) = responses
+    encodings_ok = gzip_encoding == "gzip" and identity_encoding is None and gzip_result is not None and gzip_result == identity_result
+    print(json.dumps({
+        "mode": "mixed_encodings",
+        "content_encodings": [gzip_encoding, identity_encoding],
+        "searches": sp.calls["search"],
+        "same_result": gzip_result == identity_result,
+    }))
+    if not encodings_ok:
+        print("Attached submissions did not each get their own encoding of the transfer", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
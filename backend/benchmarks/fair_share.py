@@ -0,0 +1,84 @@
+# backend/benchmarks/fair_share.py
+"""
+A small transfer arriving while a large one saturates the Spotify request rate.
+
+User A matches --big-videos videos with --big-jobs concurrent searches (a
+large transfer on sharding workers, or a bulk /spotify/match-batch). After
+--delay-ms, user B matches --small-videos videos one at a time, like a
+normal transfer. Every call goes through a scheduler limited to --rate calls
+per second. Reports both users' completion times:
+  - fifo: one queue for everyone, so B waits behind A's backlog
+  - fair: deficit round-robin per user, as in production
+
+Run from the repository root:
+    python -m backend.benchmarks.fair_share --rate 200
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from backend.benchmarks.fakes import FakeConfig, build_fake_clients, reset_matching_state
+from backend.benchmarks.search_resilience import to_videos
+from backend.services.spotify_api import api_match_videos
+from backend.services.spotify_scheduler import FairShareScheduler, ScheduledSpotify
+
+
+def run(mode: str, args) -> dict:
+    reset_matching_state()
+    config = FakeConfig(latency=args.latency_ms / 1000)
+    sp_big, _, big_playlist = build_fake_clients(args.big_videos, config, seed=1)
+    sp_small, _, small_playlist = build_fake_clients(args.small_videos, config, seed=2)
+    scheduler = FairShareScheduler(rate=args.rate, burst=10, max_in_flight=0)
+
+    # fifo puts both users behind one key, which is a single first-come queue
+    big = ScheduledSpotify(sp_big, "user-a", scheduler)
+    small = ScheduledSpotify(sp_small, "user-a" if mode == "fifo" else "user-b", scheduler)
+
+    durations = {}
+
+    def transfer(name, sp, playlist, jobs):
+        started = time.perf_counter()
+        api_match_videos(sp, to_videos(playlist), jobs=jobs)
+        durations[name] = time.perf_counter() - started
+
+    threads = [threading.Thread(target=transfer, args=("big", big, big_playlist, args.big_jobs))]
+    threads[0].start()
+    time.sleep(args.delay_ms / 1000)
+    threads.append(threading.Thread(target=transfer, args=("small", small, small_playlist, 1)))
+    threads[1].start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "mode": mode,
+        "rate": args.rate,
+        "big_videos": args.big_videos,
+        "big_s": round(durations["big"], 2),
+        "small_videos": args.small_videos,
+        "small_s": round(durations["small"], 2),
+        "big_searches": sp_big.calls["search"],
+        "small_searches": sp_small.calls["search"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--big-videos", type=int, default=1000, help="videos of user A")
+    parser.add_argument("--big-jobs", type=int, default=16, help="concurrent searches of user A")
+    parser.add_argument("--small-videos", type=int, default=20, help="videos of user B")
+    parser.add_argument("--rate", type=float, default=200.0, help="scheduler limit, calls per second")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="simulated Spotify latency per call")
+    parser.add_argument("--delay-ms", type=float, default=500.0, help="when user B starts")
+    args = parser.parse_args()
+
+    for mode in ("fifo", "fair"):
+        print(json.dumps(run(mode, args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,540 @@
+# backend/benchmarks/fakes.py
+"""
+Offline stand-ins for the Spotify and YouTube clients.
+
+FakeSpotify and FakeYouTube implement the parts of spotipy.Spotify and the
+googleapiclient YouTube Resource that the transfer pipeline uses, so
+transfer_playlist_api() and friends can run end to end without network
+access. Both support configurable latency, random errors and periodic 429
+responses, and count every call they receive.
+
+make_synthetic_playlist() builds a reproducible playlist of messy YouTube
+titles together with a Spotify catalog that contains the expected matches.
+"""
+
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import httplib2
+from googleapiclient.errors import HttpError
+from spotipy.exceptions import SpotifyException
+
+
+# Roughly the number of markets Spotify lists per track and per album
+MARKETS = ["".join(pair) for pair in itertools.product("ABCDEFGHIJKLMNOPQRSTUVWXYZ", repeat=2)][:185]
+
+FIRST_NAMES = [
+    "Tasha", "Nathaniel", "Cece", "Marcus", "Ada", "Leon", "Priya", "Kofi", "Elena", "Hiro",
+    "Maya", "Jonas", "Zara", "Theo", "Amara", "Felix", "Ines", "Ravi", "Lola", "Omar",
+]
+LAST_NAMES = [
+    "Cobbs", "Bassey", "Winans", "Rivers", "Stone", "Okafor", "Lindqvist", "Moreau", "Tanaka", "Osei",
+    "Castillo", "Novak", "Haddad", "Brennan", "Ferreira", "Kowalski", "Adeyemi", "Larsen", "Quinn", "Sato",
+]
+SONG_WORDS_A = [
+    "Golden", "Silent", "Electric", "Broken", "Endless", "Midnight", "Crimson", "Gentle", "Wild", "Hollow",
+    "Faithful", "Distant", "Burning", "Quiet", "Restless", "Shining", "Lonely", "Sacred", "Falling", "Velvet",
+]
+SONG_WORDS_B = [
+    "River", "Heart", "Skyline", "Promise", "Garden", "Echo", "Harbor", "Fire", "Season", "Horizon",
+    "Letter", "Mountain", "Shadow", "Anthem", "Window", "Ocean", "Highway", "Prayer", "Daydream", "Lantern",
+]
+
+
+@dataclass
+class FakeConfig:
+    """
+    Behaviour of a fake client.
+
+    Attributes:
+        latency (float): Seconds added to every call.
+        jitter (float): Extra random latency, uniformly drawn from [0, jitter].
+        error_rate (float): Probability that a call fails with a 5xx error.
+        rate_limit_every (int): Every Nth call fails with a 429 (0 disables).
+        retry_after (float): Retry-After value, in seconds, sent with 429 responses.
+        seed (int): Seed for the random error and latency draws.
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_every: int = 0
+    retry_after: float = 1
+    seed: int = 7
+
+
+@dataclass
+class SyntheticPlaylist:
+    """
+    A synthetic YouTube playlist and the Spotify catalog it should be matched against.
+
+    Attributes:
+        items (List[dict]): playlistItems resources, in playlist order.
+        tracks (List[dict]): Full Spotify track objects in the catalog.
+        expected (Dict[str, Optional[str]]): video_id -> expected Spotify track id (None for non-music uploads).
+    """
+    items: List[dict] = field(default_factory=list)
+    tracks: List[dict] = field(default_factory=list)
+    expected: Dict[str, Optional[str]] = field(default_factory=dict)
+
+
+class _Faults:
+    """Shared latency, error and 429 injection for the fakes."""
+
+    def __init__(self, config: FakeConfig):
+        self.config = config
+        self.calls: Counter = Counter()
+        self._random = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._total = 0
+
+    def before_call(self, endpoint: str) -> Optional[int]:
+        """
+        Counts the call, sleeps for the configured latency and decides whether it fails.
+
+        Returns:
+            Optional[int]: HTTP status to fail with, or None if the call succeeds.
+        """
+        with self._lock:
+            self.calls[endpoint] += 1
+            self._total += 1
+            total = self._total
+            delay = self.config.latency + (self._random.uniform(0, self.config.jitter) if self.config.jitter else 0.0)
+            failed = self.config.error_rate and self._random.random() < self.config.error_rate
+
+        if delay:
+            time.sleep(delay)
+        if self.config.rate_limit_every and total % self.config.rate_limit_every == 0:
+            return 429
+        if failed:
+            return 503
+        return None
+
+
+class FakeSpotify:
+    """
+    Injectable stand-in for spotipy.Spotify.
+
+    Search is a token-overlap match over the catalog: a track is returned when
+    it shares at least 70% of the query's words, which, like the real API,
+    makes noisy titles such as "... [Official Video] (Bass Boosted)" miss.
+    Field filters (track:"..." artist:"...") require every word of each
+    field to match. Passing `market` drops available_markets from the
+    response, as Spotify does.
+    """
+
+    def __init__(self, tracks: List[dict], config: Optional[FakeConfig] = None, user_id: str = "bench-user", country: str = "US"):
+        self.config = config or FakeConfig()
+        self.faults = _Faults(self.config)
+        self.user_id = user_id
+        self.country = country
+        self.response_bytes = 0
+        self.playlists: Dict[str, dict] = {}
+        self.playlist_items: Dict[str, List[str]] = defaultdict(list)
+
+        self._tracks = tracks
+        self._track_bytes = [len(json.dumps(track)) for track in tracks]
+        self._market_bytes = len(json.dumps(MARKETS)) + len('"available_markets": , ')
+        self._name_tokens = [set(_tokens(track["name"])) for track in tracks]
+        self._artist_tokens = [set(_tokens(" ".join(a["name"] for a in track["artists"]))) for track in tracks]
+        self._all_tokens = [name | artist for name, artist in zip(self._name_tokens, self._artist_tokens)]
+        self._index: Dict[str, set] = defaultdict(set)
+        for position, tokens in enumerate(self._all_tokens):
+            for token in tokens:
+                self._index[token].add(position)
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self) -> Counter:
+        return self.faults.calls
+
+    def _check(self, endpoint: str) -> None:
+        status = self.faults.before_call(endpoint)
+        if status == 429:
+            raise SpotifyException(429, -1, f"{endpoint}: API rate limit exceeded", headers={"Retry-After": str(self.config.retry_after)})
+        if status:
+            raise SpotifyException(status, -1, f"{endpoint}: Service unavailable")
+
+    # Users
+    def me(self) -> dict:
+        self._check("me")
+        return {"id": self.user_id, "display_name": "Bench User", "country": self.country, "images": []}
+
+    def current_user(self) -> dict:
+        return self.me()
+
+    # Playlists
+    def current_user_playlists(self, limit: int = 50, offset: int = 0) -> dict:
+        self._check("current_user_playlists")
+        with self._lock:
+            playlists = list(self.playlists.values())
+        page = playlists[offset:offset + limit]
+        return {
+            "items": page,
+            "limit": limit,
+            "offset": offset,
+            "total": len(playlists),
+            "next": "next" if offset + limit < len(playlists) else None,
+        }
+
+    def user_playlist_create(self, user: str, name: str, public: bool = True, collaborative: bool = False, description: str = "") -> dict:
+        self._check("user_playlist_create")
+        with self._lock:
+            playlist_id = f"playlist{len(self.playlists):04d}"
+            playlist = {
+                "id": playlist_id,
+                "name": name,
+                "public": public,
+                "description": description,
+                "owner": {"id": self.user_id},
+                "external_urls": {"spotify": f"https://open.spotify.com/playlist/{playlist_id}"},
+            }
+            self.playlists[playlist_id] = playlist
+        return playlist
+
+    def playlist(self, playlist_id: str, **kwargs) -> dict:
+        self._check("playlist")
+        if playlist_id not in self.playlists:
+            raise SpotifyException(404, -1, "Resource not found")
+        return self.playlists[playlist_id]
+
+    def playlist_is_following(self, playlist_id: str, user_ids: List[str]) -> List[bool]:
+        self._check("playlist_is_following")
+        return [playlist_id in self.playlists for _ in user_ids]
+
+    def playlist_add_items(self, playlist_id: str, items: List[str], position: Optional[int] = None) -> dict:
+        self._check("playlist_add_items")
+        if len(items) > 100:
+            raise SpotifyException(400, -1, "Too many ids requested")
+        with self._lock:
+            self.playlist_items[playlist_id].extend(items)
+        return {"snapshot_id": "bench"}
+
+    # Search
+    def search(self, q: str, limit: int = 10, offset: int = 0, type: str = "track", market: Optional[str] = None) -> dict:
+        self._check("search")
+        positions = self._find(q)[offset:offset + limit]
+
+        items = []
+        size = 120
+        for position in positions:
+            track = self._tracks[position]
+            size += self._track_bytes[position]
+            if market:
+                track = {key: value for key, value in track.items() if key != "available_markets"}
+                track["album"] = {key: value for key, value in track["album"].items() if key != "available_markets"}
+                track["is_playable"] = True
+                size -= 2 * self._market_bytes
+            items.append(track)
+
+        with self._lock:
+            self.response_bytes += size
+
+        return {"tracks": {
+            "href": "https://api.spotify.com/v1/search",
+            "items": items,
+            "limit": limit,
+            "offset": offset,
+            "next": None,
+            "previous": None,
+            "total": len(positions),
+        }}
+
+    def _find(self, q: str) -> List[int]:
+        fields = dict((key, value) for key, value in re.findall(r'(track|artist):"([^"]*)"', q))
+        if fields:
+            candidates = None
+            for key, value in fields.items():
+                wanted = set(_tokens(value))
+                tokens = self._name_tokens if key == "track" else self._artist_tokens
+                matches = {position for token in wanted for position in self._index.get(token, ())}
+                matches = {position for position in matches if wanted <= tokens[position]}
+                candidates = matches if candidates is None else candidates & matches
+            return sorted(candidates or ())
+
+        words = set(_tokens(q))
+        if not words:
+            return []
+        needed = max(1, int(len(words) * 0.7 + 0.999))
+        # A hit shares `needed` words, so it must contain one of the
+        # len - needed + 1 rarest words; only those postings are scanned
+        rarest = sorted(words, key=lambda token: len(self._index.get(token, ())))[:len(words) - needed + 1]
+        candidates = set().union(*(self._index.get(token, set()) for token in rarest))
+        scored = []
+        for position in candidates:
+            score = len(words & self._all_tokens[position])
+            if score >= needed:
+                scored.append((-score, position))
+        scored.sort()
+        return [position for _, position in scored]
+
+
+class _FakeRequest:
+    def __init__(self, faults: _Faults, endpoint: str, response: dict):
+        self._faults = faults
+        self._endpoint = endpoint
+        self._response = response
+
+    def execute(self, **kwargs) -> dict:
+        status = self._faults.before_call(self._endpoint)
+        if status == 429:
+            response = httplib2.Response({"status": status, "retry-after": str(self._faults.config.retry_after)})
+            raise HttpError(response, b'{"error": {"message": "injected rate limit"}}')
+        if status:
+            raise HttpError(httplib2.Response({"status": status}), b'{"error": {"message": "injected failure"}}')
+        return self._response
+
+
+class _FakePlaylistItems:
+    def __init__(self, youtube: "FakeYouTube"):
+        self._youtube = youtube
+
+    def list(self, part: str, playlistId: str, maxResults: int = 5, pageToken: Optional[str] = None, **kwargs) -> _FakeRequest:
+        items = self._youtube.playlists.get(playlistId, [])
+        start = int(pageToken or 0)
+        response = {
+            "kind": "youtube#playlistItemListResponse",
+            "items": items[start:start + maxResults],
+            "pageInfo": {"totalResults": len(items), "resultsPerPage": maxResults},
+        }
+        if start + maxResults < len(items):
+            response["nextPageToken"] = str(start + maxResults)
+        return _FakeRequest(self._youtube.faults, "playlistItems.list", response)
+
+
+class _FakeChannels:
+    def __init__(self, youtube: "FakeYouTube"):
+        self._youtube = youtube
+
+    def list(self, part: str, mine: bool = False, maxResults: int = 5, **kwargs) -> _FakeRequest:
+        return _FakeRequest(self._youtube.faults, "channels.list", {"items": [{"id": self._youtube.channel_id}]})
+
+
+class FakeYouTube:
+    """
+    Injectable stand-in for the googleapiclient YouTube v3 Resource.
+
+    Supports playlistItems().list(...).execute() with pageToken paging and
+    channels().list(...).execute(). Failures raise googleapiclient HttpError.
+    """
+
+    def __init__(self, playlists: Dict[str, List[dict]], config: Optional[FakeConfig] = None, channel_id: str = "UCbench"):
+        self.playlists = playlists
+        self.config = config or FakeConfig()
+        self.channel_id = channel_id
+        self.faults = _Faults(self.config)
+
+    @property
+    def calls(self) -> Counter:
+        return self.faults.calls
+
+    def playlistItems(self) -> _FakePlaylistItems:
+        return _FakePlaylistItems(self)
+
+    def channels(self) -> _FakeChannels:
+        return _FakeChannels(self)
+
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def make_track(track_id: str, name: str, artists: List[str], album: str) -> dict:
+    """
+    Builds a full Spotify track object, shaped like a search result item.
+    """
+    artist_objects = [
+        {
+            "external_urls": {"spotify": f"https://open.spotify.com/artist/{artist_name.replace(' ', '')}"},
+            "href": f"https://api.spotify.com/v1/artists/{artist_name.replace(' ', '')}",
+            "id": artist_name.replace(" ", ""),
+            "name": artist_name,
+            "type": "artist",
+            "uri": f"spotify:artist:{artist_name.replace(' ', '')}",
+        }
+        for artist_name in artists
+    ]
+    images = [
+        {"height": size, "width": size, "url": f"https://i.scdn.co/image/{track_id}{size}"}
+        for size in (640, 300, 64)
+    ]
+    return {
+        "album": {
+            "album_type": "single",
+            "artists": artist_objects[:1],
+            "available_markets": MARKETS,
+            "external_urls": {"spotify": f"https://open.spotify.com/album/a{track_id}"},
+            "href": f"https://api.spotify.com/v1/albums/a{track_id}",
+            "id": f"a{track_id}",
+            "images": images,
+            "name": album,
+            "release_date": "2021-04-16",
+            "release_date_precision": "day",
+            "total_tracks": 1,
+            "type": "album",
+            "uri": f"spotify:album:a{track_id}",
+        },
+        "artists": artist_objects,
+        "available_markets": MARKETS,
+        "disc_number": 1,
+        "duration_ms": 215000,
+        "explicit": False,
+        "external_ids": {"isrc": f"USBENCH{track_id[-5:]}"},
+        "external_urls": {"spotify": f"https://open.spotify.com/track/{track_id}"},
+        "href": f"https://api.spotify.com/v1/tracks/{track_id}",
+        "id": track_id,
+        "is_local": False,
+        "name": name,
+        "popularity": 50,
+        "preview_url": None,
+        "track_number": 1,
+        "type": "track",
+        "uri": f"spotify:track:{track_id}",
+    }
+
+
+def _make_item(video_id: str, title: str, channel: str) -> dict:
+    return {
+        "kind": "youtube#playlistItem",
+        "snippet": {
+            "title": title,
+            "resourceId": {"kind": "youtube#video", "videoId": video_id},
+            "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}},
+            "channelTitle": "Bench Playlist Owner",
+            "videoOwnerChannelTitle": channel,
+        },
+    }
+
+
+def make_synthetic_playlist(size: int, seed: int = 42) -> SyntheticPlaylist:
+    """
+    Builds a reproducible playlist of messy YouTube titles plus a matching Spotify catalog.
+
+    About 10% of the videos are non-music uploads with no catalog entry, and
+    every fifth matchable song also has a karaoke distractor in the catalog.
+
+    Args:
+        size (int): Number of videos in the playlist.
+        seed (int): Random seed, so runs are comparable across commits.
+
+    Returns:
+        SyntheticPlaylist: Playlist items, catalog tracks and expected matches.
+    """
+    rng = random.Random(seed)
+    playlist = SyntheticPlaylist()
+
+    for index in range(size):
+        video_id = f"vid{index:07d}"
+        artist = f"{FIRST_NAMES[index % len(FIRST_NAMES)]} {LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]}"
+        song = f"{SONG_WORDS_A[rng.randrange(len(SONG_WORDS_A))]} {SONG_WORDS_B[rng.randrange(len(SONG_WORDS_B))]}"
+        if index >= len(FIRST_NAMES) * len(LAST_NAMES):
+            # Keep artist+song pairs unique on large playlists
+            song = f"{song} {index // (len(FIRST_NAMES) * len(LAST_NAMES))}"
+        feature = f"{FIRST_NAMES[(index + 7) % len(FIRST_NAMES)]} {LAST_NAMES[(index + 3) % len(LAST_NAMES)]}"
+        channel = f"{artist}VEVO".replace(" ", "")
+
+        shape = rng.random()
+        if shape < 0.10:
+            title = rng.choice([
+                f"Podcast Episode {index}: Talking About {song}",
+                f"{song} DJ Mix {index} (2 Hour Set)",
+                f"Vlog {index} - A Day In {song.split()[-1]} Town",
+            ])
+            playlist.items.append(_make_item(video_id, title, "Some Creator"))
+            playlist.expected[video_id] = None
+            continue
+        elif shape < 0.30:
+            title = f"{artist} - {song} (Official Video)"
+        elif shape < 0.45:
+            title = f"{artist} - {song} [Official Audio]"
+        elif shape < 0.60:
+            title = f"{artist} - {song}"
+        elif shape < 0.70:
+            title = f"{artist} – {song} ft. {feature}"
+        elif shape < 0.85:
+            title = song
+            channel = f"{artist} - Topic"
+        else:
+            title = f"{artist} - {song} [Lyrics] (HD)"
+
+        track_id = f"trk{index:07d}"
+        artists = [artist, feature] if "ft." in title else [artist]
+        playlist.tracks.append(make_track(track_id, song, artists, f"{song} - Single"))
+        playlist.items.append(_make_item(video_id, title, channel))
+        playlist.expected[video_id] = track_id
+
+        if index % 5 == 0:
+            playlist.tracks.append(make_track(f"krk{index:07d}", f"{song} (Karaoke Version)", ["Karaoke Stars"], "Karaoke Hits"))
+
+    return playlist
+
+
+def build_fake_clients(
+    size: int,
+    spotify_config: Optional[FakeConfig] = None,
+    youtube_config: Optional[FakeConfig] = None,
+    playlist_id: str = "PLbench",
+    seed: int = 42,
+) -> Tuple[FakeSpotify, FakeYouTube, SyntheticPlaylist]:
+    """
+    Builds a FakeSpotify and FakeYouTube pair serving one synthetic playlist.
+
+    Returns:
+        Tuple[FakeSpotify, FakeYouTube, SyntheticPlaylist]: The clients and the playlist they serve.
+    """
+    playlist = make_synthetic_playlist(size, seed=seed)
+    sp = FakeSpotify(playlist.tracks, spotify_config)
+    youtube = FakeYouTube({playlist_id: playlist.items}, youtube_config)
+    return sp, youtube, playlist
+
+
+@dataclass(frozen=True)
+class FakeSpotifyFactory:
+    """
+    Picklable recipe for a FakeSpotify serving a synthetic playlist, for worker processes.
+
+    Each call rebuilds the same playlist from `size` and `seed`, so a client built
+    in a worker answers exactly like the one built by build_fake_clients().
+    """
+    size: int
+    config: Optional[FakeConfig] = None
+    seed: int = 42
+
+    def __call__(self) -> FakeSpotify:
+        return FakeSpotify(make_synthetic_playlist(self.size, seed=self.seed).tracks, self.config)
+
+
+def reset_matching_state() -> None:
+    """
+    Drops the process-wide state the matcher learns between transfers.
+
+    The shared state (search cache, resolutions, negative matches, strategy
+    stats, playlist-name index) makes a second transfer of the same videos
+    cheaper. Benchmarks reset it before each run so every size is measured
+    cold and runs don't depend on their order.
+    """
+    from backend.services import (
+        match_cache, playlist_index, resilience, retry_policy, search_coalescer, search_strategy, shared_state,
+        spotify_scheduler, transfer_dedup, transfer_results, youtube_quota,
+    )
+
+    shared_state._shared_state = None
+    match_cache._negative_cache = None
+    match_cache._resolution_store = None
+    match_cache._search_cache = None
+    search_strategy._strategy_stats = None
+    playlist_index._playlist_index = None
+    transfer_results._result_store = None
+    search_coalescer._search_coalescer = None
+    resilience._search_caller = None
+    retry_policy._retry_policy = None
+    transfer_dedup._inflight_transfers = None
+    spotify_scheduler._spotify_scheduler = None
+    youtube_quota._youtube_quota = None
+    youtube_quota._page_cache = None
@@ -0,0 +1,129 @@
+# backend/benchmarks/logging_overhead.py
+"""
+Per-video logging overhead of the matching hot loop, before and after the
+move from rich console prints to structured, level-gated logging.
+
+Each simulated video emits what api_search_track_detailed and
+api_process_videos_to_songs log for one video with ten first-query
+candidates. Output goes to os.devnull so only formatting and handler
+cost is measured, not the terminal.
+
+Structured logging is measured through get_logger(), exactly as the
+server sets it up. Its handler is created once per process from LOG_LEVEL
+and LOG_FORMAT, so each configuration runs in its own subprocess with
+stderr sent to os.devnull.
+
+Run from the repository root:
+    python -m backend.benchmarks.logging_overhead --videos 2000
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+from rich.console import Console
+
+from backend.services.logger import get_logger, log_event, shutdown_logging
+
+
+CANDIDATES_PER_VIDEO = 10
+TITLE = "Tasha Cobbs - You Still Love Me [Official Video] (Bass Boosted)"
+
+
+def run_rich_print(videos: int) -> float:
+    """
+    The previous output: rich markup printed for every video and candidate.
+    """
+    console = Console(file=open(os.devnull, "w"), force_terminal=True, color_system="truecolor")
+    queries = ["Tasha Cobbs - You Still Love Me", "Tasha Cobbs You Still Love Me", "You Still Love Me"]
+
+    started = time.perf_counter()
+    for index in range(videos):
+        console.print(f"\n[bold] [{index + 1}/{videos}][/bold]")
+        console.print(f"[cyan]Searching for: {TITLE}[/cyan]")
+        console.print(f"[dim]Search strategies: {queries[:3]}...[/dim]")
+        for candidate in range(CANDIDATES_PER_VIDEO):
+            console.print(f"[dim]  → Tasha Cobbs - You Still Love Me {candidate} (confidence: 0.{candidate}5)[/dim]")
+        console.print(f"[green] High confidence match found: 0.95[/green]")
+        console.print(f"[green]✅ Found: Tasha Cobbs - You Still Love Me (confidence: 0.95)[/green]")
+    return time.perf_counter() - started
+
+
+def run_structured(videos: int) -> tuple:
+    """
+    The new output: log_event on a get_logger() logger, configured by LOG_LEVEL and LOG_FORMAT.
+
+    Returns:
+        tuple: (seconds spent on the logging thread, seconds until the queue was drained)
+    """
+    logger = get_logger("backend.benchmarks.logging_overhead")
+
+    started = time.perf_counter()
+    for index in range(videos):
+        video_id = f"video{index:06d}"
+        log_event(logger, logging.DEBUG, "search.start", video_id=video_id, title=TITLE, strategies=5)
+        for candidate in range(CANDIDATES_PER_VIDEO):
+            if logger.isEnabledFor(logging.DEBUG):
+                log_event(logger, logging.DEBUG, "search.candidate", video_id=video_id, track_id=f"t{candidate}", confidence=0.95)
+        log_event(logger, logging.DEBUG, "search.match", video_id=video_id, track_id="t0", confidence=0.95, searches=1)
+    hot_path = time.perf_counter() - started
+
+    shutdown_logging()
+    drained = time.perf_counter() - started
+    return hot_path, drained
+
+
+def run_structured_subprocess(videos: int, level: str, log_format: str) -> tuple:
+    """
+    Runs run_structured() in a fresh interpreter with the given logging configuration.
+    """
+    env = dict(os.environ, LOG_LEVEL=level, LOG_FORMAT=log_format)
+    output = subprocess.run(
+        [sys.executable, "-m", "backend.benchmarks.logging_overhead", "--videos", str(videos), "--structured-only"],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=True,
+        text=True,
+    ).stdout
+    return tuple(json.loads(output))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure per-video logging overhead")
+    parser.add_argument("--videos", type=int, default=2000, help="Number of simulated videos")
+    parser.add_argument("--structured-only", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.structured_only:
+        # Child of run_structured_subprocess(): the configuration comes from the environment
+        print(json.dumps(run_structured(args.videos)))
+        return
+
+    def per_video_us(seconds: float) -> float:
+        return round(seconds / args.videos * 1_000_000, 2)
+
+    results = [{"mode": "before: rich print", "per_video_us": per_video_us(run_rich_print(args.videos))}]
+
+    for label, level, log_format in [
+        ("after: production (WARNING, gated)", "WARNING", "json"),
+        ("after: INFO text (default dev)", "INFO", "text"),
+        ("after: DEBUG json via queue", "DEBUG", "json"),
+    ]:
+        hot_path, drained = run_structured_subprocess(args.videos, level, log_format)
+        results.append({
+            "mode": label,
+            "per_video_us": per_video_us(hot_path),
+            "per_video_us_including_drain": per_video_us(drained),
+        })
+
+    for entry in results:
+        print(json.dumps(entry))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# backend/benchmarks/matching_bench.py
+"""
+Micro-benchmark and accuracy check for the CPU-side matching core.
+
+Uses the labeled corpus in data/title_corpus.json: messy YouTube titles,
+the Spotify track each should match (or null when the right answer is
+"no match"), and the candidates Spotify returns for them. Reports:
+  - titles/s for generate_smart_search_queries
+  - candidates/s for calculate_match_confidence
+  - artist strings/s for create_artist_string
+  - match accuracy of api_search_track_detailed against the labels, run
+    through FakeSpotify so the full query -> search -> score path is used,
+    overall and per title shape, with the searches it took per title
+
+Exits with status 1 when accuracy drops below --min-accuracy, so a speed
+optimization that quietly costs match quality fails the run.
+
+Run from the repository root:
+    python -m backend.benchmarks.matching_bench --rounds 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+# Keep the matcher's logging out of the measurement
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from backend.benchmarks.fakes import FakeSpotify, make_track, reset_matching_state
+from backend.models.candidate import TrackCandidate
+from backend.models.transfer import YouTubeVideo
+from backend.services.spotify_api import (
+    api_search_track_detailed,
+    calculate_match_confidence,
+    create_artist_string,
+    generate_smart_search_queries,
+)
+
+
+CORPUS_PATH = Path(__file__).parent / "data" / "title_corpus.json"
+
+# Accuracy of the matcher when the corpus was labeled; raise it as matching improves
+DEFAULT_MIN_ACCURACY = 0.81
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> List[dict]:
+    """
+    Loads the corpus and expands each compact candidate into a full Spotify track object.
+    """
+    with open(path, encoding="utf-8") as file:
+        entries = json.load(file)["entries"]
+    for entry in entries:
+        entry["tracks"] = [
+            make_track(candidate["id"], candidate["name"], candidate["artists"], candidate["album"])
+            for candidate in entry["candidates"]
+        ]
+    return entries
+
+
+def bench_query_generation(entries: List[dict], rounds: int) -> float:
+    titles = [entry["title"] for entry in entries]
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for title in titles:
+            generate_smart_search_queries(title)
+    return len(titles) * rounds / (time.perf_counter() - started)
+
+
+def bench_scoring(entries: List[dict], rounds: int) -> float:
+    pairs = [(entry["title"], TrackCandidate.from_spotify(track)) for entry in entries for track in entry["tracks"]]
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for title, track in pairs:
+            calculate_match_confidence(title, track)
+    return len(pairs) * rounds / (time.perf_counter() - started)
+
+
+def bench_artist_strings(entries: List[dict], rounds: int) -> float:
+    artist_lists = [TrackCandidate.from_spotify(track).artists for entry in entries for track in entry["tracks"]]
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for artists in artist_lists:
+            create_artist_string(artists)
+    return len(artist_lists) * rounds / (time.perf_counter() - started)
+
+
+def check_accuracy(entries: List[dict]) -> dict:
+    """
+    Runs api_search_track_detailed for every labeled title and compares the result with the label.
+
+    Each entry starts from cold caches and strategy stats: it has its own
+    FakeSpotify catalogue, and the numbers must not depend on corpus order.
+    """
+    correct = 0
+    searches = 0
+    by_shape: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
+    misses = []
+
+    for entry in entries:
+        reset_matching_state()
+        sp = FakeSpotify(entry["tracks"])
+        video = YouTubeVideo(
+            video_id=entry["video_id"],
+            title=entry["title"],
+            youtube_url=f"https://www.youtube.com/watch?v={entry['video_id']}",
+            video_owner_channel=entry.get("channel"),
+        )
+        match = api_search_track_detailed(sp, video)
+        searches += sp.calls["search"]
+
+        got = match.track_id if match else None
+        shape = by_shape[entry.get("shape") or "other"]
+        shape[1] += 1
+        shape[2] += sp.calls["search"]
+        if got == entry["expected"]:
+            correct += 1
+            shape[0] += 1
+        else:
+            misses.append({"title": entry["title"], "expected": entry["expected"], "got": got})
+
+    return {
+        "accuracy": round(correct / len(entries), 4),
+        "searches_per_title": round(searches / len(entries), 3),
+        "by_shape": {name: round(hits / total, 2) for name, (hits, total, _) in sorted(by_shape.items())},
+        "searches_by_shape": {name: round(shape_searches / total, 2) for name, (_, total, shape_searches) in sorted(by_shape.items())},
+        "misses": misses,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Matching-engine throughput and accuracy")
+    parser.add_argument("--rounds", type=int, default=200, help="Passes over the corpus for the throughput numbers")
+    parser.add_argument("--min-accuracy", type=float, default=DEFAULT_MIN_ACCURACY, help="Fail below this match accuracy")
+    parser.add_argument("--corpus", type=Path, default=CORPUS_PATH, help="Labeled corpus to use")
+    parser.add_argument("--show-misses", action="store_true", help="List titles the matcher got wrong")
+    args = parser.parse_args()
+
+    entries = load_corpus(args.corpus)
+    accuracy = check_accuracy(entries)
+
+    result = {
+        "titles": len(entries),
+        "query_generation_titles_per_s": round(bench_query_generation(entries, args.rounds)),
+        "scoring_candidates_per_s": round(bench_scoring(entries, args.rounds)),
+        "artist_strings_per_s": round(bench_artist_strings(entries, args.rounds)),
+        "accuracy": accuracy["accuracy"],
+        "searches_per_title": accuracy["searches_per_title"],
+        "accuracy_by_shape": accuracy["by_shape"],
+        "searches_by_shape": accuracy["searches_by_shape"],
+    }
+    print(json.dumps(result, ensure_ascii=False))
+
+    if args.show_misses:
+        for miss in accuracy["misses"]:
+            print(json.dumps(miss, ensure_ascii=False))
+
+    if accuracy["accuracy"] < args.min_accuracy:
+        print(f"Match accuracy {accuracy['accuracy']:.2%} is below the {args.min_accuracy:.2%} threshold", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
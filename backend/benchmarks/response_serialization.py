@@ -0,0 +1,108 @@
+# backend/benchmarks/response_serialization.py
+"""
+Encoding CPU and bytes on the wire for TransferResponse at 100, 1,000 and 5,000 songs.
+
+The responses come from real transfers of synthetic playlists through the
+offline fakes. For each size it reports:
+  - encode time and size for FastAPI's default path (dump to Python objects,
+    then json.dumps in JSONResponse), the same with orjson (ORJSONResponse),
+    and PydanticJSONResponse (pydantic-core straight to JSON bytes)
+  - gzip and deflate size and compression time of that body
+  - the size of the summary-only response (include_songs=False)
+
+Run from the repository root:
+    python -m backend.benchmarks.response_serialization
+"""
+
+import argparse
+import gzip
+import json
+import os
+import tempfile
+import time
+import zlib
+from typing import Callable
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from backend.benchmarks.fakes import build_fake_clients, reset_matching_state
+from backend.models.transfer import TransferResponse
+from backend.services.serialization import ORJSONResponse, PydanticJSONResponse
+from backend.services.transfer_api import transfer_playlist_api
+
+
+DEFAULT_SIZES = [100, 1000, 5000]
+COMPRESSION_LEVEL = 6
+
+_adapter = TypeAdapter(TransferResponse)
+
+
+def make_response(size: int) -> TransferResponse:
+    sp, youtube, _ = build_fake_clients(size)
+    reset_matching_state()
+    return transfer_playlist_api(youtube, sp, "https://www.youtube.com/playlist?list=PLbench", f"Serialization {size}")
+
+
+def timed(fn: Callable[[], bytes], repeat: int) -> tuple:
+    """
+    Returns (best time in ms, output) over `repeat` runs.
+    """
+    best = float("inf")
+    output = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = fn()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 3), output
+
+
+def benchmark_size(size: int, repeat: int) -> dict:
+    response = make_response(size)
+    result = {"songs": size}
+
+    encoders = {
+        "fastapi_default": lambda: JSONResponse(_adapter.dump_python(response, mode="json")).body,
+        "pydantic_json": lambda: PydanticJSONResponse(response).body,
+    }
+    if ORJSONResponse is not None:
+        encoders["orjson"] = lambda: ORJSONResponse(_adapter.dump_python(response, mode="json")).body
+
+    body = b""
+    for name, encode in encoders.items():
+        ms, body = timed(encode, repeat)
+        result[f"{name}_ms"] = ms
+        result[f"{name}_bytes"] = len(body)
+
+    gzip_ms, gzipped = timed(lambda: gzip.compress(body, compresslevel=COMPRESSION_LEVEL), repeat)
+    deflate_ms, deflated = timed(lambda: zlib.compress(body, COMPRESSION_LEVEL), repeat)
+    result.update({
+        "gzip_ms": gzip_ms,
+        "gzip_bytes": len(gzipped),
+        "deflate_ms": deflate_ms,
+        "deflate_bytes": len(deflated),
+        "summary_only_bytes": len(PydanticJSONResponse(response.model_copy(update={"songs": []})).body),
+    })
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TransferResponse encoding and compression cost")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Songs per response")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="flotunes-bench-") as workdir:
+        previous_cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for size in args.sizes:
+                print(json.dumps(benchmark_size(size, args.repeat)), flush=True)
+        finally:
+            os.chdir(previous_cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# backend/benchmarks/search_payload.py
+"""
+Spotify search payload and candidate memory, with and without market scoping.
+
+Two measurements:
+  - Per transfer: search response bytes per video and peak memory of a full
+    transfer through FakeSpotify, once without a market (every track and
+    album carries available_markets) and once with market="from_token".
+  - Per candidate: memory held by one search result kept as the raw track
+    dict versus as a TrackCandidate.
+
+Strategy learning and the negative cache are switched off so both transfer
+runs send the same searches. FakeSpotify hands out shared track objects
+rather than freshly decoded JSON, so the transfer peak mostly reflects the
+pipeline's own allocations; the per-candidate numbers show what a decoded
+response would cost if it were kept.
+
+Run from the repository root:
+    python -m backend.benchmarks.search_payload --videos 1000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import tracemalloc
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("SEARCH_STRATEGY_ADAPTIVE", "false")
+os.environ.setdefault("NEGATIVE_CACHE_ENABLED", "false")
+
+from backend.benchmarks.fakes import build_fake_clients, make_track, reset_matching_state
+from backend.models.candidate import TrackCandidate
+from backend.services import spotify_api
+from backend.services.transfer_api import transfer_playlist_api
+
+
+def measure_transfer(videos: int, market) -> dict:
+    sp, youtube, _ = build_fake_clients(videos)
+    reset_matching_state()
+    spotify_api.SEARCH_MARKET = market
+
+    tracemalloc.start()
+    response = transfer_playlist_api(youtube, sp, "https://www.youtube.com/playlist?list=PLbench", "Payload benchmark")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "market": market or "none",
+        "searches": sp.calls["search"],
+        "search_kb_per_video": round(sp.response_bytes / videos / 1024, 2),
+        "search_mb_total": round(sp.response_bytes / (1024 * 1024), 2),
+        "peak_memory_mb": round(peak / (1024 * 1024), 2),
+        "transferred": response.transferred_songs,
+    }
+
+
+def measure_candidate_memory(count: int) -> dict:
+    """
+    Memory per retained search result: a decoded raw track dict vs a TrackCandidate.
+    """
+    template = json.dumps(make_track("trk0000001", "You Still Love Me", ["Tasha Cobbs Leonard", "Cece Winans"], "Royalty"))
+
+    tracemalloc.start()
+    raw = [json.loads(template) for _ in range(count)]
+    raw_bytes, _ = tracemalloc.get_traced_memory()
+    candidates = [TrackCandidate.from_spotify(track) for track in raw]
+    total_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    candidate_bytes = total_bytes - raw_bytes
+    del raw, candidates
+    return {
+        "raw_dict_bytes_per_track": round(raw_bytes / count),
+        "candidate_bytes_per_track": round(candidate_bytes / count),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Search payload bytes and candidate memory")
+    parser.add_argument("--videos", type=int, default=1000, help="Synthetic playlist size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="flotunes-bench-") as workdir:
+        previous_cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for market in (None, "from_token"):
+                print(json.dumps(measure_transfer(args.videos, market)), flush=True)
+        finally:
+            os.chdir(previous_cwd)
+
+    print(json.dumps(measure_candidate_memory(10_000)))
+
+
+if __name__ == "__main__":
+    main()
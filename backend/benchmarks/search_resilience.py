@@ -0,0 +1,133 @@
+# backend/benchmarks/search_resilience.py
+"""
+Spotify search tail latency and outages, with and without the resilience layer.
+
+tail: --videos videos are matched one after another against a FakeSpotify
+whose searches take --latency-ms, except a --tail-rate share that take
+--tail-ms. Reports total time, p50/p99 time per video and upstream
+searches, with hedging off and on.
+
+outage: every search fails with a 503 after --latency-ms. Reports the
+time to get through the playlist, upstream searches and how the videos
+were reported, with the circuit breaker effectively off and on.
+
+Run from the repository root:
+    python -m backend.benchmarks.search_resilience --videos 300
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import threading
+import time
+
+os.environ.setdefault("LOG_LEVEL", "ERROR")  # The outage scenario logs every failed search
+os.environ.setdefault("RETRY_ENABLED", "false")  # Hedging and the breaker alone; see transient_errors for retries
+
+from backend.benchmarks.fakes import FakeConfig, FakeSpotify, make_synthetic_playlist, reset_matching_state
+from backend.models.transfer import SpotifyTrack, YouTubeVideo
+from backend.services import resilience
+from backend.services.resilience import CircuitBreaker, LatencyTracker, ResilientCaller, UpstreamUnavailableError
+from backend.services.spotify_api import api_match_video, api_match_videos
+
+
+class TailLatencySpotify(FakeSpotify):
+    """FakeSpotify whose searches are occasionally very slow."""
+
+    def __init__(self, tracks, latency: float, tail_latency: float, tail_rate: float, seed: int = 7):
+        super().__init__(tracks)
+        self.latency = latency
+        self.tail_latency = tail_latency
+        self.tail_rate = tail_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+    def search(self, *args, **kwargs) -> dict:
+        with self._random_lock:
+            slow = self._random.random() < self.tail_rate
+        time.sleep(self.tail_latency if slow else self.latency)
+        return super().search(*args, **kwargs)
+
+
+def to_videos(playlist) -> list:
+    return [
+        YouTubeVideo(
+            video_id=item["snippet"]["resourceId"]["videoId"],
+            title=item["snippet"]["title"],
+            youtube_url="",
+            video_owner_channel=item["snippet"].get("videoOwnerChannelTitle"),
+        )
+        for item in playlist.items
+    ]
+
+
+def bench_tail(playlist, args) -> None:
+    videos = to_videos(playlist)
+    for hedging in (False, True):
+        reset_matching_state()
+        resilience._search_caller = ResilientCaller(CircuitBreaker("bench"), LatencyTracker(), hedging=hedging)
+        sp = TailLatencySpotify(playlist.tracks, args.latency_ms / 1000, args.tail_ms / 1000, args.tail_rate)
+
+        per_video = []
+        matched = 0
+        started = time.perf_counter()
+        for video in videos:
+            video_started = time.perf_counter()
+            matched += isinstance(api_match_video(sp, video), SpotifyTrack)
+            per_video.append(time.perf_counter() - video_started)
+        wall_time = time.perf_counter() - started
+
+        per_video.sort()
+        print(json.dumps({
+            "scenario": "tail",
+            "hedging": hedging,
+            "videos": len(videos),
+            "matched": matched,
+            "wall_time_s": round(wall_time, 2),
+            "p50_ms": round(statistics.median(per_video) * 1000, 1),
+            "p99_ms": round(per_video[int(len(per_video) * 0.99) - 1] * 1000, 1),
+            "upstream_searches": sp.calls["search"],
+        }))
+
+
+def bench_outage(playlist, args) -> None:
+    videos = to_videos(playlist)
+    for breaker_on in (False, True):
+        reset_matching_state()
+        breaker = CircuitBreaker("bench", failure_threshold=5 if breaker_on else 10 ** 9, reset_timeout=30)
+        resilience._search_caller = ResilientCaller(breaker, hedging=False)
+        sp = FakeSpotify(playlist.tracks, FakeConfig(latency=args.latency_ms / 1000, error_rate=1.0))
+
+        started = time.perf_counter()
+        songs = api_match_videos(sp, videos)
+        wall_time = time.perf_counter() - started
+
+        unavailable = sum(1 for song in songs if song.error and "unavailable" in song.error)
+        print(json.dumps({
+            "scenario": "outage",
+            "breaker": breaker_on,
+            "videos": len(videos),
+            "wall_time_s": round(wall_time, 2),
+            "upstream_searches": sp.calls["search"],
+            "reported_unavailable": unavailable,
+            "reported_not_found": sum(1 for song in songs if song.status == "failed") - unavailable,
+        }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--videos", type=int, default=300, help="playlist size")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="normal search latency")
+    parser.add_argument("--tail-ms", type=float, default=1500.0, help="latency of a slow search")
+    parser.add_argument("--tail-rate", type=float, default=0.02, help="share of searches that are slow")
+    args = parser.parse_args()
+
+    playlist = make_synthetic_playlist(args.videos)
+    bench_tail(playlist, args)
+    bench_outage(playlist, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# backend/benchmarks/search_track_load.py
+"""
+GET /spotify/search-track under concurrent, autocomplete-style load.
+
+Sends --requests requests, --concurrency at a time, for a small set of
+titles in random case and spacing variants, through the ASGI app. Three
+setups are compared:
+  - fresh_client: a new SpotifyOAuth manager and Spotify client per request,
+    as before client pooling
+  - pooled: the process-wide client, every request searching on its own
+  - pooled_coalesced: the pooled client plus the search coalescer
+
+The real spotipy client and OAuth manager are used, with a token cache file
+in a temporary directory; only the HTTP call is replaced by FakeSpotify,
+after the client has looked its token up. Reports throughput, latency
+percentiles and the number of upstream searches.
+
+Run from the repository root:
+    python -m backend.benchmarks.search_track_load --requests 2000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx
+import spotipy
+
+from backend.benchmarks.fakes import FakeConfig, FakeSpotify, make_synthetic_playlist
+from backend.api import spotify as spotify_router
+from backend.services import search_coalescer, spotify_api
+from backend.services.search_coalescer import SearchCoalescer
+
+
+SCOPE = "playlist-modify-public"
+
+
+def setup_environment(catalog: FakeSpotify) -> None:
+    """
+    Points SpotifyOAuth at a valid cached token and routes spotipy's HTTP calls to the fake.
+    """
+    os.chdir(tempfile.mkdtemp(prefix="flotunes-bench-"))
+    os.environ.update({
+        "SPOTIFY_CLIENT_ID": "bench", "SPOTIFY_CLIENT_SECRET": "bench",
+        "SPOTIFY_REDIRECT_URI": "http://localhost/callback", "SPOTIFY_SCOPE": SCOPE,
+    })
+    with open(".cache", "w", encoding="utf-8") as f:
+        json.dump({
+            "access_token": "bench", "token_type": "Bearer", "expires_in": 3600, "scope": SCOPE,
+            "expires_at": int(time.time()) + 3600, "refresh_token": "bench",
+        }, f)
+
+    def internal_call(self, method, url, payload, params):
+        self._auth_headers()  # Token lookup, as the real request does before sending
+        return catalog.search(q=params["q"], limit=params["limit"], type=params["type"], market=params.get("market"))
+
+    spotipy.Spotify._internal_call = internal_call
+
+
+def make_queries(titles, count: int, seed: int = 7):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        title = rng.choice(titles)
+        variant = rng.choice([title, title.lower(), title.upper(), f" {title}  "])
+        queries.append(variant)
+    return queries
+
+
+async def run(app, queries, concurrency: int) -> list:
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one(query):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get("/spotify/search-track", params={"title": query})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(one(query) for query in queries))
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="number of requests")
+    parser.add_argument("--concurrency", type=int, default=64, help="requests in flight at once")
+    parser.add_argument("--distinct", type=int, default=50, help="distinct titles the requests are drawn from")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="simulated Spotify latency per search")
+    args = parser.parse_args()
+
+    playlist = make_synthetic_playlist(max(args.distinct, 100))
+    titles = [item["snippet"]["title"] for item in playlist.items][:args.distinct]
+    queries = make_queries(titles, args.requests)
+    catalog = FakeSpotify(playlist.tracks, FakeConfig(latency=args.latency_ms / 1000))
+    setup_environment(catalog)
+
+    from backend.main import app
+
+    pooled = spotify_api.get_spotify_client
+    setups = [
+        ("fresh_client", lambda scope=None: spotify_api._build_spotify_client(scope or SCOPE), False),
+        ("pooled", pooled, False),
+        ("pooled_coalesced", pooled, True),
+    ]
+    for name, get_client, coalesce in setups:
+        spotify_router.get_spotify_client = get_client
+        search_coalescer._search_coalescer = SearchCoalescer(enabled=coalesce)
+        searches_before = catalog.calls["search"]
+
+        started = time.perf_counter()
+        latencies = asyncio.run(run(app, queries, args.concurrency))
+        wall_time = time.perf_counter() - started
+
+        latencies.sort()
+        print(json.dumps({
+            "setup": name,
+            "requests": len(queries),
+            "wall_time_s": round(wall_time, 3),
+            "requests_per_s": round(len(queries) / wall_time, 1),
+            "p50_ms": round(statistics.median(latencies) * 1000, 2),
+            "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+            "upstream_searches": catalog.calls["search"] - searches_before,
+        }))
+
+
+if __name__ == "__main__":
+    main()
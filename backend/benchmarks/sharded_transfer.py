@@ -0,0 +1,94 @@
+# backend/benchmarks/sharded_transfer.py
+"""
+Throughput of one large transfer with the video matching sharded over worker processes.
+
+Runs the same synthetic playlist through transfer_playlist_api() with 0
+(in-process), 2 and 4 matching workers by default, and reports wall time,
+videos per second, speedup over in-process matching, searches per video and
+match accuracy. Matching is latency-bound against the real API, so use
+--latency-ms to see how throughput scales; with zero latency the runs only
+measure CPU, which needs as many cores as workers.
+
+The worker pool is started and warmed up before each timed run, as it would
+be in a running server. Worker processes keep their own in-process caches
+here; with REDIS_URL set they would share them.
+
+Run from the repository root:
+    python -m backend.benchmarks.sharded_transfer --videos 1000 --latency-ms 10
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+# Keep the transfer's INFO logging out of the measurement
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from backend.benchmarks.fakes import FakeConfig, FakeSpotifyFactory, build_fake_clients, reset_matching_state
+from backend.benchmarks.transfer_throughput import match_accuracy
+from backend.services import sharded_matching
+from backend.services.sharded_matching import ShardedMatcher, _match_chunk
+from backend.services.transfer_api import transfer_playlist_api
+
+
+def run(videos: int, workers: int, chunk_size: int, config: FakeConfig) -> dict:
+    sp, youtube, playlist = build_fake_clients(videos, config)
+    factory = FakeSpotifyFactory(videos, config)
+    reset_matching_state()
+
+    matcher = ShardedMatcher(workers=workers, chunk_size=chunk_size, min_videos=0)
+    sharded_matching._sharded_matcher = matcher
+    if workers:
+        # Start the processes and import the matcher in each, like a server that is already up
+        pool = matcher._get_pool()
+        for future in [pool.submit(_match_chunk, factory, []) for _ in range(workers * 2)]:
+            future.result()
+
+    try:
+        started = time.perf_counter()
+        response = transfer_playlist_api(
+            youtube, sp, "https://www.youtube.com/playlist?list=PLbench", "Sharding benchmark",
+            client_factory=factory,
+        )
+        wall_time = time.perf_counter() - started
+    finally:
+        matcher.shutdown()
+        sharded_matching._sharded_matcher = None
+
+    return {
+        "videos": videos,
+        "workers": workers,
+        "wall_time_s": round(wall_time, 3),
+        "videos_per_s": round(videos / wall_time, 1),
+        "searches_per_video": response.stats.search.queries_per_video,
+        "match_rate": round(response.match_rate, 2),
+        "match_accuracy": match_accuracy(response, playlist.expected),
+        "playlist_writes": sp.calls["playlist_add_items"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--videos", type=int, default=1000, help="playlist size")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2, 4], help="worker counts to compare (0 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=100, help="videos per chunk")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="simulated Spotify latency per call")
+    args = parser.parse_args()
+
+    # The YouTube fetch writes a cache/ directory into the working directory
+    os.chdir(tempfile.mkdtemp(prefix="flotunes-bench-"))
+    config = FakeConfig(latency=args.latency_ms / 1000)
+
+    baseline = None
+    for workers in args.workers:
+        result = run(args.videos, workers, args.chunk_size, config)
+        if baseline is None:
+            baseline = result["wall_time_s"]
+        result["speedup"] = round(baseline / result["wall_time_s"], 2)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# backend/benchmarks/transfer_throughput.py
+"""
+End-to-end throughput of transfer_playlist_api() against the offline fakes.
+
+Runs full transfers of synthetic playlists (10, 100, 1,000 and 5,000 videos
+by default) through FakeYouTube and FakeSpotify and reports, per size:
+wall time, throughput, upstream calls per video, Spotify response bytes,
+peak Python memory and match accuracy against the known answers.
+
+Wall time and memory come from separate runs, because tracemalloc slows
+allocation-heavy code down considerably.
+
+Results are printed as JSON lines and, with --output, written to a JSON file
+stamped with the current git commit so runs can be compared across commits:
+    python -m backend.benchmarks.transfer_throughput --output before.json
+    python -m backend.benchmarks.transfer_throughput --compare before.json
+
+Run from the repository root. Use --latency-ms to simulate network latency.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+# Keep the transfer's INFO logging out of the measurement
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from backend.benchmarks.fakes import FakeConfig, build_fake_clients, reset_matching_state
+from backend.services.transfer_api import transfer_playlist_api
+
+
+DEFAULT_SIZES = [10, 100, 1000, 5000]
+PLAYLIST_ID = "PLbench"
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def match_accuracy(response, expected: Dict[str, Optional[str]]) -> float:
+    """
+    Share of videos whose outcome (matched track, or no match) equals the known answer.
+    """
+    correct = 0
+    for song in response.songs:
+        video_id = re.search(r"v=([\w-]+)", song.youtube_url or "")
+        video_id = video_id.group(1) if video_id else song.id
+        track_id = song.spotify_url.rsplit("/", 1)[-1] if song.status == "success" and song.spotify_url else None
+        if expected.get(video_id) == track_id:
+            correct += 1
+    return round(correct / len(expected), 4) if expected else 0.0
+
+
+def run_transfer(size: int, spotify_config: FakeConfig, youtube_config: FakeConfig, trace_memory: bool) -> dict:
+    """
+    Runs one full transfer and collects its measurements.
+    """
+    sp, youtube, playlist = build_fake_clients(size, spotify_config, youtube_config, playlist_id=PLAYLIST_ID)
+    reset_matching_state()
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    response = transfer_playlist_api(
+        youtube,
+        sp,
+        f"https://www.youtube.com/playlist?list={PLAYLIST_ID}",
+        f"Benchmark {size}",
+        description="transfer_throughput benchmark",
+    )
+    wall_time = time.perf_counter() - started
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    if not response.success:
+        raise RuntimeError(f"Transfer of {size} videos failed: {response.message}")
+
+    calls = dict(sp.calls) | {f"youtube.{name}": count for name, count in youtube.calls.items()}
+    return {
+        "response": response,
+        "expected": playlist.expected,
+        "wall_time": wall_time,
+        "peak_memory": peak,
+        "calls": calls,
+        "response_bytes": sp.response_bytes,
+    }
+
+
+def benchmark_size(size: int, spotify_config: FakeConfig, youtube_config: FakeConfig, measure_memory: bool) -> dict:
+    timed = run_transfer(size, spotify_config, youtube_config, trace_memory=False)
+    response = timed["response"]
+    total_calls = sum(timed["calls"].values())
+
+    result = {
+        "videos": size,
+        "wall_time_s": round(timed["wall_time"], 4),
+        "videos_per_s": round(size / timed["wall_time"], 2) if timed["wall_time"] else None,
+        "calls_per_video": round(total_calls / size, 3),
+        "searches_per_video": round(timed["calls"].get("search", 0) / size, 3),
+        "search_kb_per_video": round(timed["response_bytes"] / size / 1024, 2),
+        "calls": timed["calls"],
+        "match_rate": round(response.match_rate, 2),
+        "match_accuracy": match_accuracy(response, timed["expected"]),
+        "stages": {name: stage.wall_time for name, stage in response.stats.stages.items()} if response.stats else {},
+    }
+    if measure_memory:
+        traced = run_transfer(size, spotify_config, youtube_config, trace_memory=True)
+        result["peak_memory_mb"] = round(traced["peak_memory"] / (1024 * 1024), 2)
+    return result
+
+
+def compare(results: List[dict], baseline_path: str) -> None:
+    """
+    Prints the relative change of the headline numbers against an earlier --output file.
+    """
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = json.load(file)
+    previous = {entry["videos"]: entry for entry in baseline["results"]}
+
+    print(f"\nCompared with {baseline.get('commit', '?')} ({baseline_path}):")
+    for entry in results:
+        before = previous.get(entry["videos"])
+        if not before:
+            continue
+        changes = []
+        for key in ("wall_time_s", "calls_per_video", "search_kb_per_video", "peak_memory_mb", "match_accuracy"):
+            if before.get(key) and entry.get(key) is not None:
+                changes.append(f"{key} {(entry[key] - before[key]) / before[key] * 100:+.1f}%")
+        print(f"  {entry['videos']:>5} videos: " + ", ".join(changes))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="End-to-end transfer throughput against offline fakes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Playlist sizes to transfer")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latency added to every fake API call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency per call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 503 on each Spotify call")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Return a 429 on every Nth Spotify call")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    parser.add_argument("--output", help="Write results (with the git commit) to this JSON file")
+    parser.add_argument("--compare", help="Compare against an earlier --output file")
+    args = parser.parse_args()
+
+    spotify_config = FakeConfig(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        rate_limit_every=args.rate_limit_every,
+    )
+    youtube_config = FakeConfig(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000)
+
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = os.path.abspath(args.compare) if args.compare else None
+
+    # The YouTube fetch writes raw pages under ./cache; keep them out of the working tree
+    results = []
+    with tempfile.TemporaryDirectory(prefix="flotunes-bench-") as workdir:
+        previous_cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for size in args.sizes:
+                result = benchmark_size(size, spotify_config, youtube_config, measure_memory=not args.no_memory)
+                results.append(result)
+                print(json.dumps(result), flush=True)
+        finally:
+            os.chdir(previous_cwd)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "config": {
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "rate_limit_every": args.rate_limit_every,
+        },
+        "results": results,
+    }
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote {output}")
+    if baseline:
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
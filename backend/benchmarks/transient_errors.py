@@ -0,0 +1,159 @@
+# backend/benchmarks/transient_errors.py
+"""
+Full transfers against fakes that fail a share of calls with 503s.
+
+Runs --runs transfers of a --videos-video playlist through
+transfer_playlist_api() with FakeYouTube and FakeSpotify failing
+--error-rate of their calls, each run with a different fault seed, and
+reports per mode: transfers that completed, match accuracy of the
+completed ones, retries per stage and wall time.
+  - no-retry: one try per call; a failed page aborts the transfer and a
+    failed search can turn a video into a false "not found"
+  - retry: jittered exponential backoff within the per-transfer budget
+
+Backoff delays are scaled down with --base-delay-ms to keep the run short.
+
+Then checks that 429s carrying Retry-After control the wait, for both
+fakes: a Retry-After well above the backoff delay must be waited out
+before the retry, and one above the policy's max_delay must end the call
+at once. Exits with status 1 if either doesn't hold.
+
+Run from the repository root:
+    python -m backend.benchmarks.transient_errors --videos 1000 --error-rate 0.02
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("LOG_LEVEL", "CRITICAL")  # Every aborted transfer logs its error
+
+from backend.benchmarks.fakes import FakeConfig, build_fake_clients, reset_matching_state
+from backend.benchmarks.transfer_throughput import match_accuracy
+from backend.services import retry_policy
+from backend.services.retry_policy import RetryPolicy
+from backend.services.transfer_api import transfer_playlist_api
+from backend.services.transfer_stats import TransferStatsCollector
+
+PLAYLIST_ID = "PLbench"
+
+# Retry-After sent by the fakes in the Retry-After check, against a 1s max_delay
+RETRY_AFTER_HONOURED = 0.3
+RETRY_AFTER_TOO_LONG = 5.0
+
+
+def run(retry: bool, args) -> dict:
+    completed = 0
+    accuracies = []
+    retries = {}
+    wall_time = 0.0
+
+    for seed in range(args.runs):
+        reset_matching_state()
+        retry_policy._retry_policy = RetryPolicy(enabled=retry, base_delay=args.base_delay_ms / 1000)
+        config = FakeConfig(error_rate=args.error_rate, seed=seed)
+        sp, youtube, playlist = build_fake_clients(args.videos, config, config, playlist_id=PLAYLIST_ID)
+        stats = TransferStatsCollector(retry_budget=args.budget)
+
+        started = time.perf_counter()
+        response = transfer_playlist_api(
+            youtube,
+            sp,
+            f"https://www.youtube.com/playlist?list={PLAYLIST_ID}",
+            f"Benchmark {seed}",
+            stats=stats,
+            preview=True,
+        )
+        wall_time += time.perf_counter() - started
+
+        for stage, stage_stats in response.stats.stages.items():
+            if stage_stats.retries:
+                retries[stage] = retries.get(stage, 0) + stage_stats.retries
+        if response.success:
+            completed += 1
+            accuracies.append(match_accuracy(response, playlist.expected))
+
+    return {
+        "mode": "retry" if retry else "no-retry",
+        "runs": args.runs,
+        "videos": args.videos,
+        "error_rate": args.error_rate,
+        "completed": completed,
+        "accuracy": round(sum(accuracies) / len(accuracies), 4) if accuracies else None,
+        "retries": retries,
+        "wall_time_s": round(wall_time, 2),
+    }
+
+
+def check_retry_after(client: str, retry_after: float) -> dict:
+    """
+    Makes one call whose first try gets a 429 with `retry_after`, under a policy with a 1ms backoff and a 1s max_delay.
+    """
+    policy = RetryPolicy(base_delay=0.001, max_delay=1.0)
+    # Every 2nd call is rate limited: a warm-up call, then the 429, then the retry
+    config = FakeConfig(rate_limit_every=2, retry_after=retry_after)
+    sp, youtube, _ = build_fake_clients(10, config, config, playlist_id=PLAYLIST_ID)
+    if client == "spotify":
+        sp.me()
+        call = lambda: sp.search(q="Golden River", limit=1, type="track")
+        calls = lambda: sp.calls["search"]
+        stage = "search"
+    else:
+        youtube.channels().list(part="id", mine=True).execute()
+        call = lambda: youtube.playlistItems().list(part="snippet", playlistId=PLAYLIST_ID, maxResults=50).execute()
+        calls = lambda: youtube.calls["playlistItems.list"]
+        stage = "youtube_fetch"
+
+    gave_up = False
+    started = time.perf_counter()
+    try:
+        policy.call(call, stage)
+    except Exception:
+        gave_up = True
+    waited = time.perf_counter() - started
+
+    if retry_after <= policy.max_delay:
+        ok = not gave_up and calls() == 2 and waited >= retry_after
+    else:
+        ok = gave_up and calls() == 1 and waited < policy.max_delay
+    return {
+        "check": "retry_after",
+        "client": client,
+        "retry_after_s": retry_after,
+        "waited_s": round(waited, 3),
+        "tries": calls(),
+        "gave_up": gave_up,
+        "ok": ok,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="transfers per mode, each with its own fault seed")
+    parser.add_argument("--videos", type=int, default=1000, help="videos per playlist")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="share of YouTube and Spotify calls that fail")
+    parser.add_argument("--budget", type=int, default=50, help="retries per transfer")
+    parser.add_argument("--base-delay-ms", type=float, default=5.0, help="upper bound of the first backoff wait")
+    args = parser.parse_args()
+
+    # Page fetches also write their raw responses under cache/
+    os.chdir(tempfile.mkdtemp(prefix="flotunes-bench-"))
+    for retry in (False, True):
+        print(json.dumps(run(retry, args)))
+
+    failed = False
+    for client in ("spotify", "youtube"):
+        for retry_after in (RETRY_AFTER_HONOURED, RETRY_AFTER_TOO_LONG):
+            result = check_retry_after(client, retry_after)
+            print(json.dumps(result))
+            failed = failed or not result["ok"]
+    if failed:
+        print("Retries did not follow the upstream's Retry-After", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
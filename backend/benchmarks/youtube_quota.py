@@ -0,0 +1,92 @@
+# backend/benchmarks/youtube_quota.py
+"""
+YouTube Data API quota spent per transfer session, and sessions per daily quota.
+
+Each of --users users opens the playlist in the frontend (GET
+/youtube/titles, which fetches it with the server's credentials), then
+transfers it --transfers times (a preview, a retry, ...). Every transfer
+validates the user's token (channels.list) and fetches the playlist
+(playlistItems.list, one unit per 50 videos). Calls go to FakeYouTube.
+
+Reports units and calls spent per mode, and how many sessions completed
+before --daily-limit units were used up:
+  - uncached: every request fetches and validates again
+  - cached: recently fetched pages and validated tokens are reused
+
+Run from the repository root:
+    python -m backend.benchmarks.youtube_quota --users 100 --videos 300 --daily-limit 1000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from unittest import mock
+
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+from backend.benchmarks.fakes import build_fake_clients, reset_matching_state
+from backend.services import youtube_api, youtube_quota
+from backend.services.shared_state import get_shared_state
+from backend.services.youtube_quota import PlaylistPageCache, YouTubeQuota, YouTubeQuotaExceededError, quota_user
+
+CLIENT_CONFIG = {"web": {"client_id": "bench", "client_secret": "bench", "token_uri": "https://oauth2.googleapis.com/token"}}
+
+
+def run(cached: bool, args) -> dict:
+    reset_matching_state()
+    youtube_quota._youtube_quota = YouTubeQuota(
+        get_shared_state(), daily_limit=args.daily_limit, token_ttl=300 if cached else 0
+    )
+    youtube_quota._page_cache = PlaylistPageCache(get_shared_state(), enabled=cached)
+
+    # One playlist per user, all served by the same fake
+    _, youtube, playlist = build_fake_clients(args.videos, playlist_id="PLbench0")
+    youtube.playlists = {f"PLbench{user}": playlist.items for user in range(args.users)}
+
+    completed = 0
+    with mock.patch.object(youtube_api, "get_client_config", return_value=CLIENT_CONFIG), \
+            mock.patch.object(youtube_api, "build", return_value=youtube):
+        for user in range(args.users):
+            token = f"token-{user}"
+            playlist_id = f"PLbench{user}"
+            youtube.channel_id = f"UCbench{user}"
+            try:
+                youtube_api.get_video_details_from_playlist(youtube, playlist_id)
+                for _ in range(args.transfers):
+                    service = youtube_api.get_authenticated_service_with_token(token)
+                    youtube_api.get_video_details_from_playlist(service, playlist_id, user=quota_user(token))
+            except YouTubeQuotaExceededError:
+                continue
+            completed += 1
+
+    usage = youtube_quota.get_youtube_quota().usage()
+    return {
+        "mode": "cached" if cached else "uncached",
+        "users": args.users,
+        "videos": args.videos,
+        "transfers_per_user": args.transfers,
+        "units": usage["used"],
+        "units_per_session": round(usage["used"] / max(completed, 1), 2),
+        "by_call": usage["by_call"],
+        "daily_limit": args.daily_limit,
+        "sessions_completed": completed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100, help="transfer sessions, one user each")
+    parser.add_argument("--videos", type=int, default=300, help="videos per playlist")
+    parser.add_argument("--transfers", type=int, default=2, help="transfers per session")
+    parser.add_argument("--daily-limit", type=int, default=1000, help="YouTube quota units per day")
+    args = parser.parse_args()
+
+    # Page fetches also write their raw responses under cache/
+    os.chdir(tempfile.mkdtemp(prefix="flotunes-bench-"))
+    for cached in (False, True):
+        print(json.dumps(run(cached, args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# backend/benchmarks/youtube_titles_stream.py
+"""
+GET /youtube/titles: cost of getting a YouTube client, and time to first byte.
+
+Part 1 pickles installed-app credentials to a temporary file and compares
+the old per-request setup (unpickle and build the discovery client) with
+the cached client from get_authenticated_service().
+
+Part 2 serves a synthetic playlist from FakeYouTube, with --latency-ms per
+page, through the ASGI app. It reports time to first byte and total time
+for the streamed response, plain and gzip-compressed, from a uvicorn
+server on a local port (httpx's ASGI transport buffers whole responses,
+so it can't measure time to first byte). It also reports
+the time to fetch every page first, which is when the old buffered
+endpoint sent its first byte.
+
+Run from the repository root:
+    python -m backend.benchmarks.youtube_titles_stream --videos 2000 --latency-ms 100
+"""
+
+import argparse
+import gzip
+import json
+import os
+import pickle
+import socket
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("YOUTUBE_SCOPE", "https://www.googleapis.com/auth/youtube.readonly")
+os.environ.setdefault("YOUTUBE_CLIENT_JSON", "credentials/bench_client_secret.json")
+# Every request must fetch the playlist from FakeYouTube, not from the page cache
+os.environ.setdefault("YOUTUBE_PAGE_CACHE_ENABLED", "false")
+
+import httpx
+import uvicorn
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+from backend.benchmarks.fakes import FakeConfig, build_fake_clients
+from backend.api import youtube as youtube_router
+from backend.services import youtube_api
+
+
+def bench_service(calls: int) -> dict:
+    """
+    Per-call cost of getting a YouTube client, before and after caching.
+    """
+    youtube_api.token_path = os.path.join(tempfile.mkdtemp(prefix="flotunes-bench-"), "youtube_token.pickle")
+    creds = Credentials(
+        token="bench", refresh_token="bench", client_id="bench", client_secret="bench",
+        token_uri="https://oauth2.googleapis.com/token",
+        expiry=datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(days=1),
+    )
+    with open(youtube_api.token_path, "wb") as f:
+        pickle.dump(creds, f)
+    scopes = [os.environ["YOUTUBE_SCOPE"]]
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        build("youtube", "v3", credentials=youtube_api._load_credentials(scopes))
+    per_request = (time.perf_counter() - started) / calls
+
+    youtube_api._services.clear()
+    started = time.perf_counter()
+    for _ in range(calls):
+        youtube_api.get_authenticated_service()
+    cached = (time.perf_counter() - started) / calls
+
+    return {
+        "part": "service",
+        "calls": calls,
+        "per_request_build_ms": round(per_request * 1000, 3),
+        "cached_ms": round(cached * 1000, 3),
+    }
+
+
+def start_server(app) -> tuple:
+    """
+    Serves the app with uvicorn on a free local port. Returns (base_url, server).
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}", server
+
+
+def fetch(base_url: str, encoding: str) -> tuple:
+    """
+    Returns (time to first byte, total time, decoded body) of one /titles request.
+    """
+    started = time.perf_counter()
+    first_byte = None
+    chunks = []
+    with httpx.stream(
+        "GET", f"{base_url}/youtube/titles",
+        params={"playlist_url": "https://www.youtube.com/playlist?list=PLbench"},
+        headers={"Accept-Encoding": encoding},
+        timeout=60,
+    ) as response:
+        response.raise_for_status()
+        for chunk in response.iter_raw():
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            chunks.append(chunk)
+        total = time.perf_counter() - started
+        body = b"".join(chunks)
+        if response.headers.get("content-encoding") == "gzip":
+            body = gzip.decompress(body)
+    return first_byte, total, body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--videos", type=int, default=2000, help="playlist size")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="simulated YouTube latency per page")
+    parser.add_argument("--service-calls", type=int, default=50, help="client acquisitions timed in part 1")
+    args = parser.parse_args()
+
+    print(json.dumps(bench_service(args.service_calls)))
+
+    os.chdir(tempfile.mkdtemp(prefix="flotunes-bench-"))  # Raw page dumps go to ./cache
+    _, youtube, playlist = build_fake_clients(args.videos, youtube_config=FakeConfig(latency=args.latency_ms / 1000))
+    youtube_router.get_authenticated_service = lambda: youtube
+    expected = [item["snippet"]["title"] for item in playlist.items]
+
+    from backend.main import app
+
+    started = time.perf_counter()
+    titles = youtube_api.get_video_titles_from_playlist(youtube, "PLbench")
+    buffered = time.perf_counter() - started
+    assert titles == expected
+    print(json.dumps({"part": "titles", "mode": "buffered", "videos": len(titles), "ttfb_ms": round(buffered * 1000, 1), "total_ms": round(buffered * 1000, 1)}))
+
+    base_url, server = start_server(app)
+    for encoding in ("identity", "gzip"):
+        first_byte, total, body = fetch(base_url, encoding)
+        assert json.loads(body) == {"status": "success", "titles": expected}
+        print(json.dumps({
+            "part": "titles",
+            "mode": f"streamed_{encoding}",
+            "videos": len(expected),
+            "ttfb_ms": round(first_byte * 1000, 1),
+            "total_ms": round(total * 1000, 1),
+        }))
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
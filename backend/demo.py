@@ -1,16 +1,30 @@
+"""
+Command-line playlist transfer for scripted bulk migrations.
+
+Run from the repository root:
+    python -m backend.demo --playlist "My Mix"                      # YOUTUBE_PLAYLIST_URL from .env
+    python -m backend.demo URL1 URL2 --jobs 8 --output songs.csv
+    python -m backend.demo --urls-file playlists.txt --dry-run
+
+Matching uses the same engine as the API. Search results, matches and
+"no match" verdicts are kept in an on-disk cache (--cache), so re-running a
+batch only searches what is new.
+"""
+
 import os
 from dotenv import load_dotenv
-from services.youtube_api import (
+from backend.services.youtube_api import (
     get_authenticated_service,
-    get_video_titles_from_playlist, 
+    get_video_details_from_playlist,
     extract_playlist_id
 )
-from services.spotify_api import (
+from backend.services.spotify_api import (
     get_spotify_client,
     api_create_playlist,
-    api_search_track,
-    api_add_tracks_to_playlist,
+    api_match_videos,
+    api_write_matched_songs,
 )
+from backend.services.transfer_stats import TransferStatsCollector
 from rich.progress import Progress
 from rich.console import Console
 from rich.panel import Panel
@@ -18,145 +32,257 @@ from rich.table import Table
 from pathlib import Path
 from datetime import datetime
 import argparse
+import csv
+import json
+import time
 
 
 
 load_dotenv()
 console = Console()
+backend_dir = Path(__file__).parent.resolve()
+
+# Per-song output columns, in CSV order
+OUTPUT_FIELDS = [
+    "playlist_url", "playlist_name", "position", "status", "youtube_title", "youtube_url",
+    "spotify_track_id", "spotify_url", "title", "artist", "album", "error",
+]
+
 
 def parse_args():
-    parser = argparse.ArgumentParser(description="Transfer YouTube playlist to Spotify")
+    parser = argparse.ArgumentParser(description="Transfer YouTube playlists to Spotify")
+    parser.add_argument("urls", nargs="*", help="YouTube playlist URLs (default: YOUTUBE_PLAYLIST_URL)")
+    parser.add_argument(
+        "--urls-file",
+        type=Path,
+        help="File with one playlist per line: a URL, optionally followed by the Spotify playlist name. # starts a comment."
+    )
     parser.add_argument(
         "--playlist",
         type=str,
         default="YT Playlist Transfer",
-        help="Name of the Spotify playlist to create or update."
+        help="Name of the Spotify playlist to create or update. With several playlists, their YouTube ID is appended."
     )
     parser.add_argument("--public", action="store_true", help="Make the Spotify playlist public")
     parser.add_argument("--dry-run", action="store_true", help="Simulate the playlist transfer without modifying Spotify, just show stats")
+    parser.add_argument("--jobs", type=int, default=4, help="Number of videos matched concurrently")
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=backend_dir / "cache" / "demo_state.sqlite",
+        help="On-disk cache of searches and matches, reused by later runs"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the on-disk cache")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Per-song results file; .csv for CSV, anything else for JSON lines (default: logs/<name>_songs.jsonl)"
+    )
 
     return parser.parse_args()
 
 
+def read_playlists(args) -> list[tuple[str, str]]:
+    """
+    Collects the (YouTube URL, Spotify playlist name) pairs to transfer.
+    """
+    entries = [(url, None) for url in args.urls]
+    if args.urls_file:
+        for line in args.urls_file.read_text(encoding="utf-8").splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                url, _, name = line.partition(" ")
+                entries.append((url, name.strip() or None))
+    if not entries:
+        entries.append((os.getenv("YOUTUBE_PLAYLIST_URL"), None))
+
+    playlists = []
+    for url, name in entries:
+        if not name:
+            name = args.playlist if len(entries) == 1 else f"{args.playlist} ({extract_playlist_id(url)})"
+        playlists.append((url, name))
+    return playlists
+
+
+class ProgressBar:
+    """Feeds api_match_videos() progress into a rich progress bar."""
+
+    def __init__(self, progress: Progress, task):
+        self.progress = progress
+        self.task = task
+
+    def video_done(self, matched: bool) -> None:
+        self.progress.update(self.task, advance=1)
+
+    def start_stage(self, stage: str, total: int = None) -> None:
+        pass
+
+
+def song_rows(playlist_url: str, playlist_name: str, songs) -> list[dict]:
+    """
+    Flattens SongResults into output rows.
+    """
+    return [
+        {
+            "playlist_url": playlist_url,
+            "playlist_name": playlist_name,
+            "position": position,
+            "status": song.status,
+            "youtube_title": song.original_youtube_title,
+            "youtube_url": song.youtube_url,
+            "spotify_track_id": song.spotify_track_id,
+            "spotify_url": song.spotify_url,
+            "title": song.title if song.status == "success" else None,
+            "artist": song.artist if song.status == "success" else None,
+            "album": song.album,
+            "error": song.error,
+        }
+        for position, song in enumerate(songs)
+    ]
+
+
+def write_output(path: Path, rows: list[dict]) -> None:
+    """
+    Writes per-song rows as CSV or JSON lines, depending on the file extension.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def transfer_one(youtube, sp, playlist_url: str, playlist_name: str, args, log_timestamp: str) -> dict:
+    """
+    Matches one YouTube playlist and, unless it is a dry run, writes it to Spotify.
+    """
+    console.rule(f"[bold cyan]{playlist_name}")
+    started = time.perf_counter()
+    stats = TransferStatsCollector()
+
+    # Step 1: Get YouTube videos
+    console.print("[bold yellow] Fetching videos from YouTube...")
+    videos = get_video_details_from_playlist(youtube, extract_playlist_id(playlist_url), stats=stats)
+    console.print(f"[green]> {len(videos)} videos fetched!\n")
+
+    # Step 2: Search & Match tracks
+    console.print(f"[cyan] Searching for tracks on Spotify ({args.jobs} at a time)...\n")
+    with Progress(console=console) as progress:
+        task = progress.add_task("Matching tracks...", total=len(videos))
+        songs = api_match_videos(sp, videos, stats=stats, progress=ProgressBar(progress, task), jobs=args.jobs)
+    matched = sum(1 for song in songs if song.status == "success")
+
+    # Step 3: Create the playlist and add tracks
+    spotify_playlist_json = {}
+    if args.dry_run:
+        console.print(f"\n[bold yellow]➕ Dry run: {matched} track(s) would be added to [bold underline]{playlist_name}")
+    elif not matched:
+        console.print("[bold red]❌ No tracks to add. Playlist is empty.[/bold red]")
+    else:
+        playlist_description = f"{playlist_name} created on {log_timestamp}"
+        spotify_playlist_json = api_create_playlist(sp, name=playlist_name, isPublic=args.public, description=playlist_description, stats=stats)
+        console.print(f"\n[bold yellow]➕ Adding {matched} tracks to Spotify playlist [bold underline]{playlist_name}")
+        api_write_matched_songs(sp, spotify_playlist_json["id"], songs, stats=stats)
+
+    if matched < len(songs):
+        console.print(f"[red]⚠️ {len(songs) - matched} song(s) could not be matched.")
+
+    search = stats.to_model().search
+    return {
+        "playlist_url": playlist_url,
+        "playlist_name": playlist_name,
+        "playlist_id": spotify_playlist_json.get("id"),
+        "link": spotify_playlist_json.get("external_urls", {}).get("spotify") or "Not available",
+        "videos": len(songs),
+        "matched": matched,
+        "searches": search.queries,
+        "duration": time.perf_counter() - started,
+        "songs": songs,
+    }
+
+
 def main():
     # Setup
     args = parse_args()
-    playlist_name = args.playlist
-    is_public = args.public
-    dry_run = args.dry_run
-
-    yt_url = os.getenv("YOUTUBE_PLAYLIST_URL")
-    playlist_id = extract_playlist_id(yt_url)
+    if not args.no_cache:
+        # Must be set before the first cache lookup picks a shared-state backend
+        os.environ.setdefault("SHARED_STATE_PATH", str(args.cache))
+    playlists = read_playlists(args)
 
     console.rule("[bold cyan]YT → Spotify Playlist Transfer")
     log_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # Step 1: Get YouTube Titles
-    console.print("[bold yellow] Fetching video titles from YouTube...")
+    # Authenticate once for every playlist
     youtube = get_authenticated_service()
     if not youtube:
         console.print("[bold red]❌ Failed to authenticate with YouTube. Check your credentials.[/bold red]")
         return
-    titles = get_video_titles_from_playlist(youtube, playlist_id)
-    console.print(f"[green]> {len(titles)} titles fetched!\n")
-
-    # Step 2: Spotify Auth
     sp = get_spotify_client()
     if not sp:
         console.print("[bold red]❌ Failed to authenticate with Spotify. Check your credentials.[/bold red]")
         return
-    playlist_description = f"{playlist_name} created on {log_timestamp}"
-    spotify_playlist_json = api_create_playlist(sp, name=playlist_name, isPublic=is_public, description=playlist_description)
-    spotify_playlist_id = spotify_playlist_json.get("id", None)
-
-    console.print(f"[bold yellow]🎵 Using Spotify playlist: [bold underline]{playlist_name}\n")
-
-
-    # Step 3: Search & Match tracks
-    track_ids = []
-    unmatched_titles = []
 
     # Create the Log directory if it does not exist
-    backend_dir = Path(__file__).parent.resolve()
     log_dir = backend_dir / "logs"
     log_dir.mkdir(parents=True, exist_ok=True)
-    unmatched_file = log_dir / f"unmatched_songs_for_{playlist_name.replace(' ', '_')}.txt"
-
-    console.print("[cyan] Searching for tracks on Spotify...\n")
-
-    with Progress() as progress:
-        task = progress.add_task("Matching tracks...", total=len(titles))
-        for title in titles:
-            track_id = api_search_track(sp, title)
-            if track_id:
-                track_ids.append(track_id)
-            else:
-                unmatched_titles.append(title)
-            progress.update(task, advance=1)
-
-    # Step 4: Report Unmatched tracks
-    if unmatched_titles:
-        with open(unmatched_file, "w", encoding="utf-8") as f:
-            for title in unmatched_titles:
-                f.write(f"{title}\n")
-        console.print(
-            Panel.fit(
-                f"[red]⚠️ {len(unmatched_titles)} song(s) could not be matched.\nSaved to: {unmatched_file}",
-                title="Unmatched Songs",
-                style="bold red",
-            )
-        )
-    else:
-        console.print("[green]All songs matched successfully!")
 
+    results = []
+    for playlist_url, playlist_name in playlists:
+        try:
+            results.append(transfer_one(youtube, sp, playlist_url, playlist_name, args, log_timestamp))
+        except Exception as e:
+            console.print(Panel.fit(f"[red]{e}", title=f"Failed: {playlist_name}", style="bold red"))
 
-    # Step 5: Add Tracks
-    if dry_run:
-        console.print("\n[bold yellow]➕ Dry run: Adding tracks to Spotify playlist...")
-    else:
-        if not spotify_playlist_id:
-            console.print("[bold red]❌ Playlist ID not found. Cannot add tracks.[/bold red]")
-            return
-        if not track_ids:
-            console.print("[bold red]❌ No tracks to add. Playlist is empty.[/bold red]")
-        else:
-            console.print("\n[bold yellow]➕ Adding tracks to Spotify playlist...")
-            api_add_tracks_to_playlist(sp, spotify_playlist_id, track_ids)
-    console.print("[bold green]🎉 Playlist transfer complete!")
-
-
-    # Step 6: Summary (on Terminal)
-    external_link_to_user_playlist = spotify_playlist_json['external_urls']['spotify'] or "Not available"
+    # Per-song output, one file for the whole batch
+    rows = [row for result in results for row in song_rows(result["playlist_url"], result["playlist_name"], result["songs"])]
+    output_path = args.output or log_dir / f"{playlists[0][1].replace(' ', '_') if len(playlists) == 1 else 'batch'}_songs.jsonl"
+    write_output(output_path, rows)
+    console.print(f"\n[green]Per-song results saved to: {output_path}")
 
+    # Summary (on Terminal)
     console.print("\n[bold blue]Transfer Summary:\n")
 
     summary_table = Table(title="Playlist Transfer Stats", style="bold white")
-    summary_table.add_column("Metric", style="cyan", no_wrap=True)
-    summary_table.add_column("Value", style="bold yellow")
+    summary_table.add_column("Playlist", style="cyan", no_wrap=True)
+    summary_table.add_column("Videos", style="bold yellow", justify="right")
+    summary_table.add_column("Matched", style="bold yellow", justify="right")
+    summary_table.add_column("Unmatched", style="bold yellow", justify="right")
+    summary_table.add_column("Searches", style="bold yellow", justify="right")
+    summary_table.add_column("Time", style="bold yellow", justify="right")
+    summary_table.add_column("Link to Spotify playlist", style="bold yellow")
 
-    summary_table.add_row("• Playlist Name", playlist_name)
-    summary_table.add_row("• Spotify Playlist ID", spotify_playlist_id or "Not created")
-    summary_table.add_row("• Link to Spotify playlist", external_link_to_user_playlist)
-    summary_table.add_row("• Total YouTube Videos", str(len(titles)))
-    summary_table.add_row("• Matched on Spotify", str(len(track_ids)))
-    summary_table.add_row("• Unmatched", str(len(unmatched_titles)))
+    for result in results:
+        summary_table.add_row(
+            result["playlist_name"],
+            str(result["videos"]),
+            str(result["matched"]),
+            str(result["videos"] - result["matched"]),
+            str(result["searches"]),
+            f"{result['duration']:.1f}s",
+            result["link"],
+        )
 
     console.print(summary_table)
-    console.rule("[bold green]✅ All Done!")
-
-    # 6b: Save stats to log file
-    log_file = log_dir / f"{playlist_name.replace(' ', '_')}_log.txt"
-
-    with log_file.open("a", encoding="utf-8") as f:
-        f.write("=== Playlist Transfer Summary ===\n")
-        f.write(f"Playlist Name, {playlist_name}\n")
-        f.write(f"Playlist ID: {spotify_playlist_id or 'Not created'}\n")
-        f.write(f"Link to Spotify playlist: {external_link_to_user_playlist}\n")
-        f.write(f"Total YouTube Videos: {len(titles)}\n")
-        f.write(f"Matched on Spotify: {len(track_ids)}\n")
-        f.write(f"Unmatched: {len(unmatched_titles)}\n")
-        f.write(f"Log Time: {log_timestamp}\n")
-        f.write("=" * 33 + "\n\n")
+    console.rule("[bold green]✅ All Done!" if len(results) == len(playlists) else "[bold red]Done, with failures")
+
+    # Save stats to log file
+    for result in results:
+        log_file = log_dir / f"{result['playlist_name'].replace(' ', '_')}_log.txt"
+
+        with log_file.open("a", encoding="utf-8") as f:
+            f.write("=== Playlist Transfer Summary ===\n")
+            f.write(f"Playlist Name, {result['playlist_name']}\n")
+            f.write(f"Playlist ID: {result['playlist_id'] or 'Not created'}\n")
+            f.write(f"Link to Spotify playlist: {result['link']}\n")
+            f.write(f"Total YouTube Videos: {result['videos']}\n")
+            f.write(f"Matched on Spotify: {result['matched']}\n")
+            f.write(f"Unmatched: {result['videos'] - result['matched']}\n")
+            f.write(f"Log Time: {log_timestamp}\n")
+            f.write("=" * 33 + "\n\n")
 
 
 
@@ -1,10 +1,16 @@
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import RedirectResponse
-from backend.api import youtube, spotify, transfer, auth
+from backend.api import youtube, spotify, transfer, auth, metrics
+from backend.services.http_client import close_http_session
+from backend.services.transfer_executor import get_transfer_executor
+from backend.services.sharded_matching import get_sharded_matcher
+from backend.services.compression import CompressionMiddleware
+from backend.services.serialization import FastJSONResponse
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -41,18 +47,33 @@ tags_metadata = [
         "name": "Spotify",
         "description": "Endpoints to interact with Spotify"
     },
+    {
+        "name": "Metrics",
+        "description": "Prometheus metrics for the transfer pipeline."
+    },
     {
         "name": "Transfer",
         "description": "Transfer playlists between YouTube and Spotify. This includes creating new playlists, searching for tracks, and adding them to Spotify playlists."
     },
 ]
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release pooled connections held by the shared async HTTP client
+    await close_http_session()
+    get_transfer_executor().shutdown()
+    get_sharded_matcher().shutdown()
+
+
 app = FastAPI(
     title="FloTunes API",
     description="Transfer playlists from YouTube to Spotify",
     version="1.0.0",
     tags_metadata=tags_metadata,
     openapi_tags=tags_metadata,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Get allowed origins from environment variable or use defaults
@@ -62,6 +83,9 @@ allowed_origins = [origin.strip() for origin in allowed_origins_env.split(",")]
 # Add HTTPS redirect middleware for production
 app.add_middleware(HTTPSRedirectMiddleware)
 
+# Compress large responses (gzip or deflate, negotiated per request)
+app.add_middleware(CompressionMiddleware, **CompressionMiddleware.options_from_env())
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -104,6 +128,7 @@ app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(youtube.router, prefix="/youtube", tags=["YouTube"])
 app.include_router(spotify.router, prefix="/spotify", tags=["Spotify"])
 app.include_router(transfer.router, prefix="/transfer", tags=["Transfer"])
+app.include_router(metrics.router, tags=["Metrics"])
 
 @app.get("/")
 def read_root():
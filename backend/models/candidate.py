@@ -0,0 +1,44 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+@dataclass(frozen=True, slots=True)
+class TrackCandidate:
+    """
+    Compact Spotify search result, holding only what scoring and SpotifyTrack need.
+
+    Search responses carry full track objects (markets, images, external ids...);
+    converting them straight away keeps a few hundred bytes per candidate instead
+    of the raw dict while the matcher scores them.
+    """
+    track_id: str
+    name: str
+    artists: Tuple[str, ...]
+    album: str
+    spotify_url: str
+    thumbnail_url: Optional[str] = None
+    preview_url: Optional[str] = None
+
+    @classmethod
+    def from_spotify(cls, track: Dict[str, Any]) -> "TrackCandidate":
+        """Builds a candidate from a track object in a Spotify search response"""
+        album = track.get("album") or {}
+        images = album.get("images") or []
+        return cls(
+            track_id=track["id"],
+            name=track["name"],
+            artists=tuple(artist["name"] for artist in track["artists"]),
+            album=album.get("name", ""),
+            spotify_url=track["external_urls"]["spotify"],
+            # Images are sorted by size (largest first)
+            thumbnail_url=images[0]["url"] if images else None,
+            preview_url=track.get("preview_url"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe form, for caches shared between workers"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TrackCandidate":
+        """Inverse of to_dict()"""
+        return cls(**{**data, "artists": tuple(data["artists"])})
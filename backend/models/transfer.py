@@ -1,5 +1,5 @@
-from pydantic import BaseModel, HttpUrl
-from typing import List, Optional
+from pydantic import BaseModel, Field, HttpUrl
+from typing import Dict, List, Optional
 from datetime import datetime
 
 class TransferRequest(BaseModel):
@@ -7,6 +7,16 @@ class TransferRequest(BaseModel):
     playlist_name: str
     is_public: bool = True
     description: Optional[str] = ""
+    include_songs: bool = True  # False: summary only, page songs from /transfer/{transfer_id}/songs
+    transfer_id: Optional[str] = Field(None, pattern=r"^[A-Za-z0-9_-]{8,64}$")  # Client-chosen ID to poll progress by
+    preview: bool = False  # True: match only, then POST /transfer/{transfer_id}/commit to write the playlist
+
+class CommitRequest(BaseModel):
+    """Writes a previewed match set; unset fields keep the values from the preview request"""
+    playlist_name: Optional[str] = None
+    is_public: Optional[bool] = None
+    description: Optional[str] = None
+    include_songs: bool = True
 
 class YouTubeVideo(BaseModel):
     """Represents a YouTube video with metadata"""
@@ -36,6 +46,7 @@ class SongResult(BaseModel):
     thumbnail: Optional[str] = None
     status: str  # "success" | "failed"
     spotify_url: Optional[str] = None
+    spotify_track_id: Optional[str] = None
     youtube_url: Optional[str] = None
     error: Optional[str] = None
     
@@ -43,6 +54,25 @@ class SongResult(BaseModel):
     original_youtube_title: Optional[str] = None
     spotify_match_confidence: Optional[float] = None
 
+class StageStats(BaseModel):
+    """Wall time and upstream API calls spent in one transfer stage"""
+    wall_time: float  # in seconds
+    calls: int
+    retries: int = 0  # calls sent again after a transient error, not included in calls
+
+class SearchStats(BaseModel):
+    """How much searching it took to match the playlist"""
+    videos: int
+    queries: int
+    queries_per_video: float
+    early_exits: int  # videos where a high-confidence match stopped the search early
+    early_exit_rate: float
+
+class TransferStats(BaseModel):
+    """Per-stage breakdown of a transfer"""
+    stages: Dict[str, StageStats]  # token_validation, youtube_fetch, playlist_setup, search, playlist_add
+    search: SearchStats
+
 class TransferResponse(BaseModel):
     """Complete transfer response with all metadata"""
     success: bool
@@ -58,4 +88,53 @@ class TransferResponse(BaseModel):
     
     # Transfer statistics
     match_rate: float  # percentage of successful matches
-    processing_time_per_song: float  # average time per song
\ No newline at end of file
+    processing_time_per_song: float  # average time per song
+    
+    # Per-stage timing and API call accounting
+    stats: Optional[TransferStats] = None
+    
+    # ID to page the songs by; songs is empty when the request set include_songs=False
+    transfer_id: Optional[str] = None
+    
+    # True for a match-only preview: no playlist was touched, commit it by transfer_id
+    preview: bool = False
+
+class SongPage(BaseModel):
+    """One page of a finished transfer's songs"""
+    transfer_id: str
+    offset: int
+    limit: int
+    total: int
+    songs: List[SongResult]
+    next_offset: Optional[int] = None
+
+class TransferProgressStatus(BaseModel):
+    """How far a running transfer has got"""
+    transfer_id: str
+    stage: str  # queued, youtube_fetch, playlist_setup, search, playlist_add, done, failed
+    processed: int  # videos searched so far
+    total: int  # videos in the playlist, 0 until fetched
+    matched: int
+    updated_at: float  # unix timestamp of the last update
+
+class BatchMatchRequest(BaseModel):
+    """Song titles to match on Spotify, optionally adding the matches to a playlist"""
+    titles: List[str] = Field(..., min_length=1, max_length=10000)
+    playlist_id: Optional[str] = None  # When set, matched tracks are added to this playlist in title order
+
+class BatchMatchResult(BaseModel):
+    """One line of the /spotify/match-batch stream"""
+    index: int  # position of the title in the request
+    title: str
+    status: str  # "success" | "failed"
+    track: Optional[SpotifyTrack] = None
+    error: Optional[str] = None  # set when the title couldn't be searched; retrying later may match it
+
+class BatchMatchSummary(BaseModel):
+    """Last line of the /spotify/match-batch stream"""
+    done: bool = True
+    total: int
+    matched: int
+    unmatched: int
+    added: int  # tracks added to the playlist, after removing duplicates
+    error: Optional[str] = None  # set when adding to the playlist failed; the matches above still stand
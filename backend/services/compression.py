@@ -0,0 +1,122 @@
+# backend/services/compression.py
+
+import os
+import zlib
+from typing import Optional
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Streamed responses are never compressed: buffering them in the compressor
+# would hold back every line until the compressor decides to flush
+EXCLUDED_CONTENT_TYPES = ("text/event-stream", "application/x-ndjson")
+
+# Supported encodings, in order of preference when the client ranks them equally
+SUPPORTED_ENCODINGS = ("gzip", "deflate")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Picks the best supported encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding (str): Raw header value, e.g. "deflate, gzip;q=0.8".
+
+    Returns:
+        Optional[str]: "gzip", "deflate", or None for an uncompressed response.
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if token == "*":
+            for encoding in SUPPORTED_ENCODINGS:
+                weights.setdefault(encoding, quality)
+        elif token in SUPPORTED_ENCODINGS:
+            weights[token] = quality
+
+    candidates = [encoding for encoding in SUPPORTED_ENCODINGS if weights.get(encoding, 0.0) > 0]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda encoding: (weights[encoding], -SUPPORTED_ENCODINGS.index(encoding)))
+
+
+class _StreamingAwareMixin:
+    """Extends Starlette's content-type exclusion to NDJSON streams."""
+
+    async def send_with_compression(self, message: Message) -> None:
+        await super().send_with_compression(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            self.content_type_is_excluded = content_type.startswith(EXCLUDED_CONTENT_TYPES)
+
+
+class _GZipResponder(_StreamingAwareMixin, GZipResponder):
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        # Flush every chunk of a streamed body, as deflate does, instead of
+        # holding it in the compressor until the response ends
+        if more_body:
+            self.gzip_file.write(body)
+            self.gzip_file.flush(zlib.Z_SYNC_FLUSH)
+            body = b""
+        return super().apply_compression(body, more_body=more_body)
+
+
+class _DeflateResponder(_StreamingAwareMixin, IdentityResponder):
+    content_encoding = "deflate"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, compresslevel: int = 6) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = zlib.compressobj(compresslevel)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        data = self.compressor.compress(body)
+        data += self.compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+        return data
+
+
+class CompressionMiddleware:
+    """
+    gzip/deflate response compression negotiated from Accept-Encoding.
+
+    Like Starlette's GZipMiddleware, but also speaks deflate, honours q-values,
+    and skips NDJSON as well as server-sent event streams. Responses smaller
+    than `minimum_size` bytes are sent as they are.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1000, compresslevel: int = 6) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    @classmethod
+    def options_from_env(cls) -> dict:
+        """
+        Reads COMPRESSION_MINIMUM_SIZE and COMPRESSION_LEVEL for app.add_middleware().
+        """
+        return {
+            "minimum_size": int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1000")),
+            "compresslevel": int(os.getenv("COMPRESSION_LEVEL", "6")),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("Accept-Encoding", ""))
+        if encoding == "gzip":
+            responder = _GZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+        elif encoding == "deflate":
+            responder = _DeflateResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+
+        await responder(scope, receive, send)
@@ -0,0 +1,66 @@
+# backend/services/http_client.py
+
+import asyncio
+import os
+import aiohttp
+from typing import Optional
+
+
+# Shared session state. One pooled session per event loop, created lazily.
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_timeout() -> aiohttp.ClientTimeout:
+    """
+    Build the default request timeout from environment variables.
+
+    Returns:
+        aiohttp.ClientTimeout: Total and connect timeouts for outgoing requests.
+    """
+    return aiohttp.ClientTimeout(
+        total=float(os.getenv("HTTP_CLIENT_TIMEOUT", "10")),
+        # sock_connect rather than connect, so waiting for a free pooled connection
+        # is bounded only by the total timeout
+        sock_connect=float(os.getenv("HTTP_CLIENT_CONNECT_TIMEOUT", "5")),
+    )
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """
+    Returns the process-wide async HTTP session, creating it on first use.
+
+    The session keeps a pool of keep-alive connections so repeated calls to
+    accounts.spotify.com, oauth2.googleapis.com, etc. reuse TLS connections
+    instead of opening a new one per request.
+
+    Returns:
+        aiohttp.ClientSession: Pooled HTTP session bound to the running event loop.
+    """
+    global _session, _session_loop
+
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=int(os.getenv("HTTP_POOL_SIZE", "100")),
+            limit_per_host=int(os.getenv("HTTP_POOL_SIZE_PER_HOST", "20")),
+            ttl_dns_cache=300,
+            keepalive_timeout=30,
+        )
+        _session = aiohttp.ClientSession(connector=connector, timeout=_get_timeout())
+        _session_loop = loop
+
+    return _session
+
+
+async def close_http_session() -> None:
+    """
+    Closes the shared HTTP session. Called on application shutdown.
+    """
+    global _session, _session_loop
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+
+    _session = None
+    _session_loop = None
@@ -0,0 +1,175 @@
+# backend/services/logger.py
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
+
+
+# Same layout the modules used to configure individually
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line.
+
+    The message is emitted as "event"; structured fields passed with
+    log_event() become top-level keys.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            payload.update(fields)
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    The classic "time - LEVEL - message" format, with structured fields appended as key=value.
+    """
+
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+def _resolve_level() -> int:
+    """
+    LOG_LEVEL wins; otherwise production is quiet (WARNING) and everything else logs INFO.
+    """
+    level_name = os.getenv("LOG_LEVEL")
+    if not level_name:
+        level_name = "WARNING" if os.getenv("ENVIRONMENT") == "production" else "INFO"
+    level = logging.getLevelName(level_name.upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+def _resolve_formatter() -> logging.Formatter:
+    """
+    LOG_FORMAT=json|text; defaults to JSON in production and text elsewhere.
+    """
+    log_format = os.getenv("LOG_FORMAT")
+    if not log_format:
+        log_format = "json" if os.getenv("ENVIRONMENT") == "production" else "text"
+    return JsonFormatter() if log_format.lower() == "json" else TextFormatter()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread.
+
+    The stock QueueHandler.prepare() formats the message on the calling
+    thread; this one only resolves %-style args and drops the traceback
+    object, which is all that's needed to hand the record to another thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+def _get_queue_handler() -> QueueHandler:
+    """
+    Creates the shared queue handler and its listener thread on first use.
+
+    Loggers only enqueue records; formatting and the stream write happen on
+    the listener thread, so request and transfer threads never block on stdout.
+    """
+    global _queue_handler, _listener
+
+    with _setup_lock:
+        if _queue_handler is None:
+            stream_handler = logging.StreamHandler(sys.stderr)
+            stream_handler.setFormatter(_resolve_formatter())
+
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            _queue_handler = _DeferredQueueHandler(log_queue)
+            _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+            _listener.start()
+            atexit.register(shutdown_logging)
+
+    return _queue_handler
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Returns a module logger wired to the shared non-blocking handler.
+
+    Replaces the per-module StreamHandler setup. Level and format come from
+    LOG_LEVEL / LOG_FORMAT (see _resolve_level and _resolve_formatter).
+
+    Args:
+        name (str): Logger name, normally __name__.
+
+    Returns:
+        logging.Logger: Configured logger.
+    """
+    logger = logging.getLogger(name)
+    handler = _get_queue_handler()
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
+        logger.setLevel(_resolve_level())
+        # The shared handler already writes the record; don't duplicate it on the root logger
+        logger.propagate = False
+    return logger
+
+
+def log_event(logger: logging.Logger, level: int, event: str, **fields: Any) -> None:
+    """
+    Logs a structured event, skipping all work when the level is disabled.
+
+    Use this on hot paths instead of f-string messages: nothing is formatted
+    unless the logger would actually emit the record.
+
+    Args:
+        logger (logging.Logger): Logger from get_logger().
+        level (int): logging level, e.g. logging.DEBUG.
+        event (str): Short dotted event name, e.g. "search.match".
+        **fields: Structured fields attached to the event.
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={"fields": fields}, stacklevel=2)
+
+
+def shutdown_logging() -> None:
+    """
+    Flushes queued records and stops the listener thread.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,266 @@
+# backend/services/match_cache.py
+
+import hashlib
+import os
+import re
+from typing import List, Optional
+from backend.models.candidate import TrackCandidate
+from backend.services.metrics import record_cache_lookup
+from backend.services.shared_state import SharedState, get_shared_state
+
+
+# Bump whenever query generation, calculate_match_confidence or the acceptance
+# threshold changes, so "no match" verdicts from the old matcher are ignored
+MATCH_SCORER_VERSION = 3
+
+
+def normalize_title(title: str) -> str:
+    """
+    Lowercases a title and collapses whitespace, so trivial edits don't miss the cache.
+    """
+    return re.sub(r"\s+", " ", title).strip().lower()
+
+
+def _video_key(namespace: str, video_id: str, title: str, market: str) -> str:
+    title_hash = hashlib.sha1(normalize_title(title).encode("utf-8")).hexdigest()[:16]
+    return f"{namespace}:{market or '-'}:{video_id}:{title_hash}"
+
+
+class NegativeMatchCache:
+    """
+    Remembers YouTube videos that found no Spotify match.
+
+    Videos that fail to match (podcast clips, DJ mixes, non-music uploads)
+    are the most expensive ones: every search strategy is tried before
+    giving up. Caching the verdict lets a later transfer with the same video
+    mark it failed without searching at all.
+
+    Entries are keyed by market, video_id and normalized title, expire
+    after `ttl` seconds and carry the scorer version that produced them.
+    They live in the shared state, so every worker sees them.
+    """
+
+    def __init__(self, state: SharedState, enabled: bool = True, ttl: float = 7 * 24 * 3600, scorer_version: int = MATCH_SCORER_VERSION):
+        """
+        Args:
+            state (SharedState): Backend the entries are stored in.
+            enabled (bool): When False, lookups always miss and nothing is stored.
+            ttl (float): Seconds an entry stays valid.
+            scorer_version (int): Version stamped on new entries and required on lookup.
+        """
+        self.state = state
+        self.enabled = enabled
+        self.ttl = ttl
+        self.scorer_version = scorer_version
+
+    @classmethod
+    def from_env(cls) -> "NegativeMatchCache":
+        """
+        Builds the cache from the NEGATIVE_CACHE_* environment variables.
+        """
+        return cls(
+            get_shared_state(),
+            enabled=os.getenv("NEGATIVE_CACHE_ENABLED", "true").lower() == "true",
+            ttl=float(os.getenv("NEGATIVE_CACHE_TTL", str(7 * 24 * 3600))),
+        )
+
+    def is_known_miss(self, video_id: str, title: str, market: str = "") -> bool:
+        """
+        Checks whether the video is cached as unmatched by the current scorer.
+
+        Args:
+            video_id (str): YouTube video ID.
+            title (str): Current YouTube title of the video.
+            market (str): Market the searches are scoped to; "" for none.
+
+        Returns:
+            bool: True if the video can be marked failed without searching.
+        """
+        if not self.enabled:
+            return False
+
+        entry = self.state.get(_video_key("negative", video_id, title, market))
+        hit = entry is not None and entry.get("v") == self.scorer_version
+        record_cache_lookup("negative_match", hit)
+        return hit
+
+    def add_miss(self, video_id: str, title: str, market: str = "") -> None:
+        """
+        Records that every search strategy failed for the video.
+
+        Args:
+            video_id (str): YouTube video ID.
+            title (str): YouTube title the searches were generated from.
+            market (str): Market the searches were scoped to; "" for none.
+        """
+        if not self.enabled:
+            return
+
+        self.state.set(_video_key("negative", video_id, title, market), {"v": self.scorer_version}, ttl=self.ttl)
+
+    def discard(self, video_id: str, title: str, market: str = "") -> None:
+        """
+        Drops a cached verdict, e.g. after the video was matched manually.
+        """
+        self.state.delete(_video_key("negative", video_id, title, market))
+
+
+class ResolutionStore:
+    """
+    Remembers which Spotify track a YouTube video resolved to.
+
+    The positive counterpart of NegativeMatchCache: a video matched by one
+    transfer is resolved by the next without searching. Entries are kept
+    per market, since a track playable in one country may not be in another,
+    and carry the scorer version and the match confidence.
+    """
+
+    def __init__(self, state: SharedState, enabled: bool = True, ttl: float = 30 * 24 * 3600, scorer_version: int = MATCH_SCORER_VERSION):
+        """
+        Args:
+            state (SharedState): Backend the entries are stored in.
+            enabled (bool): When False, lookups always miss and nothing is stored.
+            ttl (float): Seconds an entry stays valid.
+            scorer_version (int): Version stamped on new entries and required on lookup.
+        """
+        self.state = state
+        self.enabled = enabled
+        self.ttl = ttl
+        self.scorer_version = scorer_version
+
+    @classmethod
+    def from_env(cls) -> "ResolutionStore":
+        """
+        Builds the store from the RESOLUTION_STORE_* environment variables.
+        """
+        return cls(
+            get_shared_state(),
+            enabled=os.getenv("RESOLUTION_STORE_ENABLED", "true").lower() == "true",
+            ttl=float(os.getenv("RESOLUTION_STORE_TTL", str(30 * 24 * 3600))),
+        )
+
+    def get(self, video_id: str, title: str, market: str = "") -> Optional[tuple]:
+        """
+        Looks up a previous resolution of the video in a market ("" for none).
+
+        Returns:
+            Optional[tuple]: (TrackCandidate, confidence), or None on a miss.
+        """
+        if not self.enabled:
+            return None
+
+        entry = self.state.get(_video_key("resolution", video_id, title, market))
+        hit = entry is not None and entry.get("v") == self.scorer_version
+        record_cache_lookup("resolution", hit)
+        if not hit:
+            return None
+        return TrackCandidate.from_dict(entry["track"]), entry["confidence"]
+
+    def put(self, video_id: str, title: str, track: TrackCandidate, confidence: float, market: str = "") -> None:
+        """
+        Records the track a video resolved to in a market ("" for none).
+        """
+        if not self.enabled:
+            return
+
+        entry = {"v": self.scorer_version, "track": track.to_dict(), "confidence": round(confidence, 4)}
+        self.state.set(_video_key("resolution", video_id, title, market), entry, ttl=self.ttl)
+
+
+class SearchCache:
+    """
+    Caches Spotify search results as compact candidates, keyed by query, limit and market.
+
+    Different videos often produce the same query (the same song uploaded by
+    several channels, "artist" fallback queries), and repeat transfers
+    produce all of them again. The market must be a real country code (or
+    "" for none), never "from_token": Spotify filters results by market, so
+    users in different countries can't share an entry.
+    """
+
+    def __init__(self, state: SharedState, enabled: bool = True, ttl: float = 24 * 3600):
+        """
+        Args:
+            state (SharedState): Backend the entries are stored in.
+            enabled (bool): When False, lookups always miss and nothing is stored.
+            ttl (float): Seconds a result stays valid.
+        """
+        self.state = state
+        self.enabled = enabled
+        self.ttl = ttl
+
+    @classmethod
+    def from_env(cls) -> "SearchCache":
+        """
+        Builds the cache from the SEARCH_CACHE_* environment variables.
+        """
+        return cls(
+            get_shared_state(),
+            enabled=os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true",
+            ttl=float(os.getenv("SEARCH_CACHE_TTL", str(24 * 3600))),
+        )
+
+    @staticmethod
+    def _key(query: str, limit: int, market: Optional[str]) -> str:
+        digest = hashlib.sha1(f"{normalize_title(query)}|{limit}|{market or ''}".encode("utf-8")).hexdigest()
+        return f"search:{digest}"
+
+    def get(self, query: str, limit: int, market: Optional[str]) -> Optional[List[TrackCandidate]]:
+        """
+        Returns cached candidates for the search, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+
+        entry = self.state.get(self._key(query, limit, market))
+        record_cache_lookup("search", entry is not None)
+        if entry is None:
+            return None
+        return [TrackCandidate.from_dict(item) for item in entry]
+
+    def put(self, query: str, limit: int, market: Optional[str], candidates: List[TrackCandidate]) -> None:
+        """
+        Stores the candidates a search returned.
+        """
+        if not self.enabled:
+            return
+
+        self.state.set(self._key(query, limit, market), [candidate.to_dict() for candidate in candidates], ttl=self.ttl)
+
+
+_negative_cache: Optional[NegativeMatchCache] = None
+_resolution_store: Optional[ResolutionStore] = None
+_search_cache: Optional[SearchCache] = None
+
+
+def get_negative_cache() -> NegativeMatchCache:
+    """
+    Returns the process-wide negative match cache, creating it on first use.
+    """
+    global _negative_cache
+
+    if _negative_cache is None:
+        _negative_cache = NegativeMatchCache.from_env()
+    return _negative_cache
+
+
+def get_resolution_store() -> ResolutionStore:
+    """
+    Returns the process-wide resolution store, creating it on first use.
+    """
+    global _resolution_store
+
+    if _resolution_store is None:
+        _resolution_store = ResolutionStore.from_env()
+    return _resolution_store
+
+
+def get_search_cache() -> SearchCache:
+    """
+    Returns the process-wide search cache, creating it on first use.
+    """
+    global _search_cache
+
+    if _search_cache is None:
+        _search_cache = SearchCache.from_env()
+    return _search_cache
@@ -0,0 +1,306 @@
+# backend/services/metrics.py
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+
+# Default latency buckets in seconds, from a fast cache hit to a stalled upstream call
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """
+    Base class for metrics. Children are keyed by label values, so only
+    low-cardinality labels (service, stage, result) should be used.
+    """
+
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. matches or rate-limited responses."""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, e.g. queue depth."""
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def remove(self, **labels: str) -> None:
+        """
+        Drops a label set, e.g. a per-user series once that user has nothing queued.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values.pop(key, None)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Distribution of observations in fixed cumulative buckets, e.g. request latency."""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """
+        Observes the wall time of the wrapped block, including when it raises.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric exposed on /metrics."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Latency histograms
+YOUTUBE_PAGE_FETCH_SECONDS = REGISTRY.register(Histogram(
+    "flotunes_youtube_page_fetch_seconds",
+    "Latency of one YouTube playlistItems page fetch.",
+))
+SPOTIFY_SEARCH_SECONDS = REGISTRY.register(Histogram(
+    "flotunes_spotify_search_seconds",
+    "Latency of one Spotify track search request.",
+))
+SPOTIFY_SEARCHES_PER_VIDEO = REGISTRY.register(Histogram(
+    "flotunes_spotify_searches_per_video",
+    "Number of Spotify searches issued to resolve one YouTube video.",
+    buckets=(0, 1, 2, 3, 4, 5, 6, 8),
+))
+SPOTIFY_PLAYLIST_WRITE_SECONDS = REGISTRY.register(Histogram(
+    "flotunes_spotify_playlist_write_seconds",
+    "Latency of Spotify playlist writes.",
+    labelnames=("operation",),
+))
+SPOTIFY_SCHEDULER_WAIT_SECONDS = REGISTRY.register(Histogram(
+    "flotunes_spotify_scheduler_wait_seconds",
+    "Time a Spotify call waited for the fair-share scheduler.",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0),
+))
+TRANSFER_DURATION_SECONDS = REGISTRY.register(Histogram(
+    "flotunes_transfer_duration_seconds",
+    "End-to-end duration of a playlist transfer.",
+    labelnames=("outcome",),
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800),
+))
+
+# Counters
+MATCHES_TOTAL = REGISTRY.register(Counter(
+    "flotunes_matches_total",
+    "YouTube videos processed, by match result.",
+    labelnames=("result",),
+))
+FAILURES_TOTAL = REGISTRY.register(Counter(
+    "flotunes_failures_total",
+    "Failed upstream calls or transfers, by pipeline stage.",
+    labelnames=("stage",),
+))
+RATE_LIMITED_TOTAL = REGISTRY.register(Counter(
+    "flotunes_rate_limited_total",
+    "HTTP 429 responses received from upstream APIs.",
+    labelnames=("service",),
+))
+CACHE_REQUESTS_TOTAL = REGISTRY.register(Counter(
+    "flotunes_cache_requests_total",
+    "Cache lookups, by cache name and hit or miss.",
+    labelnames=("cache", "result"),
+))
+SEARCH_STRATEGY_WINS_TOTAL = REGISTRY.register(Counter(
+    "flotunes_search_strategy_wins_total",
+    "Accepted Spotify matches, by title shape and the search strategy that found them.",
+    labelnames=("shape", "strategy"),
+))
+SEARCH_STRATEGY_SKIPPED_TOTAL = REGISTRY.register(Counter(
+    "flotunes_search_strategy_skipped_total",
+    "Search strategies left out because they rarely match titles of that shape.",
+    labelnames=("shape", "strategy"),
+))
+HEDGED_REQUESTS_TOTAL = REGISTRY.register(Counter(
+    "flotunes_hedged_requests_total",
+    "Slow upstream calls that were sent a second time, by which copy answered first.",
+    labelnames=("winner",),
+))
+CIRCUIT_BREAKER_REJECTED_TOTAL = REGISTRY.register(Counter(
+    "flotunes_circuit_breaker_rejected_total",
+    "Upstream calls failed fast because their circuit breaker was open.",
+    labelnames=("breaker",),
+))
+RETRIES_TOTAL = REGISTRY.register(Counter(
+    "flotunes_retries_total",
+    "Upstream calls sent again after a transient error, by pipeline stage.",
+    labelnames=("stage",),
+))
+TOPIC_FAST_PATH_TOTAL = REGISTRY.register(Counter(
+    "flotunes_topic_fast_path_total",
+    "\"Artist - Topic\" uploads searched with the single-query fast path, by whether it found the match.",
+    labelnames=("result",),
+))
+YOUTUBE_QUOTA_UNITS_TOTAL = REGISTRY.register(Counter(
+    "flotunes_youtube_quota_units_total",
+    "YouTube Data API quota units spent, by API method.",
+    labelnames=("call",),
+))
+
+# Gauges
+CIRCUIT_BREAKER_STATE = REGISTRY.register(Gauge(
+    "flotunes_circuit_breaker_state",
+    "Circuit breaker state: 0 closed, 1 half-open, 2 open.",
+    labelnames=("breaker",),
+))
+SPOTIFY_SCHEDULER_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "flotunes_spotify_scheduler_queue_depth",
+    "Spotify calls waiting for the fair-share scheduler, per user (hashed); users with nothing queued are dropped.",
+    labelnames=("user",),
+))
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """
+    Counts one lookup against a named cache.
+
+    Args:
+        cache (str): Cache name, e.g. "negative_match".
+        hit (bool): Whether the lookup was served from the cache.
+    """
+    CACHE_REQUESTS_TOTAL.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def render_metrics() -> str:
+    """
+    Renders every registered metric in the Prometheus text exposition format.
+    """
+    return REGISTRY.render()
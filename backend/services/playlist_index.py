@@ -0,0 +1,84 @@
+# backend/services/playlist_index.py
+
+import os
+from typing import Optional
+from backend.services.metrics import record_cache_lookup
+from backend.services.shared_state import SharedState, get_shared_state
+
+
+class PlaylistNameIndex:
+    """
+    Remembers the ID of each playlist a user transferred into, by lowercased name.
+
+    Reusing a playlist by name otherwise means paging through all of the
+    user's playlists, ten per call. Entries are only hints: the caller
+    checks the playlist still exists, is still followed by the user (deleted
+    playlists stay fetchable by ID) and still carries the name before using
+    it, and discards the entry when it doesn't.
+    """
+
+    def __init__(self, state: SharedState, enabled: bool = True, ttl: float = 30 * 24 * 3600):
+        """
+        Args:
+            state (SharedState): Backend the index is stored in.
+            enabled (bool): When False, lookups always miss and nothing is stored.
+            ttl (float): Seconds an entry stays valid.
+        """
+        self.state = state
+        self.enabled = enabled
+        self.ttl = ttl
+
+    @classmethod
+    def from_env(cls) -> "PlaylistNameIndex":
+        """
+        Builds the index from the PLAYLIST_INDEX_* environment variables.
+        """
+        return cls(
+            get_shared_state(),
+            enabled=os.getenv("PLAYLIST_INDEX_ENABLED", "true").lower() == "true",
+            ttl=float(os.getenv("PLAYLIST_INDEX_TTL", str(30 * 24 * 3600))),
+        )
+
+    @staticmethod
+    def _key(user_id: str, name: str) -> str:
+        return f"playlists:{user_id}:{name.strip().lower()}"
+
+    def get(self, user_id: str, name: str) -> Optional[str]:
+        """
+        Returns the remembered playlist ID for the name, or None.
+        """
+        if not self.enabled:
+            return None
+
+        playlist_id = self.state.get(self._key(user_id, name))
+        record_cache_lookup("playlist_index", playlist_id is not None)
+        return playlist_id
+
+    def put(self, user_id: str, name: str, playlist_id: str) -> None:
+        """
+        Records the playlist a name resolved to.
+        """
+        if not self.enabled:
+            return
+
+        self.state.set(self._key(user_id, name), playlist_id, ttl=self.ttl)
+
+    def discard(self, user_id: str, name: str) -> None:
+        """
+        Drops a stale entry, e.g. after the playlist was deleted or renamed.
+        """
+        self.state.delete(self._key(user_id, name))
+
+
+_playlist_index: Optional[PlaylistNameIndex] = None
+
+
+def get_playlist_index() -> PlaylistNameIndex:
+    """
+    Returns the process-wide playlist-name index, creating it on first use.
+    """
+    global _playlist_index
+
+    if _playlist_index is None:
+        _playlist_index = PlaylistNameIndex.from_env()
+    return _playlist_index
@@ -0,0 +1,314 @@
+# backend/services/resilience.py
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Optional, TypeVar
+import requests
+from spotipy.exceptions import SpotifyException
+from backend.services.metrics import CIRCUIT_BREAKER_STATE, CIRCUIT_BREAKER_REJECTED_TOTAL, HEDGED_REQUESTS_TOTAL
+from backend.services.logger import get_logger
+
+# Setup a logger instance for this module
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class UpstreamUnavailableError(Exception):
+    """An upstream API is failing, so the work wasn't done. Unlike a miss, it's worth retrying later."""
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+
+def is_outage_error(error: Exception) -> bool:
+    """
+    Whether an error says the upstream is down or overloaded, rather than that the request was bad.
+
+    5xx and 429 responses, connection errors and timeouts count; a 400 or 404 doesn't.
+    """
+    if isinstance(error, SpotifyException):
+        return error.http_status is None or error.http_status >= 500 or error.http_status == 429
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+class LatencyTracker:
+    """
+    Estimates a latency quantile over the most recent `window` calls.
+
+    The sorted copy is only rebuilt every `refresh_every` observations, so
+    asking for the quantile on every call stays cheap.
+    """
+
+    def __init__(self, quantile: float = 0.95, window: int = 500, min_samples: int = 50, refresh_every: int = 20):
+        """
+        Args:
+            quantile (float): Quantile to estimate, e.g. 0.95 for p95.
+            window (int): Number of recent latencies kept.
+            min_samples (int): Observations needed before an estimate is given.
+            refresh_every (int): Observations between recomputations of the estimate.
+        """
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.refresh_every = refresh_every
+
+        self._samples = deque(maxlen=window)
+        self._since_refresh = 0
+        self._estimate: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._since_refresh += 1
+            if len(self._samples) >= self.min_samples and (self._estimate is None or self._since_refresh >= self.refresh_every):
+                ordered = sorted(self._samples)
+                self._estimate = ordered[min(int(len(ordered) * self.quantile), len(ordered) - 1)]
+                self._since_refresh = 0
+
+    def estimate(self) -> Optional[float]:
+        """
+        Returns the current quantile estimate in seconds, or None until `min_samples` calls were seen.
+        """
+        return self._estimate
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream that keeps failing.
+
+    After `failure_threshold` outage errors in a row the breaker opens and
+    every call fails straight away with CircuitOpenError, which gives the
+    upstream `reset_timeout` seconds to recover. The first call after that
+    is let through as a probe (half-open): success closes the breaker,
+    another outage error opens it again.
+
+    The state is per process and is exposed as the
+    flotunes_circuit_breaker_state gauge (0 closed, 1 half-open, 2 open).
+    """
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+    _GAUGE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            name (str): Breaker name, used as the metric label.
+            failure_threshold (int): Consecutive outage errors that open the breaker.
+            reset_timeout (float): Seconds the breaker stays open before a probe is let through.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        CIRCUIT_BREAKER_STATE.set(0, breaker=name)
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            logger.warning(f"[CircuitBreaker] - {self.name}: {self._state} -> {state}")
+            self._state = state
+            CIRCUIT_BREAKER_STATE.set(self._GAUGE_VALUES[state], breaker=self.name)
+
+    def before_call(self) -> None:
+        """
+        Lets a call through, or raises CircuitOpenError while the upstream is given time to recover.
+        """
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._set_state(self.HALF_OPEN)
+                self._probe_in_flight = False
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            if self._state == self.CLOSED:
+                return
+
+        CIRCUIT_BREAKER_REJECTED_TOTAL.inc(breaker=self.name)
+        raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+
+class ResilientCaller:
+    """
+    Runs upstream calls behind a circuit breaker, hedging the slow ones.
+
+    A call still running after the observed latency quantile (p95 by
+    default, never less than `min_hedge_delay`) gets a duplicate. The caller
+    takes whichever copy answers first. Hedges are limited by a budget:
+    each call earns `hedge_budget` of a hedge, so at most about 10% extra
+    requests are sent by default, even when everything is slow.
+
+    Every attempt's outcome goes to the breaker. Outage errors (see
+    is_outage_error) count as failures; anything else, including a 400,
+    shows the upstream is up.
+    """
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        tracker: Optional[LatencyTracker] = None,
+        hedging: bool = True,
+        min_hedge_delay: float = 0.05,
+        hedge_budget: float = 0.1,
+        workers: int = 32,
+    ):
+        """
+        Args:
+            breaker (CircuitBreaker): Breaker guarding the upstream.
+            tracker (Optional[LatencyTracker]): Latency estimate the hedge delay is taken from.
+            hedging (bool): When False, calls run directly on the caller's thread.
+            min_hedge_delay (float): Shortest wait in seconds before a hedge is sent.
+            hedge_budget (float): Hedges earned per call; unused budget accumulates up to 10 hedges.
+            workers (int): Threads the calls and their hedges run on.
+        """
+        self.breaker = breaker
+        self.tracker = tracker or LatencyTracker()
+        self.hedging = hedging
+        self.min_hedge_delay = min_hedge_delay
+        self.hedge_budget = hedge_budget
+        self.workers = workers
+
+        self._tokens = 0.0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls, name: str, prefix: str) -> "ResilientCaller":
+        """
+        Builds a caller from the <prefix>_HEDGE_* and <prefix>_BREAKER_* environment variables.
+        """
+        return cls(
+            CircuitBreaker(
+                name,
+                failure_threshold=int(os.getenv(f"{prefix}_BREAKER_FAILURES", "5")),
+                reset_timeout=float(os.getenv(f"{prefix}_BREAKER_RESET_SECONDS", "30")),
+            ),
+            LatencyTracker(quantile=float(os.getenv(f"{prefix}_HEDGE_QUANTILE", "0.95"))),
+            hedging=os.getenv(f"{prefix}_HEDGE_ENABLED", "true").lower() == "true",
+            min_hedge_delay=float(os.getenv(f"{prefix}_HEDGE_MIN_DELAY_MS", "50")) / 1000,
+            hedge_budget=float(os.getenv(f"{prefix}_HEDGE_BUDGET", "0.1")),
+            workers=int(os.getenv(f"{prefix}_HEDGE_WORKERS", "32")),
+        )
+
+    def _attempt(self, fn: Callable[[], T]) -> T:
+        """
+        One upstream attempt, with its latency and outcome recorded.
+        """
+        started = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            if is_outage_error(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        self.tracker.observe(time.perf_counter() - started)
+        self.breaker.record_success()
+        return result
+
+    def _submit(self, fn: Callable[[], T]) -> Optional[Future]:
+        """
+        Queues an attempt on the pool, or returns None if every thread is busy.
+        """
+        with self._lock:
+            if self._in_flight >= self.workers:
+                return None
+            self._in_flight += 1
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hedge")
+        return self._pool.submit(self._attempt, fn)
+
+    def _take_hedge_token(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """
+        Runs `fn` against the upstream.
+
+        Raises:
+            CircuitOpenError: The breaker is open; `fn` wasn't called.
+            Exception: Whatever `fn` raised, if no attempt succeeded.
+        """
+        self.breaker.before_call()
+        with self._lock:
+            self._tokens = min(self._tokens + self.hedge_budget, 10.0)
+
+        delay = self.tracker.estimate()
+        primary = self._submit(fn) if self.hedging and delay is not None else None
+        if primary is None:
+            # Too little history to pick a hedge delay, or the pool is saturated: call directly
+            with self._lock:
+                self._in_flight += 1
+            return self._attempt(fn)
+
+        done, _ = wait([primary], timeout=max(delay, self.min_hedge_delay))
+        if done or self.breaker.state != CircuitBreaker.CLOSED or not self._take_hedge_token():
+            return primary.result()
+
+        hedge = self._submit(fn)
+        if hedge is None:
+            return primary.result()
+
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    HEDGED_REQUESTS_TOTAL.inc(winner="hedge" if future is hedge else "primary")
+                    return future.result()
+                error = future.exception()
+        HEDGED_REQUESTS_TOTAL.inc(winner="none")
+        raise error
+
+
+_search_caller: Optional[ResilientCaller] = None
+
+
+def get_search_caller() -> ResilientCaller:
+    """
+    Returns the process-wide caller for Spotify searches, creating it on first use.
+    """
+    global _search_caller
+
+    if _search_caller is None:
+        _search_caller = ResilientCaller.from_env("spotify_search", "SPOTIFY_SEARCH")
+    return _search_caller
@@ -0,0 +1,285 @@
+# backend/services/retry_policy.py
+
+import os
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Callable, Optional, TypeVar
+import backoff
+import requests
+from googleapiclient.errors import HttpError
+from spotipy.exceptions import SpotifyException
+from backend.services.metrics import RETRIES_TOTAL
+from backend.services.resilience import CircuitOpenError, is_outage_error
+from backend.services.logger import get_logger
+
+if TYPE_CHECKING:
+    from backend.services.transfer_stats import TransferStatsCollector
+
+# Setup a logger instance for this module
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# YouTube 403 reasons that mean "slow down" rather than "not allowed"; quotaExceeded is not one of them
+_YOUTUBE_RATE_LIMIT_REASONS = (b"rateLimitExceeded", b"userRateLimitExceeded")
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Whether an idempotent call that raised `error` may succeed if simply sent again.
+
+    Outages (see is_outage_error: 5xx, 429, connection errors, timeouts) and
+    YouTube's rate-limit 403s are retryable. Bad requests, auth errors, a
+    used-up YouTube quota and an open circuit breaker are not.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, HttpError):
+        status = error.resp.status
+        if status == 403:
+            return any(reason in (error.content or b"") for reason in _YOUTUBE_RATE_LIMIT_REASONS)
+        return status == 429 or status >= 500
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        # Socket-level failures from httplib2, which the YouTube client uses
+        return True
+    return is_outage_error(error)
+
+
+def is_retryable_write(error: Exception) -> bool:
+    """
+    Whether a non-idempotent call (a playlist write) that raised `error` may be sent again.
+
+    Only errors that show the write wasn't applied count: 429 and 503 replies
+    and failed connections. After a timeout or another 5xx the write may have
+    gone through, and sending it again could add the tracks twice.
+    """
+    if isinstance(error, SpotifyException):
+        return error.http_status in (429, 503)
+    return isinstance(error, (requests.exceptions.ConnectTimeout, ConnectionRefusedError))
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """
+    Seconds the upstream asked to wait before the next try, from the Retry-After header of a 429 or 503.
+
+    Reads SpotifyException.headers and the response of a YouTube HttpError.
+    The header may be a number of seconds or an HTTP date. Returns None when
+    the error carries no usable Retry-After.
+    """
+    if isinstance(error, SpotifyException):
+        headers = error.headers or {}
+        value = headers.get("Retry-After") or headers.get("retry-after")
+    elif isinstance(error, HttpError):
+        # httplib2 lowercases header names
+        value = error.resp.get("retry-after")
+    else:
+        return None
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        until = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if until.tzinfo is None:
+        until = until.replace(tzinfo=timezone.utc)
+    return max((until - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class RetryBudget:
+    """
+    Caps the retries of one transfer.
+
+    Without a cap, a transfer of 5,000 videos against a flaky upstream could
+    spend most of its time backing off. Once the budget is used up, errors
+    are raised on the first failure, as if retrying were off.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Args:
+            limit (int): Retries allowed over the whole transfer; 0 for none.
+        """
+        self.limit = limit
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def try_spend(self) -> bool:
+        """
+        Takes one retry from the budget. Returns False, taking nothing, once it is used up.
+
+        Checked and taken under one lock, so concurrent jobs can't overshoot the limit.
+        """
+        with self._lock:
+            if self._used >= self.limit:
+                return False
+            self._used += 1
+            return True
+
+    def charge(self, count: int) -> None:
+        """
+        Records `count` retries already made elsewhere, e.g. by a chunk matched in a worker process.
+        """
+        with self._lock:
+            self._used += count
+
+    @property
+    def used(self) -> int:
+        return self._used
+
+    @property
+    def remaining(self) -> int:
+        return max(self.limit - self._used, 0)
+
+
+class RetryPolicy:
+    """
+    Retries transient upstream errors with jittered exponential backoff.
+
+    A call is tried up to `max_tries` times. Between tries it waits a random
+    time up to base_delay * 2^n seconds (full jitter, capped at `max_delay`),
+    so callers that failed together don't retry together. Only errors the
+    classifier accepts are retried, and only while the transfer's
+    RetryBudget has retries left.
+
+    When the error carries a Retry-After (see retry_after()), the wait is at
+    least that long. If the upstream asks for more than `max_delay`, the call
+    gives up at once instead of sleeping past the cap.
+    """
+
+    def __init__(self, enabled: bool = True, max_tries: int = 3, base_delay: float = 0.5, max_delay: float = 8.0):
+        """
+        Args:
+            enabled (bool): When False, every call is tried once.
+            max_tries (int): Tries per call, the first one included.
+            base_delay (float): Upper bound in seconds of the wait before the first retry.
+            max_delay (float): Upper bound in seconds of any single wait.
+        """
+        self.enabled = enabled
+        self.max_tries = max_tries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """
+        Builds the policy from the RETRY_* environment variables.
+        """
+        return cls(
+            enabled=os.getenv("RETRY_ENABLED", "true").lower() == "true",
+            max_tries=int(os.getenv("RETRY_MAX_TRIES", "3")),
+            base_delay=float(os.getenv("RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(os.getenv("RETRY_MAX_DELAY", "8")),
+        )
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        stage: str,
+        budget: Optional[RetryBudget] = None,
+        retryable: Callable[[Exception], bool] = is_retryable,
+        on_retry: Optional[Callable[[], None]] = None,
+    ) -> T:
+        """
+        Runs `fn`, retrying it on transient errors.
+
+        Args:
+            fn (Callable[[], T]): The upstream call.
+            stage (str): Pipeline stage, for the retry metric and log.
+            budget (Optional[RetryBudget]): The transfer's budget; without one only `max_tries` limits retries.
+            retryable (Callable[[Exception], bool]): Error classifier; is_retryable_write for non-idempotent calls.
+            on_retry (Optional[Callable[[], None]]): Called before each retry, e.g. to count it in the transfer's stats.
+
+        Returns:
+            T: What `fn` returned.
+
+        Raises:
+            Exception: The last error, once it isn't retryable, the tries or the budget are used up.
+        """
+        if not self.enabled or self.max_tries <= 1:
+            return fn()
+
+        tries = 0
+        # Retry-After of the error being retried; backoff asks give_up() before it computes the wait
+        requested_wait = 0.0
+
+        def attempt() -> T:
+            nonlocal tries
+            tries += 1
+            return fn()
+
+        def give_up(error: Exception) -> bool:
+            nonlocal requested_wait
+            if not retryable(error) or tries >= self.max_tries:
+                # The last try's error ends the call anyway, so it takes nothing from the budget
+                return True
+            requested_wait = retry_after(error) or 0.0
+            if requested_wait > self.max_delay:
+                logger.info(f"[Retry] - {stage}: upstream asked to wait {requested_wait:.0f}s, giving up")
+                return True
+            return budget is not None and not budget.try_spend()
+
+        def wait(value: float) -> float:
+            return max(backoff.full_jitter(value), requested_wait)
+
+        def before_retry(details: dict) -> None:
+            RETRIES_TOTAL.inc(stage=stage)
+            if on_retry:
+                on_retry()
+            logger.info(f"[Retry] - {stage}: try {details['tries']} failed, retrying in {details['wait']:.2f}s")
+
+        retrying = backoff.on_exception(
+            backoff.expo,
+            Exception,
+            max_tries=self.max_tries,
+            jitter=wait,
+            giveup=give_up,
+            on_backoff=before_retry,
+            logger=None,
+            factor=self.base_delay,
+            max_value=self.max_delay,
+        )(attempt)
+        return retrying()
+
+
+def retry_call(
+    fn: Callable[[], T],
+    stage: str,
+    stats: Optional["TransferStatsCollector"] = None,
+    retryable: Callable[[Exception], bool] = is_retryable,
+) -> T:
+    """
+    Runs `fn` under the process-wide retry policy, against the transfer's retry budget.
+
+    Args:
+        fn (Callable[[], T]): The upstream call.
+        stage (str): One of TRANSFER_STAGES; retries are counted under it in `stats`.
+        stats (Optional[TransferStatsCollector]): The transfer's stats, which hold its retry budget.
+        retryable (Callable[[Exception], bool]): Error classifier; is_retryable_write for non-idempotent calls.
+    """
+    return get_retry_policy().call(
+        fn,
+        stage,
+        budget=stats.retry_budget if stats else None,
+        retryable=retryable,
+        on_retry=(lambda: stats.count_retry(stage)) if stats else None,
+    )
+
+
+_retry_policy: Optional[RetryPolicy] = None
+
+
+def get_retry_policy() -> RetryPolicy:
+    """
+    Returns the process-wide retry policy, creating it on first use.
+    """
+    global _retry_policy
+
+    if _retry_policy is None:
+        _retry_policy = RetryPolicy.from_env()
+    return _retry_policy
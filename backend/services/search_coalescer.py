@@ -0,0 +1,113 @@
+# backend/services/search_coalescer.py
+
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+from backend.services.match_cache import normalize_title
+from backend.services.metrics import record_cache_lookup
+
+
+class SearchCoalescer:
+    """
+    Collapses concurrent lookups of the same title into one upstream search.
+
+    Autocomplete-style clients send bursts of the same or nearly the same
+    query (differing only in case or spacing). The first lookup of a
+    normalized title runs the search; every lookup of that title that
+    arrives while it is in flight, or within `window` seconds after it
+    finished, gets the same result without calling Spotify.
+    """
+
+    def __init__(self, enabled: bool = True, window: float = 0.05, max_size: int = 10_000):
+        """
+        Args:
+            enabled (bool): When False, every lookup runs its own search.
+            window (float): Seconds a finished result keeps answering new lookups.
+            max_size (int): Finished results kept at most; the oldest are dropped first.
+        """
+        self.enabled = enabled
+        self.window = window
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        # normalized title -> (future, finished_at or None while in flight)
+        self._entries: Dict[str, Tuple[Future, Optional[float]]] = {}
+
+    @classmethod
+    def from_env(cls) -> "SearchCoalescer":
+        """
+        Builds the coalescer from the SEARCH_COALESCE_* environment variables.
+        """
+        return cls(
+            enabled=os.getenv("SEARCH_COALESCE_ENABLED", "true").lower() == "true",
+            window=float(os.getenv("SEARCH_COALESCE_WINDOW_MS", "50")) / 1000,
+        )
+
+    def lookup(self, title: str, search: Callable[[str], Any]) -> Any:
+        """
+        Returns search(title), sharing the call with concurrent lookups of the same normalized title.
+
+        Args:
+            title (str): Title as the client sent it; the first caller's spelling is searched.
+            search (Callable[[str], Any]): Upstream search, called at most once per burst.
+
+        Returns:
+            Any: Result of the shared search. Its exception is raised to every waiter.
+        """
+        if not self.enabled:
+            return search(title)
+
+        key = normalize_title(title)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and (entry[1] is None or now - entry[1] <= self.window):
+                future, leader = entry[0], False
+            else:
+                future, leader = Future(), True
+                self._entries[key] = (future, None)
+
+        record_cache_lookup("search_coalesce", not leader)
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(search(title))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                if future.exception() is None:
+                    self._entries[key] = (future, time.monotonic())
+                else:
+                    # Failures are shared with the current waiters only, never replayed
+                    self._entries.pop(key, None)
+                self._evict(time.monotonic())
+        return future.result()
+
+    def _evict(self, now: float) -> None:
+        if len(self._entries) <= self.max_size:
+            return
+        for key in [key for key, (_, finished) in self._entries.items() if finished is not None and now - finished > self.window]:
+            del self._entries[key]
+        while len(self._entries) > self.max_size:
+            oldest = next((key for key, (_, finished) in self._entries.items() if finished is not None), None)
+            if oldest is None:
+                break
+            del self._entries[oldest]
+
+
+_search_coalescer: Optional[SearchCoalescer] = None
+
+
+def get_search_coalescer() -> SearchCoalescer:
+    """
+    Returns the process-wide search coalescer, creating it on first use.
+    """
+    global _search_coalescer
+
+    if _search_coalescer is None:
+        _search_coalescer = SearchCoalescer.from_env()
+    return _search_coalescer
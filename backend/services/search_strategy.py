@@ -0,0 +1,240 @@
+# backend/services/search_strategy.py
+
+import os
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from backend.services.metrics import SEARCH_STRATEGY_SKIPPED_TOTAL, SEARCH_STRATEGY_WINS_TOTAL
+from backend.services.shared_state import SharedState, get_shared_state
+
+
+# Strategy labels, in the order generate_labeled_search_queries() produces them
+SEARCH_STRATEGIES = ("structured", "original", "cleaned", "artist_song", "song", "artist")
+
+# Separators generate_labeled_search_queries() splits "Artist - Song" titles on
+TITLE_SEPARATORS = (" - ", " – ", " — ", " | ", " • ", ": ")
+
+_NOISE_RE = re.compile(r"[\[\(【]|\b(official|lyrics?|audio|video|ft\.?|feat\.?|featuring|hd|4k|mv)\b", re.IGNORECASE)
+
+
+def topic_channel_artist(channel: Optional[str]) -> Optional[str]:
+    """
+    Returns the artist of an auto-generated "Artist - Topic" channel, or None for any other channel.
+    """
+    if channel and channel.endswith(" - Topic"):
+        return channel[:-len(" - Topic")].strip() or None
+    return None
+
+
+def classify_title_shape(title: str, channel: Optional[str] = None) -> str:
+    """
+    Buckets a YouTube title by the features that decide which search strategy works.
+
+    Shapes:
+        topic: auto-generated "Artist - Topic" upload, title is just the song
+        split_noisy: "Artist - Song" with brackets, featuring or "official" noise
+        split_clean: "Artist - Song" with nothing else
+        plain_noisy: no separator, but with noise
+        plain_clean: anything else, e.g. a bare song name
+
+    Args:
+        title (str): YouTube video title.
+        channel (Optional[str]): Channel that uploaded the video.
+
+    Returns:
+        str: One of the shapes above.
+    """
+    if topic_channel_artist(channel):
+        return "topic"
+    split = "split" if any(separator in title for separator in TITLE_SEPARATORS) else "plain"
+    noise = "noisy" if _NOISE_RE.search(title) else "clean"
+    return f"{split}_{noise}"
+
+
+class StrategyStats:
+    """
+    Learns which search strategies produce the accepted match, per title shape.
+
+    Every searched video records which strategies were tried and which one
+    returned the match that was kept. Strategies are then ordered by their
+    smoothed success rate, so the query that usually wins is sent first and
+    the high-confidence early exit skips the rest.
+
+    Skipping is deliberately conservative: a strategy is only left out after
+    `min_attempts` tries with a smoothed success rate below `skip_below`,
+    never when it is the last one left, and a random `explore_rate` share of
+    videos still tries everything so the numbers keep updating.
+
+    Counts live in the shared state so all workers learn together. Each
+    worker reads a shape's counts at most every `refresh_interval` seconds
+    and applies its own updates locally in between.
+    """
+
+    def __init__(
+        self,
+        state: SharedState,
+        enabled: bool = True,
+        min_attempts: int = 50,
+        skip_below: float = 0.02,
+        explore_rate: float = 0.05,
+        prior_rate: float = 0.5,
+        prior_weight: float = 2.0,
+        refresh_interval: float = 5.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            state (SharedState): Backend the counts are stored in.
+            enabled (bool): When False, strategies keep their generated order and nothing is skipped.
+            min_attempts (int): Attempts needed before a strategy can be skipped for a shape.
+            skip_below (float): Smoothed success rate under which a strategy is skipped.
+            explore_rate (float): Share of videos that try every strategy regardless of the stats.
+            prior_rate (float): Success rate assumed for a strategy with no history.
+            prior_weight (float): How many attempts the prior is worth; higher adapts more slowly.
+            refresh_interval (float): Seconds between reads of the shared counts for a shape.
+            seed (Optional[int]): Seed for the exploration draw.
+        """
+        self.state = state
+        self.enabled = enabled
+        self.min_attempts = min_attempts
+        self.skip_below = skip_below
+        self.explore_rate = explore_rate
+        self.prior_rate = prior_rate
+        self.prior_weight = prior_weight
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        # Per shape: {"attempts:<strategy>": n, "wins:<strategy>": n} and when it was last read
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._refreshed: Dict[str, float] = {}
+
+    @classmethod
+    def from_env(cls) -> "StrategyStats":
+        """
+        Builds the stats from the SEARCH_STRATEGY_* environment variables.
+        """
+        return cls(
+            get_shared_state(),
+            enabled=os.getenv("SEARCH_STRATEGY_ADAPTIVE", "true").lower() == "true",
+            min_attempts=int(os.getenv("SEARCH_STRATEGY_MIN_ATTEMPTS", "50")),
+            skip_below=float(os.getenv("SEARCH_STRATEGY_SKIP_BELOW", "0.02")),
+            explore_rate=float(os.getenv("SEARCH_STRATEGY_EXPLORE_RATE", "0.05")),
+        )
+
+    def _shape_counts(self, shape: str) -> Dict[str, int]:
+        now = time.monotonic()
+        if now - self._refreshed.get(shape, float("-inf")) >= self.refresh_interval:
+            counts = self.state.get_fields(f"strategy:{shape}")
+            with self._lock:
+                self._counts[shape] = counts
+                self._refreshed[shape] = now
+        return self._counts.get(shape, {})
+
+    def _rate(self, counts: Dict[str, int], strategy: str) -> float:
+        attempts = counts.get(f"attempts:{strategy}", 0)
+        wins = counts.get(f"wins:{strategy}", 0)
+        return (wins + self.prior_rate * self.prior_weight) / (attempts + self.prior_weight)
+
+    def success_rate(self, shape: str, strategy: str) -> float:
+        """
+        Smoothed share of attempts in which the strategy produced the accepted match.
+        """
+        return self._rate(self._shape_counts(shape), strategy)
+
+    def order(self, shape: str, labeled_queries: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """
+        Orders (strategy, query) pairs by success rate for the shape and drops hopeless ones.
+
+        Ties keep the generated order, so with no history the result is unchanged.
+
+        Args:
+            shape (str): Title shape from classify_title_shape().
+            labeled_queries (List[Tuple[str, str]]): Output of generate_labeled_search_queries().
+
+        Returns:
+            List[Tuple[str, str]]: The (strategy, query) pairs to try, in order.
+        """
+        if not self.enabled or len(labeled_queries) < 2:
+            return labeled_queries
+
+        counts = self._shape_counts(shape)
+        with self._lock:
+            explore = self._random.random() < self.explore_rate
+            ranked = []
+            for position, (strategy, query) in enumerate(labeled_queries):
+                rate = self._rate(counts, strategy)
+                skip = (
+                    not explore
+                    and counts.get(f"attempts:{strategy}", 0) >= self.min_attempts
+                    and rate < self.skip_below
+                )
+                ranked.append((-rate, position, strategy, query, skip))
+
+        ranked.sort()
+        kept = [(strategy, query) for _, _, strategy, query, skip in ranked if not skip]
+        if not kept:
+            kept = [(ranked[0][2], ranked[0][3])]
+        kept_strategies = {strategy for strategy, _ in kept}
+        for _, _, strategy, _, skip in ranked:
+            if skip and strategy not in kept_strategies:
+                SEARCH_STRATEGY_SKIPPED_TOTAL.inc(shape=shape, strategy=strategy)
+        return kept
+
+    def record(self, shape: str, attempted: List[str], winner: Optional[str]) -> None:
+        """
+        Records the outcome of searching one video.
+
+        Args:
+            shape (str): Title shape from classify_title_shape().
+            attempted (List[str]): Strategies whose query was sent, in order.
+            winner (Optional[str]): Strategy whose results held the accepted match, or None.
+        """
+        if not self.enabled or not attempted:
+            return
+
+        amounts = {f"attempts:{strategy}": 1 for strategy in attempted}
+        if winner:
+            amounts[f"wins:{winner}"] = 1
+        self.state.incr_fields(f"strategy:{shape}", amounts)
+
+        # Apply locally too, so this worker doesn't wait for the next refresh to see it
+        with self._lock:
+            counts = self._counts.setdefault(shape, {})
+            for field, amount in amounts.items():
+                counts[field] = counts.get(field, 0) + amount
+        if winner:
+            SEARCH_STRATEGY_WINS_TOTAL.inc(shape=shape, strategy=winner)
+
+    def snapshot(self) -> Dict[str, Dict[str, dict]]:
+        """
+        Returns attempts, wins and smoothed rate per strategy for every shape seen by this worker.
+        """
+        with self._lock:
+            shapes = {shape: dict(counts) for shape, counts in self._counts.items()}
+        result: Dict[str, Dict[str, dict]] = {}
+        for shape, counts in sorted(shapes.items()):
+            for strategy in SEARCH_STRATEGIES:
+                if f"attempts:{strategy}" in counts:
+                    result.setdefault(shape, {})[strategy] = {
+                        "attempts": counts.get(f"attempts:{strategy}", 0),
+                        "wins": counts.get(f"wins:{strategy}", 0),
+                        "rate": round(self._rate(counts, strategy), 3),
+                    }
+        return result
+
+
+_strategy_stats: Optional[StrategyStats] = None
+
+
+def get_strategy_stats() -> StrategyStats:
+    """
+    Returns the process-wide strategy stats, creating them on first use.
+    """
+    global _strategy_stats
+
+    if _strategy_stats is None:
+        _strategy_stats = StrategyStats.from_env()
+    return _strategy_stats
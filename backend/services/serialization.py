@@ -0,0 +1,39 @@
+# backend/services/serialization.py
+
+from typing import Any
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+except ImportError:  # orjson is optional; fall back to the standard library encoder
+    orjson = None
+    ORJSONResponse = None
+
+
+# App-wide default response class: orjson when installed, the stdlib encoder otherwise
+FastJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON response that encodes a Pydantic model directly with pydantic-core.
+
+    Returning a model from an endpoint makes FastAPI validate it, dump it to
+    Python objects and encode those again, all on the event loop. This class
+    turns the model into JSON bytes in one step, at construction time, so
+    building it in a worker thread keeps large responses (a 5,000-song
+    TransferResponse is a few MB) off the loop entirely. Content that is
+    already encoded (bytes) is sent as it is.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, BaseModel):
+            return pydantic_core.to_json(content)
+        if orjson is not None:
+            return orjson.dumps(content)
+        return super().render(content)
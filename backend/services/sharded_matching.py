@@ -0,0 +1,182 @@
+# backend/services/sharded_matching.py
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional, Tuple
+import spotipy
+from backend.models.transfer import SpotifyTrack, TransferStats, YouTubeVideo
+from backend.services.transfer_stats import TransferStatsCollector
+from backend.services.transfer_progress import TransferProgress
+from backend.services.resilience import UpstreamUnavailableError
+from backend.services.logger import get_logger
+
+# Setup a logger instance for this module
+logger = get_logger(__name__)
+
+# Spotify client of the current worker process, with the factory that built it
+_worker_client: Optional[spotipy.Spotify] = None
+_worker_factory: Optional[Callable[[], spotipy.Spotify]] = None
+
+
+def _match_chunk(
+    client_factory: Callable[[], spotipy.Spotify],
+    videos: List[YouTubeVideo],
+    retry_budget: Optional[int] = None
+) -> Tuple[List[Optional[SpotifyTrack] | UpstreamUnavailableError], TransferStats]:
+    """
+    Matches one chunk of videos. Runs in a worker process.
+
+    The client is built once per process and reused for later chunks of the
+    same transfer. `retry_budget` is the chunk's share of the transfer's
+    retries; without it the chunk gets a whole TRANSFER_RETRY_BUDGET.
+
+    Returns:
+        Tuple[List[Optional[SpotifyTrack] | UpstreamUnavailableError], TransferStats]: One match (see
+            api_match_video) per video, in order, and the search calls the chunk made.
+    """
+    # Imported here because spotify_api imports this module
+    from backend.services.spotify_api import api_match_video
+    global _worker_client, _worker_factory
+
+    if _worker_client is None or _worker_factory != client_factory:
+        _worker_client = client_factory()
+        _worker_factory = client_factory
+
+    stats = TransferStatsCollector(retry_budget=retry_budget)
+    tracks = [api_match_video(_worker_client, video, stats=stats) for video in videos]
+    return tracks, stats.to_model()
+
+
+class ShardedMatcher:
+    """
+    Matches the videos of one large playlist on a pool of worker processes.
+
+    The video list is cut into `chunk_size` chunks and every chunk is queued
+    on the pool; idle workers pull the next chunk, so a slow chunk never
+    holds the others back. Results are put back in playlist order before
+    the caller writes the playlist once, in order.
+
+    Workers read and write the same shared state as the web process, so
+    with REDIS_URL set they share the search cache, resolutions and
+    strategy stats with every other worker and node. Without it each
+    worker process keeps its own caches.
+    """
+
+    def __init__(self, workers: int = 0, chunk_size: int = 250, min_videos: int = 1000):
+        """
+        Args:
+            workers (int): Number of worker processes; 0 disables sharding.
+            chunk_size (int): Videos per chunk.
+            min_videos (int): Smallest playlist worth sharding; smaller ones are matched in-process.
+        """
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.min_videos = min_videos
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ShardedMatcher":
+        """
+        Builds the matcher from the TRANSFER_SHARD_* environment variables.
+        """
+        return cls(
+            workers=int(os.getenv("TRANSFER_SHARD_WORKERS", "0")),
+            chunk_size=int(os.getenv("TRANSFER_SHARD_CHUNK_SIZE", "250")),
+            min_videos=int(os.getenv("TRANSFER_SHARD_MIN_VIDEOS", "1000")),
+        )
+
+    def should_shard(self, video_count: int) -> bool:
+        """
+        Whether a playlist of `video_count` videos should be matched on the pool.
+        """
+        return self.workers > 0 and video_count >= self.min_videos
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn, not fork: the web process runs threads (transfer pool, HTTP client)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def match(
+        self,
+        client_factory: Callable[[], spotipy.Spotify],
+        videos: List[YouTubeVideo],
+        stats: Optional[TransferStatsCollector] = None,
+        progress: Optional[TransferProgress] = None
+    ) -> List[Optional[SpotifyTrack] | UpstreamUnavailableError]:
+        """
+        Matches every video on the worker pool.
+
+        Args:
+            client_factory (Callable[[], spotipy.Spotify]): Picklable callable that builds a
+                Spotify client inside a worker process.
+            videos (List[YouTubeVideo]): Videos to match.
+            stats (Optional[TransferStatsCollector]): Per-transfer stats to add the workers' search calls to;
+                its retry budget is shared out between the chunks.
+            progress (Optional[TransferProgress]): Progress publisher, updated as chunks finish.
+
+        Returns:
+            List[Optional[SpotifyTrack] | UpstreamUnavailableError]: One match (see api_match_video) per
+                video, in playlist order.
+        """
+        pool = self._get_pool()
+        chunks = [videos[start:start + self.chunk_size] for start in range(0, len(videos), self.chunk_size)]
+        logger.info(f"[ShardedMatcher] - Matching {len(videos)} videos in {len(chunks)} chunks on {self.workers} workers")
+
+        # Chunks run at once, so each gets a share of the transfer's remaining retries rather than all of them
+        budgets: List[Optional[int]] = [None] * len(chunks)
+        if stats:
+            share, extra = divmod(stats.retry_budget.remaining, len(chunks))
+            budgets = [share + (index < extra) for index in range(len(chunks))]
+
+        futures = {
+            pool.submit(_match_chunk, client_factory, chunk, budgets[index]): index
+            for index, chunk in enumerate(chunks)
+        }
+        results: List[Optional[list]] = [None] * len(chunks)
+        try:
+            for future in as_completed(futures):
+                tracks, chunk_stats = future.result()
+                results[futures[future]] = tracks
+                if stats:
+                    stats.merge(chunk_stats)
+                if progress:
+                    for track in tracks:
+                        progress.video_done(matched=isinstance(track, SpotifyTrack))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+        return [track for chunk in results for track in chunk]
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker processes, if any were started.
+        """
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+_sharded_matcher: Optional[ShardedMatcher] = None
+
+
+def get_sharded_matcher() -> ShardedMatcher:
+    """
+    Returns the process-wide sharded matcher, creating it on first use.
+    """
+    global _sharded_matcher
+
+    if _sharded_matcher is None:
+        _sharded_matcher = ShardedMatcher.from_env()
+    return _sharded_matcher
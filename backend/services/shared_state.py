@@ -0,0 +1,374 @@
+# backend/services/shared_state.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from cachetools import TLRUCache
+from backend.services.logger import get_logger
+
+try:
+    import redis
+except ImportError:  # Only needed when REDIS_URL is set
+    redis = None
+
+# Setup a logger instance for this module
+logger = get_logger(__name__)
+
+
+class SharedState:
+    """
+    Key-value state shared by every worker process.
+
+    Caches and progress that must survive across uvicorn workers (search
+    cache, match resolutions, playlist-name index, transfer results and
+    progress) go through this interface instead of module-level dicts.
+    Values are JSON-serializable. Backends never raise on a storage outage:
+    reads miss and writes are dropped, so a transfer only loses its caching.
+    """
+
+    backend = ""
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the value stored under `key`, or None."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Stores `value` under `key`, expiring after `ttl` seconds if given."""
+        raise NotImplementedError
+
+    def set_if_absent(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Stores `value` only if `key` is missing; returns whether it was stored."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Removes `key` if present."""
+        raise NotImplementedError
+
+    def incr_fields(self, key: str, amounts: Dict[str, int]) -> None:
+        """Atomically adds to integer fields of the counter map under `key`."""
+        raise NotImplementedError
+
+    def get_fields(self, key: str) -> Dict[str, int]:
+        """Returns every field of the counter map under `key`."""
+        raise NotImplementedError
+
+    def push_list(self, key: str, values: List[Any], ttl: Optional[float] = None) -> None:
+        """Appends `values` to the list under `key`."""
+        raise NotImplementedError
+
+    def list_range(self, key: str, start: int, stop: int) -> List[Any]:
+        """Returns list items start..stop-1 (Python slice semantics, non-negative indexes)."""
+        raise NotImplementedError
+
+    def list_length(self, key: str) -> int:
+        """Returns the length of the list under `key` (0 if missing)."""
+        raise NotImplementedError
+
+
+class LocalSharedState(SharedState):
+    """
+    In-process fallback used when REDIS_URL is not set.
+
+    Only shared between threads of one process; fine for a single worker.
+    Bounded to `max_size` keys, least recently used first out.
+    """
+
+    backend = "local"
+
+    def __init__(self, max_size: int = 100_000):
+        # Each entry is (expires_at, value); TLRUCache drops it once expires_at has passed
+        self._data: TLRUCache = TLRUCache(maxsize=max_size, ttu=lambda key, entry, now: entry[0], timer=time.monotonic)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> float:
+        return time.monotonic() + ttl if ttl else float("inf")
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+        return entry[1] if entry else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = (self._expiry(ttl), value)
+
+    def set_if_absent(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        with self._lock:
+            if self._data.get(key) is not None:
+                return False
+            self._data[key] = (self._expiry(ttl), value)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr_fields(self, key: str, amounts: Dict[str, int]) -> None:
+        with self._lock:
+            entry = self._data.get(key)
+            fields = entry[1] if entry else {}
+            for field, amount in amounts.items():
+                fields[field] = fields.get(field, 0) + amount
+            self._data[key] = (entry[0] if entry else float("inf"), fields)
+
+    def get_fields(self, key: str) -> Dict[str, int]:
+        with self._lock:
+            entry = self._data.get(key)
+            return dict(entry[1]) if entry else {}
+
+    def push_list(self, key: str, values: List[Any], ttl: Optional[float] = None) -> None:
+        with self._lock:
+            entry = self._data.get(key)
+            items = entry[1] if entry else []
+            items.extend(values)
+            self._data[key] = (self._expiry(ttl) if ttl else (entry[0] if entry else float("inf")), items)
+
+    def list_range(self, key: str, start: int, stop: int) -> List[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            return list(entry[1][start:stop]) if entry else []
+
+    def list_length(self, key: str) -> int:
+        with self._lock:
+            entry = self._data.get(key)
+            return len(entry[1]) if entry else 0
+
+
+class RedisSharedState(SharedState):
+    """
+    Redis-backed state, shared by every worker and node pointing at the same REDIS_URL.
+
+    Values are stored as JSON under `prefix`; counter maps are Redis hashes
+    and lists are Redis lists, so increments and appends are atomic.
+    """
+
+    backend = "redis"
+
+    def __init__(self, url: str, prefix: str = "flotunes:", socket_timeout: float = 0.5):
+        """
+        Args:
+            url (str): Redis connection URL, e.g. redis://localhost:6379/0.
+            prefix (str): Namespace prepended to every key.
+            socket_timeout (float): Seconds before a Redis call gives up; kept short so a slow
+                Redis degrades to cache misses instead of stalling transfers.
+        """
+        if redis is None:
+            raise RuntimeError("REDIS_URL is set but the redis package is not installed")
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=socket_timeout, socket_connect_timeout=socket_timeout)
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    @staticmethod
+    def _warn(operation: str, key: str, error: Exception) -> None:
+        logger.warning(f"[SharedState] - Redis {operation} failed for '{key}': {error}")
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self._client.get(self._key(key))
+        except redis.RedisError as e:
+            self._warn("get", key, e)
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        try:
+            self._client.set(self._key(key), json.dumps(value, separators=(",", ":")), px=int(ttl * 1000) if ttl else None)
+        except redis.RedisError as e:
+            self._warn("set", key, e)
+
+    def set_if_absent(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        try:
+            return bool(self._client.set(
+                self._key(key), json.dumps(value, separators=(",", ":")), px=int(ttl * 1000) if ttl else None, nx=True
+            ))
+        except redis.RedisError as e:
+            self._warn("set nx", key, e)
+            return False
+
+    def delete(self, key: str) -> None:
+        try:
+            self._client.delete(self._key(key))
+        except redis.RedisError as e:
+            self._warn("delete", key, e)
+
+    def incr_fields(self, key: str, amounts: Dict[str, int]) -> None:
+        try:
+            pipeline = self._client.pipeline(transaction=False)
+            for field, amount in amounts.items():
+                pipeline.hincrby(self._key(key), field, amount)
+            pipeline.execute()
+        except redis.RedisError as e:
+            self._warn("hincrby", key, e)
+
+    def get_fields(self, key: str) -> Dict[str, int]:
+        try:
+            raw = self._client.hgetall(self._key(key))
+        except redis.RedisError as e:
+            self._warn("hgetall", key, e)
+            return {}
+        return {field.decode(): int(value) for field, value in raw.items()}
+
+    def push_list(self, key: str, values: List[Any], ttl: Optional[float] = None) -> None:
+        if not values:
+            return
+        try:
+            pipeline = self._client.pipeline(transaction=False)
+            pipeline.rpush(self._key(key), *(json.dumps(value, separators=(",", ":")) for value in values))
+            if ttl:
+                pipeline.pexpire(self._key(key), int(ttl * 1000))
+            pipeline.execute()
+        except redis.RedisError as e:
+            self._warn("rpush", key, e)
+
+    def list_range(self, key: str, start: int, stop: int) -> List[Any]:
+        if stop <= start:
+            return []
+        try:
+            raw = self._client.lrange(self._key(key), start, stop - 1)
+        except redis.RedisError as e:
+            self._warn("lrange", key, e)
+            return []
+        return [json.loads(item) for item in raw]
+
+    def list_length(self, key: str) -> int:
+        try:
+            return self._client.llen(self._key(key))
+        except redis.RedisError as e:
+            self._warn("llen", key, e)
+            return 0
+
+
+class SqliteSharedState(SharedState):
+    """
+    On-disk state in a SQLite file, used when SHARED_STATE_PATH is set.
+
+    Meant for the demo.py CLI and other single-host scripts: caches survive
+    between runs, so re-running a batch migration reuses its searches and
+    matches. Processes on the same host can share the file. Every value is
+    a JSON row; counter maps and lists are updated read-modify-write inside
+    an immediate transaction, so concurrent writers never lose updates.
+    Unlike the server backends it does raise on errors: a broken cache file
+    should stop a batch run, not silently turn it into a cold one.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Database file; parent directories are created.
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)")
+            self._conn.execute("DELETE FROM state WHERE expires_at < ?", (time.time(),))
+
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> Optional[float]:
+        return time.time() + ttl if ttl else None
+
+    def _read(self, key: str) -> Optional[tuple]:
+        row = self._conn.execute(
+            "SELECT value, expires_at FROM state WHERE key = ? AND (expires_at IS NULL OR expires_at >= ?)",
+            (key, time.time()),
+        ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def _write(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value, separators=(",", ":")), expires_at),
+        )
+
+    def _update(self, key: str, update, ttl: Optional[float] = None) -> Any:
+        # Read-modify-write in one immediate transaction, so other processes wait for it
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                current = self._read(key)
+                value, stored = update(current[0] if current else None)
+                if stored is not None:
+                    expires_at = self._expiry(ttl) if ttl else (current[1] if current else None)
+                    self._write(key, stored, expires_at)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return value
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._read(key)
+        return entry[0] if entry else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._write(key, value, self._expiry(ttl))
+
+    def set_if_absent(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        return self._update(key, lambda current: (False, None) if current is not None else (True, value), ttl=ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM state WHERE key = ?", (key,))
+
+    def incr_fields(self, key: str, amounts: Dict[str, int]) -> None:
+        def update(fields):
+            fields = fields or {}
+            for field, amount in amounts.items():
+                fields[field] = fields.get(field, 0) + amount
+            return None, fields
+
+        self._update(key, update)
+
+    def get_fields(self, key: str) -> Dict[str, int]:
+        return self.get(key) or {}
+
+    def push_list(self, key: str, values: List[Any], ttl: Optional[float] = None) -> None:
+        if values:
+            self._update(key, lambda items: (None, (items or []) + list(values)), ttl=ttl)
+
+    def list_range(self, key: str, start: int, stop: int) -> List[Any]:
+        return (self.get(key) or [])[start:stop]
+
+    def list_length(self, key: str) -> int:
+        return len(self.get(key) or [])
+
+
+_shared_state: Optional[SharedState] = None
+_shared_state_lock = threading.Lock()
+
+
+def get_shared_state() -> SharedState:
+    """
+    Returns the process-wide shared state backend, creating it on first use.
+
+    Redis when REDIS_URL is set, so caches are shared by all uvicorn workers;
+    a SQLite file when SHARED_STATE_PATH is set, for the CLI; otherwise an
+    in-process store, which only suits a single worker.
+    """
+    global _shared_state
+
+    with _shared_state_lock:
+        if _shared_state is None:
+            redis_url = os.getenv("REDIS_URL")
+            if redis_url:
+                _shared_state = RedisSharedState(redis_url, prefix=os.getenv("REDIS_KEY_PREFIX", "flotunes:"))
+                logger.info("[SharedState] - Using Redis shared state")
+            elif os.getenv("SHARED_STATE_PATH"):
+                _shared_state = SqliteSharedState(os.getenv("SHARED_STATE_PATH"))
+                logger.info(f"[SharedState] - Using on-disk state at {os.getenv('SHARED_STATE_PATH')}")
+            else:
+                _shared_state = LocalSharedState(max_size=int(os.getenv("SHARED_STATE_LOCAL_MAX_SIZE", "100000")))
+                logger.info("[SharedState] - REDIS_URL not set, using in-process state (single worker only)")
+    return _shared_state
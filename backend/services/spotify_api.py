@@ -1,27 +1,175 @@
 import os
 import re
+import time
+import unicodedata
+import logging
+import threading
+import weakref
+import requests
 import spotipy
-from rich import print
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from spotipy.oauth2 import SpotifyOAuth
+from spotipy.cache_handler import CacheFileHandler
+from spotipy.exceptions import SpotifyException
 from dotenv import load_dotenv
-from typing import Optional, List, Dict, Any, Tuple
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, List, Dict, Any, Sequence, Tuple
 from backend.models.transfer import SpotifyTrack, YouTubeVideo, SongResult
-import logging
+from backend.models.candidate import TrackCandidate
+from backend.services.transfer_stats import TransferStatsCollector
+from backend.services.metrics import (
+    SPOTIFY_SEARCH_SECONDS,
+    SPOTIFY_SEARCHES_PER_VIDEO,
+    SPOTIFY_PLAYLIST_WRITE_SECONDS,
+    MATCHES_TOTAL,
+    FAILURES_TOTAL,
+    RATE_LIMITED_TOTAL,
+    TOPIC_FAST_PATH_TOTAL,
+)
+from backend.services.logger import get_logger, log_event
+from backend.services.search_strategy import TITLE_SEPARATORS, classify_title_shape, get_strategy_stats, topic_channel_artist
+from backend.services.match_cache import get_negative_cache, get_resolution_store, get_search_cache
+from backend.services.playlist_index import get_playlist_index
+from backend.services.transfer_progress import TransferProgress
+from backend.services.sharded_matching import get_sharded_matcher
+from backend.services.resilience import CircuitOpenError, UpstreamUnavailableError, get_search_caller
+from backend.services.spotify_scheduler import schedule_spotify, user_key
+from backend.services.shared_state import get_shared_state
+from backend.services.retry_policy import is_retryable_write, retry_call
 
 # Setup a logger instance for this module
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+logger = get_logger(__name__)
 
-# Add a basic console handler
-console_handler = logging.StreamHandler()
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
+load_dotenv()
 
-# Add handler only if not already added
-if not logger.handlers:
-    logger.addHandler(console_handler)
 
-load_dotenv()
+# Market to scope searches to; Spotify then omits the ~180-entry available_markets arrays.
+# "from_token" uses the user's own country. Set it empty to search without a market.
+SEARCH_MARKET = os.getenv("SPOTIFY_SEARCH_MARKET", "from_token") or None
+
+# Results requested per search; field-filtered queries are precise, so fewer are needed
+SEARCH_LIMIT = 10
+STRUCTURED_SEARCH_LIMIT = 3
+
+# Auto-generated "Artist - Topic" uploads try one artist+track query before the usual fan-out
+TOPIC_FAST_PATH = os.getenv("SPOTIFY_TOPIC_FAST_PATH", "true").lower() == "true"
+
+# Titles matched concurrently by api_match_titles() (the /spotify/match-batch endpoint)
+BATCH_MATCH_JOBS = int(os.getenv("SPOTIFY_BATCH_MATCH_JOBS", "8"))
+
+# Common YouTube noise removed from titles before searching
+NOISE_PATTERNS = [
+    r'\[.*?\]',              # [Official Video], [HD], [Lyrics]
+    r'\(.*?\)',              # (Official Video), (Lyrics), (Bass Boosted)
+    r'【.*?】',               # Japanese/Chinese brackets
+    r'\s*-\s*official.*',    # - Official Video, - Official Audio
+    r'\s*-\s*lyrics?.*',     # - Lyrics, - Lyric Video
+    r'\s*(bass\s*boosted|nightcore|remix|cover|acoustic|live).*',  # Modifications
+    r'\s*\|\s*.*',           # Everything after pipe |
+    r'\s*ft\.?\s*.*',        # Remove featuring artists for cleaner search
+    r'\s*feat\.?\s*.*',      # Remove featuring artists
+    r'\s*featuring\s*.*',    # Remove featuring artists
+]
+
+
+def record_spotify_error(error: Exception, stage: str) -> None:
+    """
+    Counts a failed Spotify call in the metrics, including 429 rate limiting.
+
+    Args:
+        error (Exception): The exception raised by the Spotify client.
+        stage (str): Pipeline stage label, e.g. "spotify_search" or "playlist_write".
+    """
+    FAILURES_TOTAL.inc(stage=stage)
+    if isinstance(error, SpotifyException) and error.http_status == 429:
+        RATE_LIMITED_TOTAL.inc(service="spotify")
+
+
+def _new_spotify(**kwargs) -> spotipy.Spotify:
+    """
+    Creates a Spotipy client whose HTTP session sends each request once.
+
+    Spotipy's own session resends 429 and 5xx replies, POSTs included. Retries
+    are left to retry_policy alone, which counts them against the transfer's
+    budget and never resends a write that may have been applied.
+    """
+    return spotipy.Spotify(requests_session=requests.Session(), **kwargs)
+
+
+# Spotify access tokens live an hour, so a token's user can be remembered that long
+SPOTIFY_PROFILE_TTL = 3600
+
+
+def _remember_profile(access_token: str, user_info: Dict[str, Any]) -> Dict[str, Any]:
+    profile = {"id": user_info["id"], "country": user_info.get("country")}
+    get_shared_state().set(f"spprofile:{user_key(access_token)}", profile, ttl=SPOTIFY_PROFILE_TTL)
+    return profile
+
+
+def get_spotify_profile(access_token: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the id and country of the user behind a Spotify access token.
+
+    The lookup is cached for the token's lifetime, so endpoints that are
+    polled (progress, song pages) don't call /me every time.
+
+    Args:
+        access_token (str): The user's Spotify access token.
+
+    Returns:
+        Optional[Dict[str, Any]]: {"id", "country"}, or None if the token is invalid.
+    """
+    profile = get_shared_state().get(f"spprofile:{user_key(access_token)}")
+    if profile is not None:
+        return profile
+
+    try:
+        return _remember_profile(access_token, _new_spotify(auth=access_token).current_user())
+    except Exception as e:
+        logger.info(f"[SpotifyAPI] - Token validation failed: {str(e)}")
+        return None
+
+
+# Country of the user behind each client, for the "from_token" market
+_client_markets: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+_client_markets_lock = threading.Lock()
+
+
+def resolve_search_market(sp: spotipy.Spotify) -> Optional[str]:
+    """
+    Returns the market a client's searches are filtered by, for keying the shared match caches.
+
+    Under "from_token" Spotify filters results by the user's country, so
+    users in different countries can get different tracks for the same
+    query and must not share cache entries. The country is looked up with
+    /me once per client.
+
+    Args:
+        sp (spotipy.Spotify): The client the searches are made with, scheduled or not.
+
+    Returns:
+        Optional[str]: A country code, "" when searches aren't scoped to a market,
+            or None if the user's country is unknown and nothing should be cached.
+    """
+    if SEARCH_MARKET != "from_token":
+        return SEARCH_MARKET or ""
+
+    client = getattr(sp, "client", sp)
+    market = _client_markets.get(client)
+    if market is not None:
+        return market
+
+    try:
+        country = sp.current_user().get("country")
+    except Exception as e:
+        logger.warning(f"[SpotifyAPI] - Could not look up the user's country: {e}")
+        return None
+    if not country:
+        return None
+
+    with _client_markets_lock:
+        _client_markets[client] = country
+    return country
 
 
 def get_spotify_client_with_token(access_token: str) -> spotipy.Spotify:
@@ -38,11 +186,12 @@ def get_spotify_client_with_token(access_token: str) -> spotipy.Spotify:
         logger.info(f"[SpotifyAPI] - Creating client with user access token")
         
         # Create Spotify client with user's access token
-        sp = spotipy.Spotify(auth=access_token)
+        sp = _new_spotify(auth=access_token)
         
         # Test the token by getting current user info
         try:
             user_info = sp.current_user()
+            _remember_profile(access_token, user_info)
             logger.info(f"[SpotifyAPI] - Successfully authenticated user: {user_info['display_name']} ({user_info['id']})")
             return sp
         except Exception as e:
@@ -53,10 +202,77 @@ def get_spotify_client_with_token(access_token: str) -> spotipy.Spotify:
         logger.info(f"[SpotifyAPI] - Failed to create Spotify client: {str(e)}")
 
 
+@dataclass(frozen=True)
+class SpotifyTokenClientFactory:
+    """
+    Picklable recipe for a Spotify client authenticated with a user's access token.
+
+    Passed to worker processes instead of the client itself, which holds an
+    HTTP session and cannot be pickled. The token was already validated by
+    get_spotify_client_with_token(), so building the client makes no call.
+    The client goes through the worker's fair-share scheduler, like the
+    transfer's own client does in the web process.
+    """
+    access_token: str
+
+    def __call__(self) -> spotipy.Spotify:
+        return schedule_spotify(_new_spotify(auth=self.access_token), self.access_token)
+
+
+class _MemoizedCacheFileHandler(CacheFileHandler):
+    """
+    Token cache file that is read from disk once and then served from memory.
+
+    SpotifyOAuth reads its cache on every request; with a pooled client that
+    is a file read per search. Refreshed tokens are still written through.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._token_info = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def get_cached_token(self):
+        with self._lock:
+            if not self._loaded:
+                self._token_info = super().get_cached_token()
+                self._loaded = True
+            return self._token_info
+
+    def save_token_to_cache(self, token_info):
+        with self._lock:
+            self._token_info = token_info
+            self._loaded = True
+        super().save_token_to_cache(token_info)
+
+
+def _build_spotify_client(scope: str) -> spotipy.Spotify:
+    """
+    Creates a new Spotipy client for the server's own account, with its own OAuth manager and HTTP session.
+    """
+    return _new_spotify(auth_manager=SpotifyOAuth(
+        client_id=os.getenv("SPOTIFY_CLIENT_ID"),
+        client_secret=os.getenv("SPOTIFY_CLIENT_SECRET"),
+        redirect_uri=os.getenv("SPOTIFY_REDIRECT_URI"),
+        scope=scope,
+        cache_handler=_MemoizedCacheFileHandler(),
+    ))
+
+
+# One client per scope, shared by every request of the process
+_pooled_clients: Dict[str, spotipy.Spotify] = {}
+_pooled_clients_lock = threading.Lock()
+
+
 def get_spotify_client(scope: str = None) -> spotipy.Spotify:
     """
     Authenticates and returns a Spotipy client instance.
 
+    The client is created once per scope and reused by every caller in the
+    process: its OAuth manager keeps the token in memory (refreshing it when
+    it expires) and its HTTP session keeps connections to Spotify open.
+
     Args:
         scope (str): The Spotify OAuth scopes as a space-separated string.
 
@@ -67,35 +283,45 @@ def get_spotify_client(scope: str = None) -> spotipy.Spotify:
     if scope is None:
         scope = os.getenv("SPOTIFY_SCOPE")
 
-    sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
-        client_id=os.getenv("SPOTIFY_CLIENT_ID"),
-        client_secret=os.getenv("SPOTIFY_CLIENT_SECRET"),
-        redirect_uri=os.getenv("SPOTIFY_REDIRECT_URI"),
-        scope=scope
-    ))
+    with _pooled_clients_lock:
+        sp = _pooled_clients.get(scope or "")
+        if sp is None:
+            sp = _build_spotify_client(scope)
+            _pooled_clients[scope or ""] = sp
 
     return sp
 
 
-def api_get_existing_playlist_id(sp: spotipy.Spotify, user_id: str, name: str) -> str | None:
+def api_get_existing_playlist_id(
+    sp: spotipy.Spotify,
+    user_id: str,
+    name: str,
+    stats: Optional[TransferStatsCollector] = None
+) -> str | None:
     """
     Checks if a playlist with the given name already exists.
 
     Args:
         sp (spotipy.Spotify): Authenticated Spotify client.
-        user_id (str): id of the user
+        user_id (str): id of the user (looked up if not given)
         name (str): The name of the playlist to look for.
+        stats (Optional[TransferStatsCollector]): Per-transfer stats to count API calls in.
 
     Returns:
         str | None: The ID of the playlist if found, otherwise None.
     """
 
-    user_id = sp.me()["id"]
+    if not user_id:
+        user_id = sp.me()["id"]
+        if stats:
+            stats.count_call("playlist_setup")
     limit = 10
     offset = 0
 
     while True:
         playlists = sp.current_user_playlists(limit=limit, offset=offset)
+        if stats:
+            stats.count_call("playlist_setup")
         for playlist in playlists["items"]:
             if playlist["name"].lower() == name.lower() and playlist["owner"]["id"] == user_id:
                 return playlist["id"]
@@ -108,7 +334,13 @@ def api_get_existing_playlist_id(sp: spotipy.Spotify, user_id: str, name: str) -
     return None
 
 
-def api_create_playlist(sp: spotipy.Spotify, name: str, isPublic: bool = True, description: str = "") -> Dict[str, Any]:
+def api_create_playlist(
+    sp: spotipy.Spotify,
+    name: str,
+    isPublic: bool = True,
+    description: str = "",
+    stats: Optional[TransferStatsCollector] = None
+) -> Dict[str, Any]:
     """
     Creates a new playlist or reuses existing one with same name.
 
@@ -117,22 +349,68 @@ def api_create_playlist(sp: spotipy.Spotify, name: str, isPublic: bool = True, d
         name (str): The name of the playlist.
         isPublic (bool): access level of the playlist
         description (str): (Optional) Description for the playlist.
+        stats (Optional[TransferStatsCollector]): Per-transfer stats to count API calls in.
 
     Returns:
         Dict[str, Any]: Complete playlist object with id, url, etc.
     """
 
     user_id = sp.me()["id"] 
-    existing_id = api_get_existing_playlist_id(sp, user_id, name)
+    if stats:
+        stats.count_call("playlist_setup")
+    
+    # A playlist this user transferred into before is fetched directly instead of scanning their library
+    playlist_index = get_playlist_index()
+    indexed_id = playlist_index.get(user_id, name)
+    if indexed_id:
+        try:
+            playlist = sp.playlist(indexed_id)
+        except SpotifyException as e:
+            logger.info(f"[SpotifyAPI] - Indexed playlist {indexed_id} is gone ({e.http_status}), scanning instead")
+            playlist = None
+        finally:
+            if stats:
+                stats.count_call("playlist_setup")
+        if playlist and playlist["name"].lower() == name.lower() and playlist["owner"]["id"] == user_id:
+            # Spotify keeps serving deleted (unfollowed) playlists by ID, so also check it's still in the library
+            try:
+                following = sp.playlist_is_following(indexed_id, [user_id])[0]
+            except SpotifyException as e:
+                logger.info(f"[SpotifyAPI] - Could not check follow state of {indexed_id} ({e.http_status}), scanning instead")
+                following = False
+            finally:
+                if stats:
+                    stats.count_call("playlist_setup")
+            if following:
+                logger.info(f"[SpotifyAPI] - Playlist '{name}' already exists. Using existing playlist.")
+                return playlist
+        playlist_index.discard(user_id, name)
+    
+    existing_id = api_get_existing_playlist_id(sp, user_id, name, stats=stats)
     
     if existing_id:
-        print(f"[bold yellow]Playlist '{name}' already exists. Using existing playlist.[/bold yellow]\n")
+        logger.info(f"[SpotifyAPI] - Playlist '{name}' already exists. Using existing playlist.")
         # Get the full playlist object
         playlist = sp.playlist(existing_id)
+        if stats:
+            stats.count_call("playlist_setup")
+        playlist_index.put(user_id, name, existing_id)
         return playlist
 
+    def create_once() -> Dict[str, Any]:
+        with SPOTIFY_PLAYLIST_WRITE_SECONDS.time(operation="create"):
+            return sp.user_playlist_create(user=user_id, name=name, public=isPublic, description=description)
+
     # Create the playlist
-    new_playlist = sp.user_playlist_create(user=user_id, name=name, public=isPublic, description=description)
+    try:
+        new_playlist = retry_call(create_once, "playlist_setup", stats, retryable=is_retryable_write)
+    except Exception as e:
+        record_spotify_error(e, stage="playlist_write")
+        raise
+    finally:
+        if stats:
+            stats.count_call("playlist_setup")
+    playlist_index.put(user_id, name, new_playlist["id"])
     return new_playlist
 
 
@@ -144,6 +422,7 @@ def generate_smart_search_queries(youtube_title: str) -> List[str]:
     "Tasha Cobbs - You Still Love Me [Official Video] (Bass Boosted)"
     
     And generates multiple search strategies:
+    0. 'track:"You still Love Me" artist:"Tasha Cobbs"'  # Field-filtered, when the title splits
     1. "Tasha Cobbs - You still Love Me [Official Video] (Bass Boosted)"  # Original
     2. "Tasha Cobbs - You still Love Me"  # Cleaned version
     3. "Tasha Cobbs You still Love Me"    # Artist + song format
@@ -156,38 +435,40 @@ def generate_smart_search_queries(youtube_title: str) -> List[str]:
         List[str]: List of search queries ordered by likelihood of success
     """
     
+    return [query for _, query in generate_labeled_search_queries(youtube_title)]
+
+
+def generate_labeled_search_queries(youtube_title: str) -> List[Tuple[str, str]]:
+    """
+    Same queries as generate_smart_search_queries(), each tagged with the strategy that produced it.
+    
+    The labels ("structured", "original", "cleaned", "artist_song", "song", "artist")
+    let the matcher learn which strategy tends to win for a given title shape.
+    
+    Args:
+        youtube_title (str): The original YouTube video title
+        
+    Returns:
+        List[Tuple[str, str]]: (strategy, query) pairs in the default order
+    """
+    
     queries = []
     title = youtube_title.strip()
     
-    # 1. Always try the original title first
-    queries.append(title)
+    # 1. Try the original title first (after the structured query, which is inserted below)
+    queries.append(("original", title))
     
     # 2. Remove common YouTube noise patterns
-    noise_patterns = [
-        r'\[.*?\]',              # [Official Video], [HD], [Lyrics]
-        r'\(.*?\)',              # (Official Video), (Lyrics), (Bass Boosted)
-        r'【.*?】',               # Japanese/Chinese brackets
-        r'\s*-\s*official.*',    # - Official Video, - Official Audio
-        r'\s*-\s*lyrics?.*',     # - Lyrics, - Lyric Video
-        r'\s*(bass\s*boosted|nightcore|remix|cover|acoustic|live).*',  # Modifications
-        r'\s*\|\s*.*',           # Everything after pipe |
-        r'\s*ft\.?\s*.*',        # Remove featuring artists for cleaner search
-        r'\s*feat\.?\s*.*',      # Remove featuring artists
-        r'\s*featuring\s*.*',    # Remove featuring artists
-    ]
-    
     clean_title = title
-    for pattern in noise_patterns:
+    for pattern in NOISE_PATTERNS:
         clean_title = re.sub(pattern, '', clean_title, flags=re.IGNORECASE)
     
     clean_title = clean_title.strip()
     if clean_title and clean_title != title:
-        queries.append(clean_title)
+        queries.append(("cleaned", clean_title))
     
     # 3. Try different splitting strategies
-    separators = [' - ', ' – ', ' — ', ' | ', ' • ', ': ']
-    
-    for sep in separators:
+    for sep in TITLE_SEPARATORS:
         if sep in title:
             parts = title.split(sep, 1)  # Only split on first occurrence
             if len(parts) >= 2:
@@ -195,34 +476,40 @@ def generate_smart_search_queries(youtube_title: str) -> List[str]:
                 song_part = parts[1].strip()
                 
                 # Clean the song part of noise
-                for pattern in noise_patterns:
+                for pattern in NOISE_PATTERNS:
                     song_part = re.sub(pattern, '', song_part, flags=re.IGNORECASE)
                 song_part = song_part.strip()
                 
                 if artist_part and song_part:
+                    # Field-filtered query goes first: a narrow, precise result list
+                    # (quotes inside the values would end the filter early)
+                    song_filter = song_part.replace('"', '')
+                    artist_filter = artist_part.replace('"', '')
+                    queries.insert(0, ("structured", f'track:"{song_filter}" artist:"{artist_filter}"'))
+                    
                     # Try "artist song" format (no separator)
                     artist_song = f"{artist_part} {song_part}"
-                    queries.append(artist_song)
+                    queries.append(("artist_song", artist_song))
                     
                     # Try just the song name
-                    queries.append(song_part)
+                    queries.append(("song", song_part))
                     
                     # Try just the artist name
-                    queries.append(artist_part)
+                    queries.append(("artist", artist_part))
             break
     
     # 4. Remove duplicates while preserving order
     seen = set()
     unique_queries = []
-    for query in queries:
+    for strategy, query in queries:
         if query.lower() not in seen and len(query.strip()) > 2:  # Minimum length check
             seen.add(query.lower())
-            unique_queries.append(query)
+            unique_queries.append((strategy, query))
     
     return unique_queries
 
 
-def calculate_match_confidence(youtube_title: str, spotify_track: Dict[str, Any]) -> float:
+def calculate_match_confidence(youtube_title: str, spotify_track: TrackCandidate | Dict[str, Any]) -> float:
     """
     Calculate confidence score (0.0 to 1.0) for how well a Spotify track matches a YouTube title.
     
@@ -242,7 +529,7 @@ def calculate_match_confidence(youtube_title: str, spotify_track: Dict[str, Any]
     
     Args:
         youtube_title (str): Original YouTube video title
-        spotify_track (Dict[str, Any]): Spotify track object from API
+        spotify_track (TrackCandidate | Dict[str, Any]): Search candidate, or a raw Spotify track object
         
     Returns:
         float: Confidence score between 0.0 and 1.0
@@ -252,9 +539,14 @@ def calculate_match_confidence(youtube_title: str, spotify_track: Dict[str, Any]
     youtube_lower = youtube_title.lower()
     
     # Get Spotify track data
-    spotify_name = spotify_track["name"].lower()
-    spotify_artists = [artist["name"].lower() for artist in spotify_track["artists"]]
-    spotify_album = spotify_track["album"]["name"].lower()
+    if isinstance(spotify_track, TrackCandidate):
+        spotify_name = spotify_track.name.lower()
+        spotify_artists = [artist.lower() for artist in spotify_track.artists]
+        spotify_album = spotify_track.album.lower()
+    else:
+        spotify_name = spotify_track["name"].lower()
+        spotify_artists = [artist["name"].lower() for artist in spotify_track["artists"]]
+        spotify_album = spotify_track["album"]["name"].lower()
     
     # 1. Song name matching (40% weight)
     if spotify_name in youtube_lower:
@@ -331,7 +623,36 @@ def calculate_match_confidence(youtube_title: str, spotify_track: Dict[str, Any]
     return max(0.0, min(1.0, confidence))
 
 
-def create_artist_string(artists: List[Dict[str, Any]]) -> str:
+def _normalize_name(name: str) -> str:
+    return re.sub(r"[\W_]+", " ", unicodedata.normalize("NFKC", name).casefold()).strip()
+
+
+def is_topic_match(youtube_title: str, topic_artist: str, candidate: TrackCandidate) -> bool:
+    """
+    Acceptance rule for "Artist - Topic" uploads, stricter than calculate_match_confidence().
+
+    The title of an auto-generated upload is the track name as distributed,
+    so the candidate must carry exactly that name (ignoring case and
+    punctuation) and list the channel's artist. "Essence (feat. Tems)" then
+    matches that release but not "Essence (feat. Justin Bieber & Tems)",
+    and a same-named song by another artist is never taken.
+
+    Args:
+        youtube_title (str): Title of the Topic upload.
+        topic_artist (str): Artist from the channel name, see topic_channel_artist().
+        candidate (TrackCandidate): Search result to check.
+
+    Returns:
+        bool: Whether the candidate is the uploaded track.
+    """
+    artist = _normalize_name(topic_artist)
+    return (
+        _normalize_name(candidate.name) == _normalize_name(youtube_title)
+        and any(_normalize_name(name) == artist for name in candidate.artists)
+    )
+
+
+def create_artist_string(artists: Sequence[str | Dict[str, Any]]) -> str:
     """
     Create a proper artist string from Spotify artists array.
     
@@ -341,7 +662,7 @@ def create_artist_string(artists: List[Dict[str, Any]]) -> str:
     - Multiple artists: "Tasha Cobbs feat. Cece Winans & Nathaniel Bassey"
     
     Args:
-        artists (List[Dict[str, Any]]): Spotify artists array
+        artists (Sequence[str | Dict[str, Any]]): Artist names (TrackCandidate.artists) or a Spotify artists array
         
     Returns:
         str: Formatted artist string
@@ -350,11 +671,13 @@ def create_artist_string(artists: List[Dict[str, Any]]) -> str:
     if not artists:
         return "Unknown Artist"
     
-    if len(artists) == 1:
-        return artists[0]["name"]
+    names = [artist if isinstance(artist, str) else artist["name"] for artist in artists]
     
-    primary_artist = artists[0]["name"]
-    featured_artists = [artist["name"] for artist in artists[1:]]
+    if len(names) == 1:
+        return names[0]
+    
+    primary_artist = names[0]
+    featured_artists = names[1:]
     
     if len(featured_artists) == 1:
         return f"{primary_artist} feat. {featured_artists[0]}"
@@ -363,138 +686,292 @@ def create_artist_string(artists: List[Dict[str, Any]]) -> str:
         return f"{primary_artist} feat. {featured_string}"
 
 
-def api_search_track_detailed(sp: spotipy.Spotify, youtube_video: YouTubeVideo) -> Optional[SpotifyTrack]:
+def _to_spotify_track(candidate: TrackCandidate) -> SpotifyTrack:
+    """
+    Creates the SpotifyTrack object with all the rich data from a compact candidate.
+    """
+    return SpotifyTrack(
+        track_id=candidate.track_id,
+        name=candidate.name,
+        artist=create_artist_string(candidate.artists),  # Handles multiple artists
+        album=candidate.album,
+        spotify_url=candidate.spotify_url,
+        thumbnail_url=candidate.thumbnail_url,    # Album art, largest size
+        preview_url=candidate.preview_url         # 30-second preview URL
+    )
+
+
+def api_search_track_detailed(
+    sp: spotipy.Spotify,
+    youtube_video: YouTubeVideo,
+    stats: Optional[TransferStatsCollector] = None
+) -> Optional[SpotifyTrack]:
     """
     Enhanced search for a song on Spotify using YouTube video data with confidence scoring.
     
+    Auto-generated "Artist - Topic" uploads first get a single field-filtered
+    query for the channel's artist and the exact title, accepted only under
+    is_topic_match(). Only if that finds nothing does the video go through
+    the steps below.
+
     This function:
     1. Generates multiple smart search queries from the YouTube title
     2. Searches Spotify with each query (gets multiple results, not just 1)
     3. Calculates confidence scores for each match
     4. Returns the best match above a minimum confidence threshold
     
+    Searches go through the resilient search caller: slow ones are hedged,
+    and while Spotify is failing its circuit breaker stops the search early.
+    A search that fails with a transient error is retried with backoff,
+    within the transfer's retry budget.
+
     Args:
         sp (spotipy.Spotify): The authenticated Spotify client.
         youtube_video (YouTubeVideo): YouTube video metadata for searching.
+        stats (Optional[TransferStatsCollector]): Per-transfer stats to record queries and early exits in.
 
     Returns:
         Optional[SpotifyTrack]: Best matching Spotify track if found with sufficient confidence, else None.
+
+    Raises:
+        UpstreamUnavailableError: Spotify failed before a match was found, so "not found" can't be told apart
+            from an outage. Nothing is cached; the video is worth retrying later.
     """
     
-    # Generate smart search queries
-    search_queries = generate_smart_search_queries(youtube_video.title)
+    # Cached verdicts and results only hold for the market they were searched in
+    market = resolve_search_market(sp)
+    cacheable = market is not None
+
+    # Videos that found nothing last time are failed straight away, without searching
+    negative_cache = get_negative_cache()
+    if cacheable and negative_cache.is_known_miss(youtube_video.video_id, youtube_video.title, market):
+        MATCHES_TOTAL.inc(result="unmatched")
+        if stats:
+            stats.record_video_search(0, early_exit=False)
+        log_event(logger, logging.DEBUG, "search.negative_cache_hit", video_id=youtube_video.video_id)
+        return None
+    
+    # Videos matched by an earlier transfer, on any worker, reuse that match
+    resolution_store = get_resolution_store()
+    resolution = resolution_store.get(youtube_video.video_id, youtube_video.title, market) if cacheable else None
+    if resolution:
+        track, confidence = resolution
+        MATCHES_TOTAL.inc(result="matched")
+        if stats:
+            stats.record_video_search(0, early_exit=confidence >= 0.9)
+        log_event(logger, logging.DEBUG, "search.resolution_hit", video_id=youtube_video.video_id, track_id=track.track_id)
+        return _to_spotify_track(track)
+    
+    # Generate smart search queries, ordered by how often each strategy wins for this kind of title
+    strategy_stats = get_strategy_stats()
+    title_shape = classify_title_shape(youtube_video.title, youtube_video.video_owner_channel)
+    generated_queries = generate_labeled_search_queries(youtube_video.title)
+    search_queries = strategy_stats.order(title_shape, generated_queries)
+    topic_artist = topic_channel_artist(youtube_video.video_owner_channel) if TOPIC_FAST_PATH else None
+    if topic_artist:
+        # The title is the track name, so one precise query usually settles it; the fan-out is the fallback
+        title_filter = youtube_video.title.strip().replace('"', '')
+        artist_filter = topic_artist.replace('"', '')
+        search_queries = [("topic", f'track:"{title_filter}" artist:"{artist_filter}"')] + search_queries
     
     best_match = None
     best_confidence = 0.0
+    best_strategy = None
     minimum_confidence = 0.6  # Only accept matches with 60%+ confidence
+    searches = 0
+    search_errors = 0
+    circuit_open = False
+    attempted = []
+    search_cache = get_search_cache()
+    search_caller = get_search_caller()
     
-    print(f"[cyan]Searching for: {youtube_video.title}[/cyan]")
-    print(f"[dim]Search strategies: {search_queries[:3]}...[/dim]")  # Show first 3
+    log_event(
+        logger, logging.DEBUG, "search.start",
+        video_id=youtube_video.video_id, title=youtube_video.title, shape=title_shape,
+        strategies=[strategy for strategy, _ in search_queries]
+    )
     
-    for query_index, query in enumerate(search_queries):
+    for query_index, (strategy, query) in enumerate(search_queries):
         try:
             # Search Spotify - get multiple results for better matching
-            results = sp.search(q=query, limit=10, type="track")  # Get top 10 instead of 1
-            tracks = results.get('tracks', {}).get('items', [])
+            limit = STRUCTURED_SEARCH_LIMIT if strategy in ("structured", "topic") else SEARCH_LIMIT
+            tracks = search_cache.get(query, limit, market) if cacheable else None
+            if tracks is None:
+                searches += 1
+
+                def search_once() -> dict:
+                    # Timed per try, so the histogram measures upstream calls and not the backoff between them
+                    with SPOTIFY_SEARCH_SECONDS.time():
+                        return search_caller.call(lambda: sp.search(q=query, limit=limit, type="track", market=SEARCH_MARKET))
+
+                results = retry_call(search_once, "search", stats)
+                # Keep compact candidates only; the raw response is dropped right here
+                tracks = [TrackCandidate.from_spotify(item) for item in results.get('tracks', {}).get('items', []) if item]
+                if cacheable:
+                    search_cache.put(query, limit, market, tracks)
+            # Failed searches say nothing about the strategy, so only count answered ones
+            attempted.append(strategy)
             
             if not tracks:
                 continue
             
+            if strategy == "topic":
+                topic_match = next((track for track in tracks if is_topic_match(youtube_video.title, topic_artist, track)), None)
+                if topic_match:
+                    best_match, best_confidence, best_strategy = topic_match, 1.0, strategy
+                    break
+                continue
+            
             # Evaluate each track from this search
             for track in tracks:
                 confidence = calculate_match_confidence(youtube_video.title, track)
                 
                 # Debug logging for first few tracks
-                if query_index == 0:  # Only log for first query to avoid spam
-                    track_name = track["name"]
-                    artist_name = track["artists"][0]["name"]
-                    print(f"[dim]  → {artist_name} - {track_name} (confidence: {confidence:.2f})[/dim]")
+                if query_index == 0 and logger.isEnabledFor(logging.DEBUG):  # Only log for first query to avoid spam
+                    log_event(
+                        logger, logging.DEBUG, "search.candidate",
+                        video_id=youtube_video.video_id, track_id=track.track_id, confidence=round(confidence, 2)
+                    )
                 
                 # Keep track of the best match
                 if confidence > best_confidence and confidence >= minimum_confidence:
                     best_confidence = confidence
                     best_match = track
+                    best_strategy = strategy
                     
                     # If we found a very high confidence match, stop searching
                     if confidence >= 0.9:
-                        print(f"[green] High confidence match found: {confidence:.2f}[/green]")
                         break
             
             # If we found a very high confidence match, stop all searches
             if best_confidence >= 0.9:
                 break
+            
+            # A field-filtered hit is already artist- and title-checked; free text is only the fallback
+            if strategy == "structured" and best_strategy == "structured":
+                break
                 
+        except CircuitOpenError:
+            # Spotify is failing: stop instead of burning the remaining strategies
+            circuit_open = True
+            break
         except Exception as e:
-            print(f"[red]Search failed for query '{query}': {e}[/red]")
+            search_errors += 1
+            record_spotify_error(e, stage="spotify_search")
+            logger.warning(f"[SpotifyAPI] - Search failed for query '{query}': {e}")
             continue
     
+    # Without a match, an outage isn't a verdict: report it instead of "not found"
+    if not best_match and (circuit_open or (search_errors and not attempted)):
+        MATCHES_TOTAL.inc(result="unavailable")
+        if stats:
+            stats.count_call("search", searches)
+        log_event(logger, logging.INFO, "search.unavailable", video_id=youtube_video.video_id, searches=searches)
+        raise UpstreamUnavailableError("Spotify search is unavailable")
+    
+    if "topic" in attempted:
+        TOPIC_FAST_PATH_TOTAL.inc(result="hit" if best_strategy == "topic" else "miss")
+    # The fast path isn't one of the learned strategies
+    strategy_stats.record(
+        title_shape,
+        [strategy for strategy in attempted if strategy != "topic"],
+        best_strategy if best_strategy != "topic" else None
+    )
+    SPOTIFY_SEARCHES_PER_VIDEO.observe(searches)
+    MATCHES_TOTAL.inc(result="matched" if best_match else "unmatched")
+    if stats:
+        stats.count_call("search", searches)
+        stats.record_video_search(searches, early_exit=best_confidence >= 0.9)
+    
     if best_match:
-        # Extract thumbnail (album art) - prefer larger images
-        thumbnail_url = None
-        if best_match["album"]["images"]:
-            # Images are sorted by size (largest first)
-            thumbnail_url = best_match["album"]["images"][0]["url"]
+        if cacheable:
+            resolution_store.put(youtube_video.video_id, youtube_video.title, best_match, best_confidence, market)
+        spotify_track = _to_spotify_track(best_match)
         
-        # Create SpotifyTrack object with all the rich data
-        spotify_track = SpotifyTrack(
-            track_id=best_match["id"],
-            name=best_match["name"],
-            artist=create_artist_string(best_match["artists"]),  # Handles multiple artists
-            album=best_match["album"]["name"],
-            spotify_url=best_match["external_urls"]["spotify"],
-            thumbnail_url=thumbnail_url,
-            preview_url=best_match.get("preview_url")  # 30-second preview URL
+        log_event(
+            logger, logging.DEBUG, "search.match",
+            video_id=youtube_video.video_id, track_id=best_match.track_id,
+            confidence=round(best_confidence, 2), searches=searches, strategy=best_strategy
         )
         
-        artist_name = best_match["artists"][0]["name"]
-        print(f"[green]✅ Found: {artist_name} - {best_match['name']} (confidence: {best_confidence:.2f})[/green]")
-        
         return spotify_track
     else:
-        print(f"[red]❌ No match found above {minimum_confidence} confidence threshold[/red]")
+        log_event(
+            logger, logging.DEBUG, "search.no_match",
+            video_id=youtube_video.video_id, threshold=minimum_confidence, searches=searches
+        )
+        # Only a clean miss is remembered: a failed search, or a strategy the stats skipped, may have hidden the match
+        if cacheable and not search_errors and {strategy for strategy, _ in generated_queries} <= set(attempted):
+            negative_cache.add_miss(youtube_video.video_id, youtube_video.title, market)
         return None
 
 
-def api_process_videos_to_songs(
+def api_match_video(
+    sp: spotipy.Spotify,
+    youtube_video: YouTubeVideo,
+    stats: Optional[TransferStatsCollector] = None
+) -> Optional[SpotifyTrack] | UpstreamUnavailableError:
+    """
+    Matches one video like api_search_track_detailed(), but returns an outage instead of raising it,
+    so one video that couldn't be searched doesn't abort the rest of a batch.
+    """
+    try:
+        return api_search_track_detailed(sp, youtube_video, stats=stats)
+    except UpstreamUnavailableError as e:
+        return e
+
+
+def api_match_videos(
     sp: spotipy.Spotify,
     youtube_videos: List[YouTubeVideo],
-    playlist_id: str
+    stats: Optional[TransferStatsCollector] = None,
+    progress: Optional[TransferProgress] = None,
+    client_factory: Optional[Callable[[], spotipy.Spotify]] = None,
+    jobs: int = 1
 ) -> List[SongResult]:
     """
-    Process all YouTube videos, search for them on Spotify, and create detailed song results.
-    
-    This is the main orchestrator function that:
-    1. Takes a list of YouTube videos from a playlist
-    2. For each video, tries to find a matching song on Spotify
-    3. Creates a SongResult object with all the metadata
-    4. Batches successful Spotify track IDs and adds them to the playlist
-    5. Returns a complete list of results for the frontend
-    
+    Searches every YouTube video on Spotify and creates detailed song results, without writing any playlist.
+
     Args:
         sp (spotipy.Spotify): The authenticated Spotify client.
-        youtube_videos (List[YouTubeVideo]): List of YouTube videos to process.
-        playlist_id (str): Spotify playlist ID where successful matches will be added.
+        youtube_videos (List[YouTubeVideo]): List of YouTube videos to match.
+        stats (Optional[TransferStatsCollector]): Per-transfer stats for the search stage.
+        progress (Optional[TransferProgress]): Progress publisher to report each searched video to.
+        client_factory (Optional[Callable[[], spotipy.Spotify]]): Picklable client recipe; when given,
+            large playlists are matched on the sharded worker pool (see ShardedMatcher).
+        jobs (int): Number of videos searched concurrently on threads when not sharded.
 
     Returns:
-        List[SongResult]: Complete list of song results with success/failure status and metadata.
+        List[SongResult]: One result per video, in playlist order, with success/failure status and metadata.
     """
     
     song_results = []
-    successful_track_ids = []
     
     total_videos = len(youtube_videos)
-    print(f"[bold blue] Processing {total_videos} videos...[/bold blue]")
+    logger.info(f"[SpotifyAPI] - Processing {total_videos} videos...")
     
-    for index, youtube_video in enumerate(youtube_videos):
-        print(f"\n[bold] [{index + 1}/{total_videos}][/bold]")
-        
-        # Search for the track on Spotify using our enhanced search
-        spotify_track = api_search_track_detailed(sp, youtube_video)
+    search_started = time.perf_counter()
+    sharded_matcher = get_sharded_matcher()
+    if client_factory and sharded_matcher.should_shard(total_videos):
+        # Very large playlists are split into chunks and matched by worker processes
+        spotify_tracks = sharded_matcher.match(client_factory, youtube_videos, stats=stats, progress=progress)
+    else:
+        def match_one(youtube_video: YouTubeVideo) -> Optional[SpotifyTrack] | UpstreamUnavailableError:
+            # Search for the track on Spotify using our enhanced search
+            spotify_track = api_match_video(sp, youtube_video, stats=stats)
+            if progress:
+                progress.video_done(matched=isinstance(spotify_track, SpotifyTrack))
+            return spotify_track
         
-        if spotify_track:
+        if jobs > 1:
+            with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="match") as pool:
+                spotify_tracks = list(pool.map(match_one, youtube_videos))
+        else:
+            spotify_tracks = [match_one(youtube_video) for youtube_video in youtube_videos]
+    
+    for index, (youtube_video, spotify_track) in enumerate(zip(youtube_videos, spotify_tracks)):
+        if isinstance(spotify_track, SpotifyTrack):
             # ✅ SUCCESS - Found matching song on Spotify
-            successful_track_ids.append(spotify_track.track_id)
-            
             song_result = SongResult(
                 id=f"song_{index}",
                 title=spotify_track.name,                    # Clean Spotify title
@@ -503,11 +980,25 @@ def api_process_videos_to_songs(
                 thumbnail=spotify_track.thumbnail_url,       # Album artwork
                 status="success",
                 spotify_url=spotify_track.spotify_url,       # Individual track URL
+                spotify_track_id=spotify_track.track_id,     # What gets written to the playlist
                 youtube_url=youtube_video.youtube_url,       # Original YouTube URL
                 original_youtube_title=youtube_video.title,  # Original messy title
                 spotify_match_confidence=0.8  # Could store actual confidence from search
             )
             
+        elif isinstance(spotify_track, UpstreamUnavailableError):
+            # ⚠️ NOT SEARCHED - Spotify was failing, so a later transfer may still match it
+            song_result = SongResult(
+                id=f"song_{index}",
+                title=youtube_video.title,
+                artist="Unknown Artist",
+                thumbnail=youtube_video.thumbnail_url,
+                status="failed",
+                youtube_url=youtube_video.youtube_url,
+                error="Spotify was unavailable, so this song wasn't searched. Try again later.",
+                original_youtube_title=youtube_video.title
+            )
+            
         else:
             # ❌ FAILED - Not found on Spotify
             song_result = SongResult(
@@ -523,27 +1014,124 @@ def api_process_videos_to_songs(
         
         song_results.append(song_result)
     
-    # Batch add all successful tracks to the Spotify playlist
-    if successful_track_ids:
-        print(f"\n[bold green]Adding {len(successful_track_ids)} tracks to playlist...[/bold green]")
-        api_add_tracks_to_playlist(sp, playlist_id, successful_track_ids)
-        print(f"[green]Successfully added tracks to playlist![/green]")
-    else:
-        print(f"[yellow]⚠️ No tracks to add to playlist[/yellow]")
+    if stats:
+        stats.add_wall_time("search", time.perf_counter() - search_started)
     
     # Summary
-    successful_count = len(successful_track_ids)
+    successful_count = sum(1 for song in song_results if song.status == "success")
     failed_count = total_videos - successful_count
     success_rate = (successful_count / total_videos * 100) if total_videos > 0 else 0
     
-    print(f"\n[bold]PROCESSING COMPLETE[/bold]")
-    print(f"[green]Successful matches: {successful_count}[/green]")
-    print(f"[red]Failed matches: {failed_count}[/red]")
-    print(f"[blue]Success rate: {success_rate:.1f}%[/blue]")
+    log_event(
+        logger, logging.INFO, "processing.complete",
+        matched=successful_count, failed=failed_count, success_rate=round(success_rate, 1)
+    )
+    
+    return song_results
+
+
+def api_write_matched_songs(
+    sp: spotipy.Spotify,
+    playlist_id: str,
+    song_results: List[SongResult],
+    stats: Optional[TransferStatsCollector] = None,
+    progress: Optional[TransferProgress] = None
+) -> None:
+    """
+    Adds the matched songs to a Spotify playlist, in playlist order.
+
+    Args:
+        sp (spotipy.Spotify): The authenticated Spotify client.
+        playlist_id (str): Spotify playlist ID where successful matches will be added.
+        song_results (List[SongResult]): Results from api_match_videos().
+        stats (Optional[TransferStatsCollector]): Per-transfer stats for the playlist_add stage.
+        progress (Optional[TransferProgress]): Progress publisher to report the stage to.
+    """
+    successful_track_ids = [
+        song.spotify_track_id for song in song_results if song.status == "success" and song.spotify_track_id
+    ]
+    
+    # Batch add all successful tracks to the Spotify playlist
+    if successful_track_ids:
+        logger.info(f"[SpotifyAPI] - Adding {len(successful_track_ids)} tracks to playlist...")
+        if progress:
+            progress.start_stage("playlist_add")
+        add_started = time.perf_counter()
+        api_add_tracks_to_playlist(sp, playlist_id, successful_track_ids, stats=stats)
+        if stats:
+            stats.add_wall_time("playlist_add", time.perf_counter() - add_started)
+    else:
+        logger.info("[SpotifyAPI] - No tracks to add to playlist")
+
+
+def api_process_videos_to_songs(
+    sp: spotipy.Spotify,
+    youtube_videos: List[YouTubeVideo],
+    playlist_id: str,
+    stats: Optional[TransferStatsCollector] = None,
+    progress: Optional[TransferProgress] = None,
+    client_factory: Optional[Callable[[], spotipy.Spotify]] = None
+) -> List[SongResult]:
+    """
+    Process all YouTube videos, search for them on Spotify, and create detailed song results.
     
+    This is the main orchestrator function that:
+    1. Takes a list of YouTube videos from a playlist
+    2. For each video, tries to find a matching song on Spotify
+    3. Creates a SongResult object with all the metadata
+    4. Batches successful Spotify track IDs and adds them to the playlist
+    5. Returns a complete list of results for the frontend
+    
+    Args:
+        sp (spotipy.Spotify): The authenticated Spotify client.
+        youtube_videos (List[YouTubeVideo]): List of YouTube videos to process.
+        playlist_id (str): Spotify playlist ID where successful matches will be added.
+        stats (Optional[TransferStatsCollector]): Per-transfer stats for the search and playlist_add stages.
+        progress (Optional[TransferProgress]): Progress publisher to report each searched video to.
+        client_factory (Optional[Callable[[], spotipy.Spotify]]): Picklable client recipe; when given,
+            large playlists are matched on the sharded worker pool (see ShardedMatcher).
+
+    Returns:
+        List[SongResult]: Complete list of song results with success/failure status and metadata.
+    """
+    song_results = api_match_videos(sp, youtube_videos, stats=stats, progress=progress, client_factory=client_factory)
+    api_write_matched_songs(sp, playlist_id, song_results, stats=stats, progress=progress)
     return song_results
 
 
+def api_match_titles(
+    sp: spotipy.Spotify,
+    titles: List[str],
+    jobs: Optional[int] = None
+) -> Iterator[Tuple[int, Optional[SpotifyTrack] | UpstreamUnavailableError]]:
+    """
+    Matches bare song titles with the detailed scorer, `jobs` at a time, yielding each as soon as it is done.
+
+    Titles go through the same caches as playlist videos, keyed by the title
+    alone, so a title matched once is answered without searching.
+
+    Args:
+        sp (spotipy.Spotify): The authenticated Spotify client.
+        titles (List[str]): Song or video titles to match.
+        jobs (Optional[int]): Number of titles searched concurrently; defaults to SPOTIFY_BATCH_MATCH_JOBS.
+
+    Yields:
+        Tuple[int, Optional[SpotifyTrack] | UpstreamUnavailableError]: Index of the title in `titles` and its
+            match (see api_match_video), in completion order.
+    """
+    pool = ThreadPoolExecutor(max_workers=max(jobs or BATCH_MATCH_JOBS, 1), thread_name_prefix="batch-match")
+    try:
+        futures = {
+            pool.submit(api_match_video, sp, YouTubeVideo(video_id="", title=title, youtube_url="")): index
+            for index, title in enumerate(titles)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # Stop queued searches if the caller gives up early, e.g. a client disconnects mid-stream
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 # Legacy functions for backward compatibility
 def api_search_track(sp: spotipy.Spotify, title: str) -> str | None:
     """
@@ -566,7 +1154,12 @@ def api_search_track(sp: spotipy.Spotify, title: str) -> str | None:
     return None
 
 
-def api_add_tracks_to_playlist(sp: spotipy.Spotify, playlist_id: str, track_ids: list[str]) -> None:
+def api_add_tracks_to_playlist(
+    sp: spotipy.Spotify,
+    playlist_id: str,
+    track_ids: list[str],
+    stats: Optional[TransferStatsCollector] = None
+) -> None:
     """
     Adds a list of track IDs to a specified Spotify playlist in batches.
 
@@ -574,15 +1167,29 @@ def api_add_tracks_to_playlist(sp: spotipy.Spotify, playlist_id: str, track_ids:
         sp (spotipy.Spotify): The authenticated Spotify client.
         playlist_id (str): The ID of the target playlist.
         track_ids (list[str]): A list of Spotify track IDs to add.
+        stats (Optional[TransferStatsCollector]): Per-transfer stats to count API calls in.
     """
 
-    # Remove duplicates and None values
-    track_ids = list(filter(None, set(track_ids)))
+    # Remove duplicates and None values, keeping the first occurrence so the playlist order is kept
+    track_ids = list(dict.fromkeys(filter(None, track_ids)))
 
     # Add in batches of 100 (Spotify API limit)
     for i in range(0, len(track_ids), 100):
         batch = track_ids[i:i + 100]
-        sp.playlist_add_items(playlist_id, batch)
+
+        def add_once() -> None:
+            with SPOTIFY_PLAYLIST_WRITE_SECONDS.time(operation="add_items"):
+                sp.playlist_add_items(playlist_id, batch)
+
+        try:
+            # Only retried when the write certainly wasn't applied, so no track is added twice
+            retry_call(add_once, "playlist_add", stats, retryable=is_retryable_write)
+        except Exception as e:
+            record_spotify_error(e, stage="playlist_write")
+            raise
+        finally:
+            if stats:
+                stats.count_call("playlist_add")
 
     return
 
@@ -596,6 +1203,9 @@ def api_add_tracks_from_titles(
     Legacy function for backward compatibility.
     Searches for each title and adds matching tracks to the playlist.
 
+    Titles are matched concurrently with the detailed scorer (see api_match_titles);
+    new callers should use the streaming /spotify/match-batch endpoint instead.
+
     Args:
         sp (spotipy.Spotify): The authenticated Spotify client.
         playlist_id (str): The Spotify playlist ID.
@@ -604,15 +1214,12 @@ def api_add_tracks_from_titles(
     Returns:
         dict: Summary with added track IDs and unmatched titles.
     """
-    track_ids = []
-    unmatched_titles = []
+    matches = [None] * len(titles)
+    for index, spotify_track in api_match_titles(sp, titles):
+        matches[index] = spotify_track
 
-    for title in titles:
-        track_id = api_search_track(sp, title)
-        if track_id:
-            track_ids.append(track_id)
-        else:
-            unmatched_titles.append(title)
+    track_ids = [spotify_track.track_id for spotify_track in matches if isinstance(spotify_track, SpotifyTrack)]
+    unmatched_titles = [title for title, spotify_track in zip(titles, matches) if not isinstance(spotify_track, SpotifyTrack)]
 
     if track_ids:
         api_add_tracks_to_playlist(sp, playlist_id, track_ids)
@@ -0,0 +1,254 @@
+# backend/services/spotify_scheduler.py
+
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+import spotipy
+from backend.services.metrics import SPOTIFY_SCHEDULER_QUEUE_DEPTH, SPOTIFY_SCHEDULER_WAIT_SECONDS
+
+
+def user_key(access_token: str) -> str:
+    """
+    Short, stable scheduling key for the user behind a Spotify access token. The token itself is never kept.
+    """
+    return hashlib.sha256(access_token.encode("utf-8")).hexdigest()[:12]
+
+
+class _Ticket:
+    __slots__ = ("cost", "granted")
+
+    def __init__(self, cost: float):
+        self.cost = cost
+        self.granted = False
+
+
+class FairShareScheduler:
+    """
+    Shares the app's Spotify capacity fairly between users.
+
+    Every Spotify call first takes a ticket. Tickets are granted by deficit
+    round-robin over per-user queues: each user with queued calls gets
+    `quantum` calls' worth of credit per round. A user with 5,000 searches
+    queued therefore gets the same share as a user with 20, and the small
+    transfer finishes in about 20 rounds instead of waiting behind the big
+    one.
+
+    Capacity comes from two limits. A token bucket caps the request rate at
+    `rate` calls per second (bursting up to `burst`), for the app's rate
+    limit. A cap of `max_in_flight` limits concurrent calls. The scheduler
+    only orders calls when one of these limits is reached; otherwise calls
+    go straight through. Limits are per process.
+
+    Queue depth per user is exported as flotunes_spotify_scheduler_queue_depth.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        rate: float = 0.0,
+        burst: float = 10.0,
+        max_in_flight: int = 16,
+        quantum: float = 1.0,
+    ):
+        """
+        Args:
+            enabled (bool): When False, calls are never held back.
+            rate (float): Calls per second for the whole process; 0 for no rate limit.
+            burst (float): Calls that may be sent at once after an idle period.
+            max_in_flight (int): Concurrent calls for the whole process; 0 for no limit.
+            quantum (float): Calls each waiting user may make per round.
+        """
+        self.enabled = enabled
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.quantum = quantum
+
+        self._cond = threading.Condition()
+        self._queues: Dict[str, Deque[_Ticket]] = {}
+        self._deficits: Dict[str, float] = {}
+        self._active: Deque[str] = deque()
+        self._in_flight = 0
+        self._tokens = burst
+        self._refilled_at = time.monotonic()
+
+    @classmethod
+    def from_env(cls) -> "FairShareScheduler":
+        """
+        Builds the scheduler from the SPOTIFY_SCHEDULER_* environment variables.
+        """
+        return cls(
+            enabled=os.getenv("SPOTIFY_SCHEDULER_ENABLED", "true").lower() == "true",
+            rate=float(os.getenv("SPOTIFY_SCHEDULER_RATE", "0")),
+            burst=float(os.getenv("SPOTIFY_SCHEDULER_BURST", "10")),
+            max_in_flight=int(os.getenv("SPOTIFY_SCHEDULER_MAX_IN_FLIGHT", "16")),
+            quantum=float(os.getenv("SPOTIFY_SCHEDULER_QUANTUM", "1")),
+        )
+
+    def _refill(self) -> None:
+        if not self.rate:
+            return
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _has_capacity(self, cost: float) -> bool:
+        if self.max_in_flight and self._in_flight >= self.max_in_flight:
+            return False
+        return not self.rate or self._tokens >= cost
+
+    def _dispatch(self) -> None:
+        """
+        Grants queued tickets in deficit round-robin order while there is capacity. Caller holds the lock.
+        """
+        self._refill()
+        granted = False
+        while self._active:
+            user = self._active[0]
+            queue = self._queues[user]
+            ticket = queue[0]
+            if self._deficits[user] < ticket.cost:
+                # A new round for this user: top up its credit, or move on if still short
+                self._deficits[user] += self.quantum
+                if self._deficits[user] < ticket.cost:
+                    self._active.rotate(-1)
+                    continue
+            if not self._has_capacity(ticket.cost):
+                break
+
+            queue.popleft()
+            ticket.granted = True
+            granted = True
+            self._deficits[user] -= ticket.cost
+            self._in_flight += 1
+            if self.rate:
+                self._tokens -= ticket.cost
+            SPOTIFY_SCHEDULER_QUEUE_DEPTH.dec(user=user)
+
+            if not queue:
+                # Idle users keep no credit, and their gauge goes away
+                self._active.popleft()
+                del self._queues[user]
+                del self._deficits[user]
+                SPOTIFY_SCHEDULER_QUEUE_DEPTH.remove(user=user)
+            elif self._deficits[user] < queue[0].cost:
+                self._active.rotate(-1)
+        if granted:
+            self._cond.notify_all()
+
+    def _wait_timeout(self) -> Optional[float]:
+        if self.rate and self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+        return None
+
+    def acquire(self, user: str, cost: float = 1.0) -> None:
+        """
+        Blocks until `user` may make a call. Every acquire() must be followed by release().
+
+        Args:
+            user (str): Scheduling key, e.g. from user_key().
+            cost (float): Share of the capacity the call uses.
+        """
+        if not self.enabled:
+            return
+
+        started = time.perf_counter()
+        with self._cond:
+            ticket = _Ticket(cost)
+            if user not in self._queues:
+                self._queues[user] = deque()
+                self._deficits[user] = 0.0
+                self._active.append(user)
+            self._queues[user].append(ticket)
+            SPOTIFY_SCHEDULER_QUEUE_DEPTH.inc(user=user)
+
+            self._dispatch()
+            while not ticket.granted:
+                self._cond.wait(timeout=self._wait_timeout())
+                if not ticket.granted:
+                    self._dispatch()
+        SPOTIFY_SCHEDULER_WAIT_SECONDS.observe(time.perf_counter() - started)
+
+    def release(self) -> None:
+        """
+        Marks a granted call as finished, freeing its in-flight slot.
+        """
+        if not self.enabled:
+            return
+
+        with self._cond:
+            self._in_flight -= 1
+            self._dispatch()
+
+    def stats(self) -> dict:
+        """
+        Current load, for the health endpoint: calls in flight and queued calls per user.
+        """
+        with self._cond:
+            return {
+                "in_flight": self._in_flight,
+                "queued": {user: len(queue) for user, queue in self._queues.items()},
+            }
+
+
+class ScheduledSpotify:
+    """
+    Spotify client proxy whose API calls wait for the fair-share scheduler.
+
+    Public methods of the wrapped client (search, playlist_add_items,
+    current_user_playlists, ...) each take one ticket for `user`. Everything
+    else is passed through unchanged.
+    """
+
+    def __init__(self, sp: spotipy.Spotify, user: str, scheduler: Optional[FairShareScheduler] = None):
+        self._sp = sp
+        self._user = user
+        self._scheduler = scheduler or get_spotify_scheduler()
+
+    @property
+    def client(self) -> spotipy.Spotify:
+        """The wrapped, unscheduled client."""
+        return self._sp
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._sp, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        def scheduled(*args, **kwargs):
+            self._scheduler.acquire(self._user)
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                self._scheduler.release()
+
+        return scheduled
+
+
+def schedule_spotify(sp: Optional[spotipy.Spotify], access_token: str) -> Optional[spotipy.Spotify]:
+    """
+    Wraps a client authenticated with a user's token in a ScheduledSpotify keyed by that user.
+    Returns None if `sp` is None, so token validation results can be passed straight in.
+    """
+    if sp is None:
+        return None
+    return ScheduledSpotify(sp, user_key(access_token))
+
+
+_spotify_scheduler: Optional[FairShareScheduler] = None
+_spotify_scheduler_lock = threading.Lock()
+
+
+def get_spotify_scheduler() -> FairShareScheduler:
+    """
+    Returns the process-wide Spotify scheduler, creating it on first use.
+    """
+    global _spotify_scheduler
+
+    with _spotify_scheduler_lock:
+        if _spotify_scheduler is None:
+            _spotify_scheduler = FairShareScheduler.from_env()
+        return _spotify_scheduler
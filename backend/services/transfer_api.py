@@ -8,24 +8,19 @@ from backend.services.youtube_api import (
 )
 from backend.services.spotify_api import (
     api_create_playlist,
-    api_process_videos_to_songs,  # New function!
+    api_match_videos,
+    api_write_matched_songs,
 )
 from backend.models.transfer import TransferResponse, SongResult
-from typing import List
-import logging
+from backend.services.metrics import TRANSFER_DURATION_SECONDS, FAILURES_TOTAL
+from backend.services.transfer_stats import TransferStatsCollector
+from backend.services.transfer_progress import TransferProgress
+from backend.services.youtube_quota import SERVER_USER
+from typing import Callable, List, Optional
+from backend.services.logger import get_logger
 
 # Setup a logger instance for this module
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-
-# Add a basic console handler
-console_handler = logging.StreamHandler()
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
-
-# Add handler only if not already added
-if not logger.handlers:
-    logger.addHandler(console_handler)
+logger = get_logger(__name__)
 
 
 def transfer_playlist_api(
@@ -34,11 +29,20 @@ def transfer_playlist_api(
     playlist_url: str,
     playlist_name: str,
     is_public: bool = True,
-    description: str = "YouTube Playlist Transfer"
+    description: str = "YouTube Playlist Transfer",
+    stats: Optional[TransferStatsCollector] = None,
+    progress: Optional[TransferProgress] = None,
+    client_factory: Optional[Callable[[], spotipy.Spotify]] = None,
+    preview: bool = False,
+    youtube_user: str = SERVER_USER
 ) -> TransferResponse:
     """
     Transfers a YouTube playlist to a new Spotify playlist with complete metadata.
 
+    With preview=True the videos are only matched: no Spotify playlist is looked
+    up, created or written. The result can be written later with
+    commit_transfer_api(), without searching again.
+
     Args:
         youtube (Resource): Authenticated YouTube API service.
         sp (spotipy.Spotify): Authenticated Spotify client.
@@ -46,11 +50,21 @@ def transfer_playlist_api(
         playlist_name (str): Name for the new Spotify playlist.
         is_public (bool): Visibility of the Spotify playlist.
         description (str): Optional description.
+        stats (Optional[TransferStatsCollector]): Stats collector, if the caller already
+            recorded stages (e.g. token validation) before the transfer started.
+        progress (Optional[TransferProgress]): Progress publisher for GET /transfer/{transfer_id}/progress.
+        client_factory (Optional[Callable[[], spotipy.Spotify]]): Picklable client recipe that lets
+            large playlists be matched by worker processes.
+        preview (bool): Match only and leave Spotify playlists untouched.
+        youtube_user (str): Key the YouTube quota is accounted under, from quota_user().
 
     Returns:
         TransferResponse: Complete transfer results with all metadata.
     """
     
+    if stats is None:
+        stats = TransferStatsCollector()
+    
     # Start timing the transfer
     start_time = time.time()
     created_at = datetime.utcnow().isoformat() + "Z"
@@ -64,28 +78,46 @@ def transfer_playlist_api(
         
         # Step 2: Get detailed YouTube video data
         logger.info("Fetching YouTube video details...")
-        youtube_videos = get_video_details_from_playlist(youtube, playlist_id)
+        if progress:
+            progress.start_stage("youtube_fetch")
+        with stats.stage("youtube_fetch"):
+            youtube_videos = get_video_details_from_playlist(youtube, playlist_id, stats=stats, user=youtube_user)
         total_songs = len(youtube_videos)
         
         logger.info(f"Found {total_songs} videos in YouTube playlist")
         
-        # Step 3: Create Spotify playlist
-        logger.info("Creating Spotify playlist...")
-        spotify_playlist = api_create_playlist(
-            sp,
-            name=playlist_name,
-            isPublic=is_public,
-            description=description
-        )
-        
-        spotify_playlist_id = spotify_playlist["id"]
-        spotify_playlist_url = spotify_playlist["external_urls"]["spotify"]
-        
-        logger.info(f"Created Spotify playlist: {spotify_playlist_url}")
+        # Step 3: Create Spotify playlist (not for a preview)
+        if preview:
+            spotify_playlist_id = ""
+            spotify_playlist_url = ""
+            if progress:
+                progress.start_stage("search", total=total_songs)
+        else:
+            logger.info("Creating Spotify playlist...")
+            if progress:
+                progress.start_stage("playlist_setup", total=total_songs)
+            with stats.stage("playlist_setup"):
+                spotify_playlist = api_create_playlist(
+                    sp,
+                    name=playlist_name,
+                    isPublic=is_public,
+                    description=description,
+                    stats=stats
+                )
+            
+            spotify_playlist_id = spotify_playlist["id"]
+            spotify_playlist_url = spotify_playlist["external_urls"]["spotify"]
+            
+            logger.info(f"Created Spotify playlist: {spotify_playlist_url}")
+            if progress:
+                progress.start_stage("search")
         
         # Step 4: Process videos and search for matches on Spotify
-        logger.info("Searching for songs on Spotify and adding to playlist...")
-        song_results = api_process_videos_to_songs(sp, youtube_videos, spotify_playlist_id)
+        logger.info("Searching for songs on Spotify...")
+        song_results = api_match_videos(sp, youtube_videos, stats=stats, progress=progress, client_factory=client_factory)
+        if not preview:
+            logger.info("Adding matched songs to the Spotify playlist...")
+            api_write_matched_songs(sp, spotify_playlist_id, song_results, stats=stats, progress=progress)
         
         # Step 5: Calculate statistics
         successful_songs = [song for song in song_results if song.status == "success"]
@@ -101,9 +133,13 @@ def transfer_playlist_api(
         # Calculate additional statistics
         match_rate = (transferred_songs / total_songs * 100) if total_songs > 0 else 0
         processing_time_per_song = transfer_duration / total_songs if total_songs > 0 else 0
+        TRANSFER_DURATION_SECONDS.observe(transfer_duration, outcome="success")
         
         # Create success message
-        message = f"Successfully transferred {transferred_songs} out of {total_songs} songs ({match_rate:.1f}% match rate)"
+        if preview:
+            message = f"Preview: found {transferred_songs} out of {total_songs} songs ({match_rate:.1f}% match rate). Commit it to create the playlist."
+        else:
+            message = f"Successfully transferred {transferred_songs} out of {total_songs} songs ({match_rate:.1f}% match rate)"
         
         # Log final summary
         logger.info("=== TRANSFER COMPLETE ===")
@@ -114,8 +150,12 @@ def transfer_playlist_api(
         logger.info(f"Match rate: {match_rate:.1f}%")
         logger.info(f"Transfer duration: {transfer_duration:.2f}s")
         logger.info(f"Avg time per song: {processing_time_per_song:.2f}s")
+        logger.info(f"Stage breakdown: {stats.summary()}")
         logger.info("========================")
         
+        if progress:
+            progress.start_stage("done")
+        
         # Return complete response
         return TransferResponse(
             success=True,
@@ -129,7 +169,9 @@ def transfer_playlist_api(
             created_at=created_at,
             message=message,
             match_rate=match_rate,
-            processing_time_per_song=processing_time_per_song
+            processing_time_per_song=processing_time_per_song,
+            stats=stats.to_model(),
+            preview=preview
         )
         
     except Exception as e:
@@ -138,6 +180,11 @@ def transfer_playlist_api(
         transfer_duration = end_time - start_time
         
         logger.error(f"Transfer failed: {str(e)}")
+        logger.error(f"Stage breakdown: {stats.summary()}")
+        TRANSFER_DURATION_SECONDS.observe(transfer_duration, outcome="error")
+        FAILURES_TOTAL.inc(stage="transfer")
+        if progress:
+            progress.start_stage("failed")
         
         # Return error response
         return TransferResponse(
@@ -152,10 +199,76 @@ def transfer_playlist_api(
             created_at=created_at,
             message=f"Transfer failed: {str(e)}",
             match_rate=0.0,
-            processing_time_per_song=0.0
+            processing_time_per_song=0.0,
+            stats=stats.to_model()
         )
 
 
+def commit_transfer_api(
+    sp: spotipy.Spotify,
+    preview: TransferResponse,
+    songs: List[SongResult],
+    playlist_name: str,
+    is_public: bool = True,
+    description: str = "YouTube Playlist Transfer",
+    stats: Optional[TransferStatsCollector] = None
+) -> TransferResponse:
+    """
+    Writes the match set of a preview to a Spotify playlist, without searching again.
+
+    Only playlist calls are made: the user lookup, the playlist lookup or
+    creation, and the batched adds. The songs are written exactly as they
+    were matched in the preview.
+
+    Args:
+        sp (spotipy.Spotify): Authenticated Spotify client.
+        preview (TransferResponse): Summary of the preview from transfer_playlist_api(preview=True).
+        songs (List[SongResult]): All songs of the preview, in playlist order.
+        playlist_name (str): Name for the new Spotify playlist.
+        is_public (bool): Visibility of the Spotify playlist.
+        description (str): Optional description.
+        stats (Optional[TransferStatsCollector]): Stats collector for the commit's own calls.
+
+    Returns:
+        TransferResponse: The preview's results, now pointing at the written playlist.
+    """
+    
+    if stats is None:
+        stats = TransferStatsCollector()
+    
+    start_time = time.time()
+    logger.info(f"Committing previewed transfer: {playlist_name} ({preview.transferred_songs} songs)")
+    
+    try:
+        with stats.stage("playlist_setup"):
+            spotify_playlist = api_create_playlist(
+                sp,
+                name=playlist_name,
+                isPublic=is_public,
+                description=description,
+                stats=stats
+            )
+        api_write_matched_songs(sp, spotify_playlist["id"], songs, stats=stats)
+    except Exception as e:
+        logger.error(f"Commit failed: {str(e)}")
+        FAILURES_TOTAL.inc(stage="transfer")
+        raise
+    
+    commit_duration = time.time() - start_time
+    logger.info(f"Commit complete in {commit_duration:.2f}s. Stage breakdown: {stats.summary()}")
+    
+    return preview.model_copy(update={
+        "playlist_id": spotify_playlist["id"],
+        "playlist_url": spotify_playlist["external_urls"]["spotify"],
+        "songs": songs,
+        "transfer_duration": commit_duration,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "message": f"Successfully transferred {preview.transferred_songs} out of {preview.total_songs} songs ({preview.match_rate:.1f}% match rate)",
+        "stats": stats.to_model(),
+        "preview": False,
+    })
+
+
 # Legacy function for backward compatibility
 def transfer_playlist_api_legacy(
     youtube: Resource,
@@ -0,0 +1,186 @@
+# backend/services/transfer_dedup.py
+
+import asyncio
+import hashlib
+import os
+from typing import Awaitable, Callable, Dict, Optional
+from starlette.concurrency import run_in_threadpool
+from backend.services.shared_state import SharedState, get_shared_state
+from backend.services.transfer_results import get_result_store
+from backend.services.serialization import PydanticJSONResponse
+from backend.services.youtube_api import extract_playlist_id
+from backend.services.logger import get_logger
+
+# Setup a logger instance for this module
+logger = get_logger(__name__)
+
+
+def transfer_key(spotify_token: str, playlist_url: str, playlist_name: str, preview: bool, include_songs: bool) -> str:
+    """
+    Identifies a transfer submission: same user, same YouTube playlist, same target name and options.
+
+    The Spotify token stands in for the user, so the key is a hash and never stores it.
+    """
+    try:
+        playlist = extract_playlist_id(playlist_url)
+    except ValueError:
+        playlist = playlist_url
+    raw = "\n".join([spotify_token, playlist, playlist_name.strip().lower(), str(preview), str(include_songs)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class InFlightTransfers:
+    """
+    Attaches repeated submissions of a running transfer to that transfer.
+
+    A double-clicked "Transfer" button, or a frontend retrying after a proxy
+    timeout, would otherwise start a second full pipeline: twice the API
+    calls, and two runs racing to create the same playlist. Submissions are
+    keyed by transfer_key(); while one is running, an identical one gets the
+    running job's response instead of starting another.
+
+    Within a process the job is shared directly. Across workers the key is
+    claimed in the shared state; a submission that lands on another worker
+    waits for the owner's result to appear in the result store. If the owner
+    fails without a result, the waiter runs the transfer itself.
+
+    Submissions share the encoded body, never a response object: middleware
+    such as compression edits a response's headers as it sends it, so each
+    submission gets its own response around the shared bytes.
+    """
+
+    def __init__(self, state: SharedState, enabled: bool = True, ttl: float = 3600, poll_interval: float = 0.5):
+        """
+        Args:
+            state (SharedState): Backend the cross-worker claims are stored in.
+            enabled (bool): When False, every submission runs on its own.
+            ttl (float): Seconds a claim is held at most, in case its worker dies mid-transfer.
+            poll_interval (float): Seconds between checks for another worker's result.
+        """
+        self.state = state
+        self.enabled = enabled
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+
+        # key -> (transfer_id, task returning the encoded body), for transfers running in this process
+        self._jobs: Dict[str, tuple] = {}
+
+    @classmethod
+    def from_env(cls) -> "InFlightTransfers":
+        """
+        Builds the registry from the TRANSFER_DEDUP_* environment variables.
+        """
+        return cls(
+            get_shared_state(),
+            enabled=os.getenv("TRANSFER_DEDUP_ENABLED", "true").lower() == "true",
+            ttl=float(os.getenv("TRANSFER_DEDUP_TTL", "3600")),
+            poll_interval=float(os.getenv("TRANSFER_DEDUP_POLL_INTERVAL", "0.5")),
+        )
+
+    async def run(
+        self,
+        key: str,
+        transfer_id: str,
+        include_songs: bool,
+        start: Callable[[], Awaitable[PydanticJSONResponse]]
+    ) -> PydanticJSONResponse:
+        """
+        Returns the response of the transfer running under `key`, starting it with `start()` if there is none.
+
+        Args:
+            key (str): Submission key from transfer_key().
+            transfer_id (str): ID this submission would run under.
+            include_songs (bool): Whether a result fetched from another worker includes its songs.
+            start (Callable[[], Awaitable[PydanticJSONResponse]]): Starts the transfer.
+
+        Returns:
+            PydanticJSONResponse: A new response with the transfer's body, one per attached submission.
+        """
+        if not self.enabled:
+            return await start()
+
+        while True:
+            job = self._jobs.get(key)
+            if job is not None:
+                owner_id, task = job
+                logger.info(f"[Transfer] - Attaching {transfer_id} to running transfer {owner_id}")
+                self._alias(transfer_id, owner_id)
+                # Shielded: one client disconnecting must not cancel the others' transfer
+                return PydanticJSONResponse(await asyncio.shield(task))
+
+            owner_id = self._claim(key, transfer_id)
+            if owner_id is None:
+                task = asyncio.ensure_future(self._encoded(start))
+                self._jobs[key] = (transfer_id, task)
+                task.add_done_callback(lambda done: self._finish(key, transfer_id, done))
+                return PydanticJSONResponse(await asyncio.shield(task))
+
+            logger.info(f"[Transfer] - Attaching {transfer_id} to transfer {owner_id} on another worker")
+            self._alias(transfer_id, owner_id)
+            response = await self._wait_for_result(key, owner_id, include_songs)
+            if response is not None:
+                return response
+            # The owner gave up without a result: run it here instead
+
+    @staticmethod
+    async def _encoded(start: Callable[[], Awaitable[PydanticJSONResponse]]) -> bytes:
+        return (await start()).body
+
+    def _claim(self, key: str, transfer_id: str) -> Optional[str]:
+        """
+        Claims the key for this worker. Returns None on success, else the transfer_id holding it.
+        """
+        if self.state.set_if_absent(f"inflight:{key}", transfer_id, ttl=self.ttl):
+            return None
+        owner_id = self.state.get(f"inflight:{key}")
+        if owner_id is None:
+            # Released between the two calls; try again
+            return self._claim(key, transfer_id)
+        return owner_id
+
+    def _finish(self, key: str, transfer_id: str, task: asyncio.Future) -> None:
+        self._jobs.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # Retrieved here too, in case every submitter disconnected
+        if self.state.get(f"inflight:{key}") == transfer_id:
+            self.state.delete(f"inflight:{key}")
+
+    def _alias(self, transfer_id: str, owner_id: str) -> None:
+        if transfer_id != owner_id:
+            self.state.set(f"transfer:{transfer_id}:alias", owner_id, ttl=self.ttl)
+
+    def resolve(self, transfer_id: str) -> str:
+        """
+        Returns the transfer a submission was attached to, or `transfer_id` itself.
+        """
+        return self.state.get(f"transfer:{transfer_id}:alias") or transfer_id
+
+    async def _wait_for_result(self, key: str, owner_id: str, include_songs: bool) -> Optional[PydanticJSONResponse]:
+        """
+        Polls for another worker's result. Returns None if its claim ends without one.
+        """
+        store = get_result_store()
+        while True:
+            summary = store.get_summary(owner_id)
+            if summary is not None:
+                if include_songs:
+                    songs = await run_in_threadpool(store.get_songs, owner_id, 0, store.count_songs(owner_id))
+                    summary = summary.model_copy(update={"songs": songs})
+                return await run_in_threadpool(PydanticJSONResponse, summary)
+            if self.state.get(f"inflight:{key}") != owner_id:
+                return None
+            await asyncio.sleep(self.poll_interval)
+
+
+_inflight_transfers: Optional[InFlightTransfers] = None
+
+
+def get_inflight_transfers() -> InFlightTransfers:
+    """
+    Returns the process-wide in-flight transfer registry, creating it on first use.
+    """
+    global _inflight_transfers
+
+    if _inflight_transfers is None:
+        _inflight_transfers = InFlightTransfers.from_env()
+    return _inflight_transfers
@@ -0,0 +1,178 @@
+# backend/services/transfer_executor.py
+
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Optional
+
+
+class TransferRejectedError(Exception):
+    """
+    Raised when a transfer cannot be admitted because the executor is saturated.
+
+    Attributes:
+        status_code (int): 429 when the wait queue is full, 503 when the queue wait timed out.
+        queue_position (int): Position the transfer had (or would have had) in the wait queue.
+        retry_after (int): Suggested number of seconds before retrying.
+    """
+
+    def __init__(self, message: str, status_code: int, queue_position: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.queue_position = queue_position
+        self.retry_after = retry_after
+
+
+class TransferExecutor:
+    """
+    Runs playlist transfers on a dedicated thread pool with admission control.
+
+    Transfers are long, blocking jobs (YouTube paging, hundreds of Spotify
+    searches), so they get their own pool instead of FastAPI's shared anyio
+    threadpool. At most `max_concurrent` transfers run at once, up to
+    `max_queue` more wait for a slot, and anything beyond that is rejected
+    immediately so cheap endpoints never queue behind transfers.
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_queue: int = 16, queue_timeout: float = 30.0, retry_after: int = 30):
+        """
+        Args:
+            max_concurrent (int): Number of transfers allowed to run at the same time.
+            max_queue (int): Number of admitted transfers allowed to wait for a free slot.
+            queue_timeout (float): Seconds a queued transfer waits before giving up with a 503.
+            retry_after (int): Value sent in the Retry-After header of rejections.
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="transfer")
+        self._running = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @classmethod
+    def from_env(cls) -> "TransferExecutor":
+        """
+        Builds an executor from the TRANSFER_* environment variables.
+        """
+        return cls(
+            max_concurrent=int(os.getenv("TRANSFER_MAX_CONCURRENT", "4")),
+            max_queue=int(os.getenv("TRANSFER_MAX_QUEUE", "16")),
+            queue_timeout=float(os.getenv("TRANSFER_QUEUE_TIMEOUT", "30")),
+            retry_after=int(os.getenv("TRANSFER_RETRY_AFTER", "30")),
+        )
+
+    def stats(self) -> dict:
+        """
+        Returns the current load of the executor.
+        """
+        return {
+            "running": self._running,
+            "queued": len(self._waiters),
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+        }
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Runs `fn(*args, **kwargs)` on the transfer pool once a slot is free.
+
+        Args:
+            fn (Callable[..., Any]): Blocking function performing the transfer.
+
+        Returns:
+            Any: Whatever `fn` returns. Exceptions raised by `fn` propagate unchanged.
+
+        Raises:
+            TransferRejectedError: If the wait queue is full or the wait timed out.
+        """
+        loop = asyncio.get_running_loop()
+        await self._acquire_slot(loop)
+
+        future = self._pool.submit(fn, *args, **kwargs)
+        # Release from the pool callback so the slot stays taken until the thread
+        # actually finishes, even if the client disconnects and this coroutine is cancelled
+        future.add_done_callback(lambda _: self._schedule_release(loop))
+        return await asyncio.wrap_future(future)
+
+    def _schedule_release(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            loop.call_soon_threadsafe(self._release_slot)
+        except RuntimeError:
+            # Event loop already closed during shutdown, nothing left to admit
+            pass
+
+    async def _acquire_slot(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._running < self.max_concurrent and not self._waiters:
+            self._running += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            raise TransferRejectedError(
+                "Too many transfers in progress",
+                status_code=429,
+                queue_position=len(self._waiters) + 1,
+                retry_after=self.retry_after,
+            )
+
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        queue_position = len(self._waiters)
+
+        try:
+            # A granted waiter inherits the releasing transfer's slot, so _running is not touched here
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard_waiter(waiter)
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait timed out; pass it on
+                self._release_slot()
+            raise TransferRejectedError(
+                "Timed out waiting for a free transfer slot",
+                status_code=503,
+                queue_position=queue_position,
+                retry_after=self.retry_after,
+            )
+        except asyncio.CancelledError:
+            self._discard_waiter(waiter)
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the client went away; pass it on
+                self._release_slot()
+            raise
+
+    def _discard_waiter(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _release_slot(self) -> None:
+        # Hand the slot straight to the next live waiter, otherwise free it
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._running -= 1
+
+    def shutdown(self) -> None:
+        """
+        Stops accepting work. Running transfers are allowed to finish in the background.
+        """
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_transfer_executor: Optional[TransferExecutor] = None
+
+
+def get_transfer_executor() -> TransferExecutor:
+    """
+    Returns the process-wide transfer executor, creating it on first use.
+    """
+    global _transfer_executor
+
+    if _transfer_executor is None:
+        _transfer_executor = TransferExecutor.from_env()
+    return _transfer_executor
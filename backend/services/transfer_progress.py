@@ -0,0 +1,97 @@
+# backend/services/transfer_progress.py
+
+import os
+import threading
+import time
+from typing import Optional
+from backend.services.shared_state import SharedState, get_shared_state
+
+
+class TransferProgress:
+    """
+    Publishes how far a running transfer has got, for GET /transfer/{transfer_id}/progress.
+
+    Progress goes to the shared state, so any worker can answer the poll, not
+    just the one running the transfer. Per-video updates are throttled to one
+    write every `min_interval` seconds; stage changes and the final update are
+    always written.
+    """
+
+    def __init__(self, transfer_id: str, state: SharedState, ttl: float = 3600, min_interval: float = 0.5):
+        """
+        Args:
+            transfer_id (str): ID the transfer was started under.
+            state (SharedState): Backend the progress is stored in.
+            ttl (float): Seconds the last update stays readable.
+            min_interval (float): Minimum seconds between per-video writes.
+        """
+        self.transfer_id = transfer_id
+        self.state = state
+        self.ttl = ttl
+        self.min_interval = min_interval
+
+        self._lock = threading.Lock()
+        self._stage = "queued"
+        self._processed = 0
+        self._total = 0
+        self._matched = 0
+        self._last_write = float("-inf")
+
+    @classmethod
+    def from_env(cls, transfer_id: str) -> "TransferProgress":
+        """
+        Builds a progress publisher from the TRANSFER_PROGRESS_* environment variables.
+        """
+        return cls(
+            transfer_id,
+            get_shared_state(),
+            ttl=float(os.getenv("TRANSFER_PROGRESS_TTL", "3600")),
+            min_interval=float(os.getenv("TRANSFER_PROGRESS_INTERVAL", "0.5")),
+        )
+
+    def start_stage(self, stage: str, total: Optional[int] = None) -> None:
+        """
+        Moves the transfer to a new stage.
+
+        Args:
+            stage (str): One of TRANSFER_STAGES, or "done" / "failed".
+            total (Optional[int]): Number of videos, once known.
+        """
+        with self._lock:
+            self._stage = stage
+            if total is not None:
+                self._total = total
+        self._write(force=True)
+
+    def video_done(self, matched: bool) -> None:
+        """
+        Counts one searched video.
+        """
+        with self._lock:
+            self._processed += 1
+            if matched:
+                self._matched += 1
+        self._write()
+
+    def _write(self, force: bool = False) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_write < self.min_interval:
+                return
+            self._last_write = now
+            snapshot = {
+                "transfer_id": self.transfer_id,
+                "stage": self._stage,
+                "processed": self._processed,
+                "total": self._total,
+                "matched": self._matched,
+                "updated_at": time.time(),
+            }
+        self.state.set(f"progress:{self.transfer_id}", snapshot, ttl=self.ttl)
+
+
+def get_transfer_progress(transfer_id: str) -> Optional[dict]:
+    """
+    Returns the last published progress of a transfer, or None if it is unknown or expired.
+    """
+    return get_shared_state().get(f"progress:{transfer_id}")
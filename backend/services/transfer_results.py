@@ -0,0 +1,132 @@
+# backend/services/transfer_results.py
+
+import os
+from typing import List, Optional
+from backend.models.transfer import SongResult, TransferResponse
+from backend.services.shared_state import SharedState, get_shared_state
+
+
+class TransferResultStore:
+    """
+    Keeps finished transfer results for a while so their songs can be paged.
+
+    A transfer can answer with just the summary and a transfer_id; the songs
+    are then fetched in pages from GET /transfer/{transfer_id}/songs. The
+    summary and the song list are stored separately in the shared state, so
+    any worker can serve a page without loading the whole result. Results
+    expire after `ttl` seconds.
+    """
+
+    def __init__(self, state: SharedState, ttl: float = 3600):
+        """
+        Args:
+            state (SharedState): Backend the results are stored in.
+            ttl (float): Seconds a result stays available.
+        """
+        self.state = state
+        self.ttl = ttl
+
+    @classmethod
+    def from_env(cls) -> "TransferResultStore":
+        """
+        Builds the store from the TRANSFER_RESULTS_TTL environment variable.
+        """
+        return cls(get_shared_state(), ttl=float(os.getenv("TRANSFER_RESULTS_TTL", "3600")))
+
+    def save(self, transfer_id: str, result: TransferResponse) -> None:
+        """
+        Stores a finished transfer.
+
+        Args:
+            transfer_id (str): ID the transfer was started under.
+            result (TransferResponse): Complete transfer result, including all songs.
+        """
+        summary = result.model_dump(mode="json", exclude={"songs"})
+        self.state.delete(f"transfer:{transfer_id}:songs")
+        self.state.push_list(
+            f"transfer:{transfer_id}:songs",
+            [song.model_dump(mode="json") for song in result.songs],
+            ttl=self.ttl,
+        )
+        # Written last, so a visible summary always has its songs
+        self.state.set(f"transfer:{transfer_id}", summary, ttl=self.ttl)
+        # The owner was claimed at submission; keep it as long as the result
+        owner = self.get_owner(transfer_id)
+        if owner is not None:
+            self.state.set(f"transfer:{transfer_id}:owner", owner, ttl=self.ttl)
+
+    def claim_owner(self, transfer_id: str, owner: str) -> bool:
+        """
+        Records the Spotify user a transfer_id belongs to. Returns False if it already belongs to
+        someone else, so a client-chosen ID can't be used to overwrite another user's transfer.
+        """
+        if self.state.set_if_absent(f"transfer:{transfer_id}:owner", owner, ttl=self.ttl):
+            return True
+        return self.get_owner(transfer_id) == owner
+
+    def get_owner(self, transfer_id: str) -> Optional[str]:
+        """
+        Returns the Spotify user id recorded by claim_owner(), or None.
+        """
+        return self.state.get(f"transfer:{transfer_id}:owner")
+
+    def save_request(self, transfer_id: str, settings: dict) -> None:
+        """
+        Stores the playlist settings a preview was requested with, for its commit.
+        """
+        self.state.set(f"transfer:{transfer_id}:request", settings, ttl=self.ttl)
+
+    def get_request(self, transfer_id: str) -> Optional[dict]:
+        """
+        Returns the settings stored by save_request(), or None.
+        """
+        return self.state.get(f"transfer:{transfer_id}:request")
+
+    def claim_commit(self, transfer_id: str) -> bool:
+        """
+        Marks a preview as being committed. Returns False if another request already claimed it,
+        so the same match set is never written twice.
+        """
+        return self.state.set_if_absent(f"transfer:{transfer_id}:commit", True, ttl=self.ttl)
+
+    def release_commit(self, transfer_id: str) -> None:
+        """
+        Releases a claim after a failed commit, so it can be retried.
+        """
+        self.state.delete(f"transfer:{transfer_id}:commit")
+
+    def get_summary(self, transfer_id: str) -> Optional[TransferResponse]:
+        """
+        Returns a stored transfer without its songs, or None if it is unknown or expired.
+        """
+        summary = self.state.get(f"transfer:{transfer_id}")
+        if summary is None:
+            return None
+        return TransferResponse(**summary, songs=[])
+
+    def count_songs(self, transfer_id: str) -> int:
+        """
+        Returns how many songs a stored transfer has.
+        """
+        return self.state.list_length(f"transfer:{transfer_id}:songs")
+
+    def get_songs(self, transfer_id: str, offset: int, limit: int) -> List[SongResult]:
+        """
+        Returns songs offset..offset+limit-1 of a stored transfer.
+        """
+        items = self.state.list_range(f"transfer:{transfer_id}:songs", offset, offset + limit)
+        return [SongResult(**item) for item in items]
+
+
+_result_store: Optional[TransferResultStore] = None
+
+
+def get_result_store() -> TransferResultStore:
+    """
+    Returns the process-wide transfer result store, creating it on first use.
+    """
+    global _result_store
+
+    if _result_store is None:
+        _result_store = TransferResultStore.from_env()
+    return _result_store
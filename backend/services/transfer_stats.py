@@ -0,0 +1,161 @@
+# backend/services/transfer_stats.py
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from backend.models.transfer import StageStats, SearchStats, TransferStats
+from backend.services.retry_policy import RetryBudget
+
+
+# Stages of a transfer, in pipeline order
+TRANSFER_STAGES = (
+    "token_validation",  # Checking the user's YouTube and Spotify tokens
+    "youtube_fetch",     # Paging through playlistItems
+    "playlist_setup",    # Looking up or creating the target Spotify playlist
+    "search",            # Matching every video on Spotify
+    "playlist_add",      # Writing matched tracks to the playlist
+)
+
+
+class TransferStatsCollector:
+    """
+    Records wall time, upstream API call counts and retries per stage of one transfer.
+
+    One collector is created per transfer and passed down through the
+    pipeline functions. It is thread-safe so stages can be recorded from
+    worker threads. Since it goes everywhere the transfer does, it also
+    carries the transfer's retry budget (see retry_policy.retry_call()).
+    """
+
+    def __init__(self, retry_budget: Optional[int] = None):
+        """
+        Args:
+            retry_budget (Optional[int]): Retries allowed over the transfer; defaults to TRANSFER_RETRY_BUDGET.
+        """
+        self._lock = threading.Lock()
+        self._wall_time: Dict[str, float] = {stage: 0.0 for stage in TRANSFER_STAGES}
+        self._calls: Dict[str, int] = {stage: 0 for stage in TRANSFER_STAGES}
+        self._retries: Dict[str, int] = {stage: 0 for stage in TRANSFER_STAGES}
+        if retry_budget is None:
+            retry_budget = int(os.getenv("TRANSFER_RETRY_BUDGET", "50"))
+        self.retry_budget = RetryBudget(retry_budget)
+        self._videos_searched = 0
+        self._early_exits = 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Adds the wall time of the wrapped block to a stage, including when it raises.
+
+        Args:
+            name (str): One of TRANSFER_STAGES.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_wall_time(name, time.perf_counter() - started)
+
+    def add_wall_time(self, stage: str, seconds: float) -> None:
+        """
+        Adds wall time measured by the caller to a stage.
+
+        Args:
+            stage (str): One of TRANSFER_STAGES.
+            seconds (float): Elapsed time to add.
+        """
+        with self._lock:
+            self._wall_time[stage] += seconds
+
+    def count_call(self, stage: str, count: int = 1) -> None:
+        """
+        Counts upstream API calls made during a stage.
+
+        Args:
+            stage (str): One of TRANSFER_STAGES.
+            count (int): Number of calls to add.
+        """
+        with self._lock:
+            self._calls[stage] += count
+
+    def count_retry(self, stage: str) -> None:
+        """
+        Counts one upstream call sent again during a stage after a transient error.
+
+        Args:
+            stage (str): One of TRANSFER_STAGES.
+        """
+        with self._lock:
+            self._retries[stage] += 1
+
+    def record_video_search(self, queries: int, early_exit: bool) -> None:
+        """
+        Records how one video was searched.
+
+        Args:
+            queries (int): Number of search queries sent for the video.
+            early_exit (bool): Whether a high-confidence match stopped the search early.
+        """
+        with self._lock:
+            self._videos_searched += 1
+            if early_exit:
+                self._early_exits += 1
+
+    def merge(self, other: TransferStats) -> None:
+        """
+        Adds the API calls, retries and searched videos of a part of the transfer recorded elsewhere,
+        e.g. a chunk matched in a worker process. Wall time is not added, since parts run in parallel.
+        The part's retries are also taken from this transfer's retry budget.
+
+        Args:
+            other (TransferStats): Stats of the part, from TransferStatsCollector.to_model().
+        """
+        with self._lock:
+            for stage, stage_stats in other.stages.items():
+                self._calls[stage] += stage_stats.calls
+                self._retries[stage] += stage_stats.retries
+            self._videos_searched += other.search.videos
+            self._early_exits += other.search.early_exits
+        self.retry_budget.charge(sum(stage_stats.retries for stage_stats in other.stages.values()))
+
+    def to_model(self) -> TransferStats:
+        """
+        Builds the stats block for TransferResponse.
+        """
+        with self._lock:
+            stages = {
+                stage: StageStats(
+                    wall_time=round(self._wall_time[stage], 4), calls=self._calls[stage], retries=self._retries[stage]
+                )
+                for stage in TRANSFER_STAGES
+            }
+            videos = self._videos_searched
+            queries = self._calls["search"]
+            early_exits = self._early_exits
+
+        return TransferStats(
+            stages=stages,
+            search=SearchStats(
+                videos=videos,
+                queries=queries,
+                queries_per_video=round(queries / videos, 3) if videos else 0.0,
+                early_exits=early_exits,
+                early_exit_rate=round(early_exits / videos, 3) if videos else 0.0,
+            ),
+        )
+
+    def summary(self) -> str:
+        """
+        Formats the stats as a single log line.
+        """
+        stats = self.to_model()
+        stages = " ".join(
+            f"{name}={stage.wall_time:.2f}s/{stage.calls}calls" for name, stage in stats.stages.items()
+        )
+        retries = sum(stage.retries for stage in stats.stages.values())
+        return (
+            f"{stages} queries_per_video={stats.search.queries_per_video:.2f} "
+            f"early_exit_rate={stats.search.early_exit_rate:.2f} retries={retries}"
+        )
@@ -1,30 +1,37 @@
 import os
 import json
 import pickle
+import threading
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build, Resource
+from googleapiclient.http import HttpRequest
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
+from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs
-from typing import List
+from typing import Iterator, List, Optional
 from backend.models.transfer import YouTubeVideo
-import logging
+from backend.services.metrics import YOUTUBE_PAGE_FETCH_SECONDS, FAILURES_TOTAL, RATE_LIMITED_TOTAL
+from backend.services.transfer_stats import TransferStatsCollector
+from backend.services.retry_policy import retry_call
+from backend.services.youtube_quota import (
+    SERVER_USER,
+    YouTubeQuotaExceededError,
+    get_page_cache,
+    get_youtube_quota,
+    pages_needed,
+    quota_user,
+    remember_channel,
+)
+from backend.services.logger import get_logger
 
 
 # Setup a logger instance for this module
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-
-# Add a basic console handler
-console_handler = logging.StreamHandler()
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
-
-# Add handler only if not already added
-if not logger.handlers:
-    logger.addHandler(console_handler)
+logger = get_logger(__name__)
 
 
 backend_dir = Path(__file__).parent.parent
@@ -101,9 +108,21 @@ def get_authenticated_service_with_token(access_token: str) -> Resource:
         # Build and return the service
         service = build("youtube", "v3", credentials=creds)
         
-        # Test the service with a simple API call
-        test_request = service.channels().list(part="id", mine=True, maxResults=1)
-        test_request.execute()
+        # Test the service with a simple API call, unless this token passed the test a moment ago
+        quota = get_youtube_quota()
+        user = quota_user(access_token)
+        if not quota.token_validated(user):
+            test_request = service.channels().list(part="id", mine=True, maxResults=1)
+            try:
+                channels = test_request.execute().get("items") or []
+            except Exception:
+                quota.record("channels.list", user)
+                raise
+            if channels:
+                # From here on the user is accounted by channel, whichever token they come back with
+                user = remember_channel(access_token, channels[0]["id"])
+            quota.record("channels.list", user)
+            quota.remember_token(user)
         
         logger.info("[YouTubeAPI] - Successfully authenticated with user token")
         return service
@@ -139,24 +158,19 @@ def create_credentials_from_token_data(token_data: dict) -> Credentials:
     )
 
 
-def get_authenticated_service(scopes: list[str] = None) -> Resource:
-    """
-    Authenticates and returns a YouTube API service instance.
+# Installed-app YouTube clients, one per scope set, shared by every request
+_services: dict = {}
+_services_lock = threading.Lock()
+token_path = backend_dir / "credentials/youtube_token.pickle"
 
-    Args:
-        scopes (list[str]): A list of OAuth scopes required for the API access.
 
-    Returns:
-        Resource: Authenticated YouTube API client resource.
+def _load_credentials(scopes: list[str]) -> Credentials:
+    """
+    Loads the pickled installed-app credentials, refreshing them or running the OAuth flow if needed.
     """
-
-    if scopes is None:
-        scopes = [os.getenv("YOUTUBE_SCOPE")]
-
     logger.info(f"Using client secrets file: {scopes}, {os.getenv("YOUTUBE_PLAYLIST_URL")}, {os.getenv("YOUTUBE_CLIENT_JSON")}")
 
     client_secrets_file = backend_dir / os.getenv("YOUTUBE_CLIENT_JSON")
-    token_path = backend_dir / "credentials/youtube_token.pickle"
     creds = None
 
 
@@ -174,31 +188,133 @@ def get_authenticated_service(scopes: list[str] = None) -> Resource:
             creds = flow.run_local_server(port=8080)
 
         # Save token for next time
-        with open(token_path, "wb") as token_file:
-            pickle.dump(creds, token_file)
+        _save_credentials(creds)
 
-    return build("youtube", "v3", credentials=creds)
+    return creds
 
 
-def get_video_details_from_playlist(
+def _save_credentials(creds: Credentials) -> None:
+    with open(token_path, "wb") as token_file:
+        pickle.dump(creds, token_file)
+
+
+def _build_thread_safe_service(creds: Credentials) -> Resource:
+    """
+    Builds a YouTube client that can be used from several threads at once.
+
+    A discovery client normally sends every request over one httplib2.Http,
+    which isn't thread-safe. Here each request gets its own connection,
+    authorized with the shared credentials.
+    """
+    def build_request(http, *args, **kwargs):
+        return HttpRequest(AuthorizedHttp(creds, http=httplib2.Http()), *args, **kwargs)
+
+    return build("youtube", "v3", http=AuthorizedHttp(creds, http=httplib2.Http()), requestBuilder=build_request)
+
+
+def get_authenticated_service(scopes: list[str] = None) -> Resource:
+    """
+    Returns the process-wide YouTube API client for the installed-app credentials.
+
+    The credentials are unpickled and the client is built on first use only.
+    Later calls just refresh an expired token and save it for the next start.
+
+    Args:
+        scopes (list[str]): A list of OAuth scopes required for the API access.
+
+    Returns:
+        Resource: Authenticated YouTube API client resource.
+    """
+    if scopes is None:
+        scopes = [os.getenv("YOUTUBE_SCOPE")]
+
+    with _services_lock:
+        entry = _services.get(tuple(scopes))
+        if entry is None:
+            creds = _load_credentials(scopes)
+            entry = _services[tuple(scopes)] = (creds, _build_thread_safe_service(creds))
+
+        creds, service = entry
+        if not creds.valid and creds.refresh_token:
+            logger.info("[YouTubeAPI] - Refreshing expired installed-app token")
+            creds.refresh(Request())
+            _save_credentials(creds)
+    return service
+
+
+def _is_quota_error(error: HttpError) -> bool:
+    return error.resp.status == 403 and b"quotaExceeded" in (error.content or b"")
+
+
+def _load_stale_pages(playlist_id: str, cached: Optional[dict]) -> List[List[YouTubeVideo]]:
+    """
+    Returns an older cached copy of a playlist to serve when the quota can't cover a fetch.
+
+    Raises:
+        YouTubeQuotaExceededError: There is no usable cached copy.
+    """
+    pages = get_page_cache().load(playlist_id, cached) if cached else None
+    if pages is None:
+        raise YouTubeQuotaExceededError(
+            "Today's YouTube quota is used up, so the playlist can't be fetched. Try again after midnight Pacific time."
+        )
+    logger.warning(f"[YouTubeAPI] - Quota too low to fetch playlist {playlist_id}; serving the copy cached at {cached['fetched_at']:.0f}")
+    return pages
+
+
+def iter_playlist_pages(
     youtube: Resource,
-    playlist_id: str
-) -> List[YouTubeVideo]:
+    playlist_id: str,
+    stats: Optional[TransferStatsCollector] = None,
+    user: str = SERVER_USER
+) -> Iterator[List[YouTubeVideo]]:
     """
-    Fetches detailed video information from a YouTube playlist.
+    Fetches a YouTube playlist one page (up to 50 videos) at a time.
+
+    Each page is yielded as soon as it arrives, so callers can start on the
+    first videos before the rest of the playlist is fetched. A page that
+    fails with a transient error is retried with backoff, within the
+    transfer's retry budget.
+
+    Fetches are planned around the daily quota. A playlist fetched in the
+    last few minutes, by the same user or with the server's credentials, is
+    served from the page cache for free. Otherwise it is
+    fetched if the quota covers it (the page count of the last copy, or,
+    without one, the count reported by the first page). If it doesn't, the
+    last cached copy is served however old it is, and without one
+    YouTubeQuotaExceededError is raised before more units are spent.
 
     Args:
         youtube (Resource): Authenticated YouTube API service
         playlist_id (str): The YouTube playlist ID
+        stats (Optional[TransferStatsCollector]): Per-transfer stats to count page fetches in.
+        user (str): Quota accounting key, from quota_user().
 
-    Returns:
-        List[YouTubeVideo]: List of YouTube videos with full metadata
+    Yields:
+        List[YouTubeVideo]: The videos of one page, in playlist order
+
+    Raises:
+        YouTubeQuotaExceededError: The quota can't cover the fetch and nothing is cached.
     """
+    quota = get_youtube_quota()
+    page_cache = get_page_cache()
+
+    cached = page_cache.lookup(playlist_id, user)
+    if cached is not None and cached["fresh"]:
+        pages = page_cache.load(playlist_id, cached)
+        if pages is not None:
+            logger.info(f"[YouTubeAPI] - Serving playlist {playlist_id} from the page cache")
+            yield from pages
+            return
+
+    if not quota.can_spend(cached["pages"] if cached else 1, user):
+        yield from _load_stale_pages(playlist_id, cached)
+        return
 
     cache_dir = Path("cache") / f"youtube_raw_{playlist_id}"
     os.makedirs(cache_dir, exist_ok=True)
 
-    videos = []
+    writer = page_cache.writer(playlist_id, user)
     next_page_token = None
     page = 1
 
@@ -209,13 +325,51 @@ def get_video_details_from_playlist(
             maxResults=50,
             pageToken=next_page_token,
         )
-        response = request.execute()
+
+        def fetch_page() -> dict:
+            # Every try is an upstream call and costs quota, including the failed ones
+            try:
+                with YOUTUBE_PAGE_FETCH_SECONDS.time():
+                    return request.execute()
+            finally:
+                quota.record("playlistItems.list", user)
+                if stats:
+                    stats.count_call("youtube_fetch")
+
+        try:
+            # A transient error on one page is retried instead of failing the whole transfer
+            response = retry_call(fetch_page, "youtube_fetch", stats)
+        except HttpError as e:
+            FAILURES_TOTAL.inc(stage="youtube_fetch")
+            if e.resp.status == 429:
+                RATE_LIMITED_TOTAL.inc(service="youtube")
+            if _is_quota_error(e):
+                quota.mark_exhausted()
+                if page == 1:
+                    yield from _load_stale_pages(playlist_id, cached)
+                    return
+                raise YouTubeQuotaExceededError(
+                    "The YouTube quota ran out partway through the playlist. Try again after midnight Pacific time."
+                ) from e
+            raise
+        except Exception:
+            FAILURES_TOTAL.inc(stage="youtube_fetch")
+            raise
+
+        next_page_token = response.get("nextPageToken")
+        if page == 1 and next_page_token and not cached:
+            # Now that the size is known, don't start a fetch the quota can't finish
+            remaining_pages = pages_needed(response.get("pageInfo", {}).get("totalResults", 0)) - 1
+            if not quota.can_spend(remaining_pages, user):
+                yield from _load_stale_pages(playlist_id, cached)
+                return
 
         # Save API response for current page in cache dir
         cache_filename = cache_dir / f"page_{page}.json"
         with open(cache_filename, "w", encoding="utf-8") as file:
             json.dump(response, file, indent=4)
 
+        videos = []
         for item in response["items"]:
             snippet = item["snippet"]
             
@@ -244,13 +398,35 @@ def get_video_details_from_playlist(
             
             videos.append(video)
 
-        next_page_token = response.get("nextPageToken")
+        writer.add(videos)
+        yield videos
+
         if not next_page_token:
+            writer.complete()
             break
 
         page += 1
 
-    return videos
+
+def get_video_details_from_playlist(
+    youtube: Resource,
+    playlist_id: str,
+    stats: Optional[TransferStatsCollector] = None,
+    user: str = SERVER_USER
+) -> List[YouTubeVideo]:
+    """
+    Fetches detailed video information from a YouTube playlist.
+
+    Args:
+        youtube (Resource): Authenticated YouTube API service
+        playlist_id (str): The YouTube playlist ID
+        stats (Optional[TransferStatsCollector]): Per-transfer stats to count page fetches in.
+        user (str): Quota accounting key, from quota_user().
+
+    Returns:
+        List[YouTubeVideo]: List of YouTube videos with full metadata
+    """
+    return [video for page in iter_playlist_pages(youtube, playlist_id, stats=stats, user=user) for video in page]
 
 
 def get_video_titles_from_playlist(
@@ -0,0 +1,388 @@
+# backend/services/youtube_quota.py
+
+import hashlib
+import math
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from backend.models.transfer import YouTubeVideo
+from backend.services.metrics import YOUTUBE_QUOTA_UNITS_TOTAL, record_cache_lookup
+from backend.services.shared_state import SharedState, get_shared_state
+from backend.services.logger import get_logger
+
+# Setup a logger instance for this module
+logger = get_logger(__name__)
+
+# Units each YouTube Data API call costs; see https://developers.google.com/youtube/v3/determine_quota_cost
+CALL_COSTS = {
+    "playlistItems.list": 1,
+    "channels.list": 1,
+    "playlists.list": 1,
+    "videos.list": 1,
+    "search.list": 100,
+}
+
+# The key used for calls made with the installed-app credentials instead of a user's token
+SERVER_USER = "server"
+
+# YouTube access tokens live an hour, so a token's channel can be remembered that long
+CHANNEL_ID_TTL = 3600
+
+# Playlist IDs that name a different list for every account (liked videos, watch later, history, liked music)
+PERSONAL_PLAYLISTS = frozenset({"LL", "WL", "HL", "LM"})
+
+try:
+    _PACIFIC = ZoneInfo("America/Los_Angeles")
+except ZoneInfoNotFoundError:  # No tz database (e.g. Windows without tzdata): fixed PST, an hour off in summer
+    _PACIFIC = timezone(timedelta(hours=-8))
+
+
+def quota_day(now: Optional[datetime] = None) -> str:
+    """
+    Returns the quota day a moment falls in, as YYYY-MM-DD. YouTube resets quotas at midnight Pacific time.
+    """
+    return (now or datetime.now(timezone.utc)).astimezone(_PACIFIC).date().isoformat()
+
+
+def _token_key(access_token: str) -> str:
+    return hashlib.sha256(access_token.encode("utf-8")).hexdigest()[:12]
+
+
+def quota_user(access_token: Optional[str]) -> str:
+    """
+    Stable accounting key for the user behind a YouTube access token. The token itself is never kept.
+
+    Once the token has been validated this is the user's channel ID, so
+    usage and cached pages stay with the account when the token is
+    refreshed. Before that, or for an account without a channel, it is a
+    short hash of the token.
+    """
+    if not access_token:
+        return SERVER_USER
+    token_key = _token_key(access_token)
+    return get_shared_state().get(f"ytchannel:{token_key}") or token_key
+
+
+def remember_channel(access_token: str, channel_id: str) -> str:
+    """
+    Records the channel a validated token belongs to, for quota_user(). Returns the channel ID.
+    """
+    get_shared_state().set(f"ytchannel:{_token_key(access_token)}", channel_id, ttl=CHANNEL_ID_TTL)
+    return channel_id
+
+
+class YouTubeQuotaExceededError(Exception):
+    """Today's YouTube quota can't cover a fetch, and there is no cached copy to serve instead."""
+
+
+class YouTubeQuota:
+    """
+    Counts the YouTube Data API units spent today, per call type and per user.
+
+    Usage is kept in the shared state under one counter map per quota day,
+    so every worker sees the same totals. The count is our own estimate from
+    CALL_COSTS: units spent outside this app with the same project are not
+    seen. When YouTube answers quotaExceeded anyway, the rest of the day is
+    marked as used up.
+
+    A fetch is allowed while the day's remaining units, minus `reserve`,
+    cover its cost and, if `per_user_limit` is set, the user's remaining
+    units do too.
+    """
+
+    def __init__(
+        self,
+        state: SharedState,
+        enabled: bool = True,
+        daily_limit: int = 10_000,
+        per_user_limit: int = 0,
+        reserve: int = 0,
+        token_ttl: float = 300,
+    ):
+        """
+        Args:
+            state (SharedState): Backend the usage is stored in.
+            enabled (bool): When False, nothing is counted and every fetch is allowed.
+            daily_limit (int): Units the Google Cloud project may spend per day.
+            per_user_limit (int): Units one user may spend per day; 0 for no per-user limit.
+            reserve (int): Units kept back, e.g. for token validation once the budget runs low.
+            token_ttl (float): Seconds a validated access token is trusted without another channels.list call.
+        """
+        self.state = state
+        self.enabled = enabled
+        self.daily_limit = daily_limit
+        self.per_user_limit = per_user_limit
+        self.reserve = reserve
+        self.token_ttl = token_ttl
+
+    @classmethod
+    def from_env(cls) -> "YouTubeQuota":
+        """
+        Builds the accounting from the YOUTUBE_QUOTA_* environment variables.
+        """
+        return cls(
+            get_shared_state(),
+            enabled=os.getenv("YOUTUBE_QUOTA_ENABLED", "true").lower() == "true",
+            daily_limit=int(os.getenv("YOUTUBE_QUOTA_DAILY_LIMIT", "10000")),
+            per_user_limit=int(os.getenv("YOUTUBE_QUOTA_PER_USER", "0")),
+            reserve=int(os.getenv("YOUTUBE_QUOTA_RESERVE", "0")),
+            token_ttl=float(os.getenv("YOUTUBE_TOKEN_VALIDATION_TTL", "300")),
+        )
+
+    @staticmethod
+    def _key(day: str) -> str:
+        return f"ytquota:{day}"
+
+    def record(self, call: str, user: str = SERVER_USER, count: int = 1) -> None:
+        """
+        Counts `count` calls of one API method, e.g. "playlistItems.list", against today's quota.
+        """
+        units = CALL_COSTS.get(call, 1) * count
+        YOUTUBE_QUOTA_UNITS_TOTAL.inc(units, call=call)
+        if not self.enabled:
+            return
+
+        self.state.incr_fields(self._key(quota_day()), {"total": units, f"call:{call}": units, f"user:{user}": units})
+
+    def mark_exhausted(self) -> None:
+        """
+        Records that YouTube refused a call for quota, so no more fetches are tried today.
+        """
+        if not self.enabled:
+            return
+
+        day = quota_day()
+        logger.warning(f"[YouTubeQuota] - YouTube reported the quota for {day} as exceeded")
+        self.state.set(f"{self._key(day)}:exhausted", True, ttl=2 * 24 * 3600)
+
+    def usage(self, user: Optional[str] = None) -> dict:
+        """
+        Today's usage and remaining budget, for GET /youtube/quota.
+
+        Args:
+            user (Optional[str]): Key from quota_user(); adds that user's own usage.
+
+        Returns:
+            dict: day, daily_limit, used, remaining, by_call and, for a user, user_used and user_remaining.
+        """
+        day = quota_day()
+        fields = self.state.get_fields(self._key(day)) if self.enabled else {}
+        used = fields.get("total", 0)
+        exhausted = self.enabled and bool(self.state.get(f"{self._key(day)}:exhausted"))
+
+        usage = {
+            "day": day,
+            "daily_limit": self.daily_limit,
+            "used": used,
+            "remaining": 0 if exhausted else max(self.daily_limit - used, 0),
+            "by_call": {field[len("call:"):]: units for field, units in fields.items() if field.startswith("call:")},
+        }
+        if user is not None:
+            user_used = fields.get(f"user:{user}", 0)
+            usage["user_used"] = user_used
+            usage["user_remaining"] = (
+                min(usage["remaining"], max(self.per_user_limit - user_used, 0)) if self.per_user_limit else usage["remaining"]
+            )
+        return usage
+
+    def can_spend(self, units: int, user: str = SERVER_USER) -> bool:
+        """
+        Whether `units` more units fit in today's budget, for the whole app and for `user`.
+        """
+        if not self.enabled:
+            return True
+
+        usage = self.usage(user)
+        return usage["user_remaining"] - self.reserve >= units
+
+    def token_validated(self, user: str) -> bool:
+        """
+        Whether the token behind `user` passed validation within the last `token_ttl` seconds.
+        """
+        if not self.enabled or not self.token_ttl:
+            return False
+
+        validated = self.state.get(f"ytvalid:{user}") is not None
+        record_cache_lookup("youtube_token", validated)
+        return validated
+
+    def remember_token(self, user: str) -> None:
+        """
+        Records that the token behind `user` just passed validation.
+        """
+        if self.enabled and self.token_ttl:
+            self.state.set(f"ytvalid:{user}", True, ttl=self.token_ttl)
+
+
+class PlaylistPageCache:
+    """
+    Keeps the pages of recently fetched YouTube playlists.
+
+    A playlist fetched within `fresh_ttl` seconds, e.g. by /youtube/titles
+    just before the transfer, is served from here without spending quota.
+    Older copies are kept for `stale_ttl` seconds and only served when the
+    quota can't cover a new fetch.
+
+    Copies are kept per user, since a user's token can see private playlists
+    and their own LL/WL lists. The one shared copy is the one fetched with
+    the installed-app credentials (SERVER_USER, e.g. by /youtube/titles):
+    it only holds what anyone can fetch, so every user may read it, except
+    for the per-account PERSONAL_PLAYLISTS.
+
+    Each fetch writes its pages under a new generation and only points the
+    playlist at it once the last page is in, so a fetch that dies halfway
+    never leaves a mix of old and new pages behind.
+    """
+
+    def __init__(self, state: SharedState, enabled: bool = True, fresh_ttl: float = 300, stale_ttl: float = 24 * 3600):
+        """
+        Args:
+            state (SharedState): Backend the pages are stored in.
+            enabled (bool): When False, nothing is cached and every fetch goes to YouTube.
+            fresh_ttl (float): Seconds a cached playlist is served instead of fetching it again.
+            stale_ttl (float): Seconds a cached playlist is kept for when the quota runs out.
+        """
+        self.state = state
+        self.enabled = enabled
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+
+    @classmethod
+    def from_env(cls) -> "PlaylistPageCache":
+        """
+        Builds the cache from the YOUTUBE_PAGE_CACHE_* environment variables.
+        """
+        return cls(
+            get_shared_state(),
+            enabled=os.getenv("YOUTUBE_PAGE_CACHE_ENABLED", "true").lower() == "true",
+            fresh_ttl=float(os.getenv("YOUTUBE_PAGE_CACHE_TTL", "300")),
+            stale_ttl=float(os.getenv("YOUTUBE_PAGE_CACHE_STALE_TTL", str(24 * 3600))),
+        )
+
+    @staticmethod
+    def _readable_by(user: str, playlist_id: str) -> List[str]:
+        """
+        Returns whose copies of a playlist `user` may be served.
+        """
+        if user == SERVER_USER or playlist_id in PERSONAL_PLAYLISTS:
+            return [user]
+        return [user, SERVER_USER]
+
+    def lookup(self, playlist_id: str, user: str = SERVER_USER) -> Optional[dict]:
+        """
+        Returns the newest copy of a playlist `user` may be served,
+        {"owner", "generation", "pages", "fetched_at", "fresh"}, or None.
+        """
+        if not self.enabled:
+            return None
+
+        entry = None
+        for owner in self._readable_by(user, playlist_id):
+            candidate = self.state.get(f"ytpages:{owner}:{playlist_id}")
+            if candidate is not None and (entry is None or candidate["fetched_at"] > entry["fetched_at"]):
+                entry = dict(candidate, owner=owner)
+        if entry is not None:
+            entry["fresh"] = time.time() - entry["fetched_at"] < self.fresh_ttl
+        record_cache_lookup("youtube_pages", entry is not None and entry["fresh"])
+        return entry
+
+    def load(self, playlist_id: str, entry: dict) -> Optional[List[List[YouTubeVideo]]]:
+        """
+        Returns the pages of a cached copy from lookup(), or None if some of them are gone.
+        """
+        pages = []
+        for page in range(1, entry["pages"] + 1):
+            videos = self.state.get(f"ytpages:{entry['owner']}:{playlist_id}:{entry['generation']}:{page}")
+            if videos is None:
+                # Evicted from the local backend or lost in a storage outage
+                return None
+            pages.append([YouTubeVideo(**video) for video in videos])
+        return pages
+
+    def writer(self, playlist_id: str, user: str = SERVER_USER) -> "PlaylistPageWriter":
+        """
+        Starts a new copy of a playlist that `user` is fetching.
+        """
+        return PlaylistPageWriter(self, playlist_id, user)
+
+
+class PlaylistPageWriter:
+    """
+    Stores the pages of one fetch as they arrive. Created by PlaylistPageCache.writer().
+    """
+
+    def __init__(self, cache: PlaylistPageCache, playlist_id: str, user: str):
+        self.cache = cache
+        self.playlist_id = playlist_id
+        self.user = user
+        self.generation = uuid.uuid4().hex[:8]
+        self.pages = 0
+
+    def add(self, videos: List[YouTubeVideo]) -> None:
+        if not self.cache.enabled:
+            return
+
+        self.pages += 1
+        self.cache.state.set(
+            f"ytpages:{self.user}:{self.playlist_id}:{self.generation}:{self.pages}",
+            [video.model_dump() for video in videos],
+            ttl=self.cache.stale_ttl,
+        )
+
+    def complete(self) -> None:
+        """
+        Makes the fetched pages the playlist's cached copy. Only called after the last page.
+        """
+        if not self.cache.enabled:
+            return
+
+        self.cache.state.set(
+            f"ytpages:{self.user}:{self.playlist_id}",
+            {"generation": self.generation, "pages": self.pages, "fetched_at": time.time()},
+            ttl=self.cache.stale_ttl,
+        )
+
+
+def seconds_until_reset(now: Optional[datetime] = None) -> int:
+    """
+    Seconds until the next quota day starts, for Retry-After headers.
+    """
+    now = (now or datetime.now(timezone.utc)).astimezone(_PACIFIC)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=now.tzinfo)
+    return max(int((midnight - now).total_seconds()), 1)
+
+
+def pages_needed(total_results: int, page_size: int = 50) -> int:
+    """
+    Number of playlistItems.list calls a playlist of `total_results` videos takes.
+    """
+    return max(math.ceil(total_results / page_size), 1)
+
+
+_youtube_quota: Optional[YouTubeQuota] = None
+_page_cache: Optional[PlaylistPageCache] = None
+
+
+def get_youtube_quota() -> YouTubeQuota:
+    """
+    Returns the process-wide YouTube quota accounting, creating it on first use.
+    """
+    global _youtube_quota
+
+    if _youtube_quota is None:
+        _youtube_quota = YouTubeQuota.from_env()
+    return _youtube_quota
+
+
+def get_page_cache() -> PlaylistPageCache:
+    """
+    Returns the process-wide YouTube playlist page cache, creating it on first use.
+    """
+    global _page_cache
+
+    if _page_cache is None:
+        _page_cache = PlaylistPageCache.from_env()
+    return _page_cache